@@ -6,67 +6,327 @@
 """
 
 import os
-import sys
 import json
+import asyncio
+import functools
+import hashlib
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
+import orjson
 import uvicorn
 
-# 로컬 모듈 임포트를 위한 경로 추가
-sys.path.append('/app/src' if os.path.exists('/app/src') else 'src')
-
-try:
-    from main import CompleteEmotionSystem
-except ImportError:
-    print("⚠️ 로컬 모듈 임포트 실패 - 개발 모드로 실행")
-    CompleteEmotionSystem = None
+# main 모듈이 src 경로를 등록하므로 가장 먼저 임포트
+from main import CompleteEmotionSystem, persist_result_async
+from database.firebase_manager import HISTORY_SOURCE_CACHE, HISTORY_SOURCE_SERVER
+from utils.cache import TTLCache
+from utils.logging_system import system_logger
 
 # 전역 변수
 emotion_system = None
 
+# 블로킹 작업(데이터 수집, Firebase I/O)을 처리할 스레드풀 크기
+EXECUTOR_MAX_WORKERS = int(os.getenv("API_EXECUTOR_WORKERS", "8"))
+
+# 분석 결과를 로컬 파일로도 저장할지 여부 (Cloud Run에서는 디스크 I/O를 피하기 위해 기본 꺼짐)
+PERSIST_LOCAL = os.getenv("PERSIST_LOCAL", "false").lower() == "true"
+
+# CORS 허용 도메인 목록과 preflight 응답 캐시 시간 (초)
+ALLOWED_ORIGINS = [
+    origin.strip() for origin in os.getenv("ALLOWED_ORIGINS", "*").split(",") if origin.strip()
+]
+CORS_MAX_AGE_SECONDS = 86400
+
+# 동시에 실행할 수 있는 분석 파이프라인 수 (외부 API 쿼터 보호)
+ANALYZE_CONCURRENCY = int(os.getenv("ANALYZE_CONCURRENCY", "8"))
+
+# 비동기 분석 작업(async=true) 보관 개수와 제출 후 결과 조회 가능 시간 (초)
+ANALYSIS_JOB_CACHE_SIZE = 1024
+ANALYSIS_JOB_TTL_SECONDS = 600
+
+JOB_STATUS_PENDING = "pending"
+JOB_STATUS_DONE = "done"
+JOB_STATUS_ERROR = "error"
+
+# 사용자별 시스템 인스턴스 캐시 최대 크기 (LRU)
+USER_SYSTEM_CACHE_SIZE = 128
+
+# /history, /trends 응답 캐시 (key: (엔드포인트, user_id, 파라미터) -> (ETag, JSON 바이트))
+RESPONSE_CACHE_TTL_SECONDS = 60
+response_cache = TTLCache(maxsize=1024, ttl=RESPONSE_CACHE_TTL_SECONDS)
+
+# fields= 필터와 관계없이 항상 포함되는 /analyze 응답 필드
+ANALYZE_REQUIRED_FIELDS = frozenset({"success", "user_id"})
+
+ANALYZE_FIELDS_DESCRIPTION = (
+    "응답에 포함할 필드 목록 (쉼표 구분, 예: emotion_summary,timestamp). "
+    "success, user_id는 항상 포함됩니다."
+)
+ANALYZE_ASYNC_DESCRIPTION = (
+    "true면 분석을 백그라운드에서 실행하고 202와 job_id를 즉시 반환합니다. "
+    "결과는 GET /analyze/{job_id}로 조회합니다."
+)
+
+# /analyze 완료 후 미리 채워 둘 /history, /trends 기본 파라미터
+PREFETCH_HISTORY_LIMIT = 10
+PREFETCH_TRENDS_DAYS = 7
+
+HISTORY_FIELDS_DESCRIPTION = (
+    "히스토리 항목별로 포함할 필드 목록 (쉼표 구분, 예: analysis_date,overall_emotion)"
+)
+
+# Accept 헤더로 요청하면 /history를 한 줄에 문서 하나씩 스트리밍
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+def warm_up_system(system) -> None:
+    """첫 요청이 초기화 비용을 떠안지 않도록 Firebase 연결과 분석 경로를 미리 실행"""
+    system.firebase_manager.initialize_firebase()
+    
+    engine = system.emotion_engine
+    calendar_analysis = engine.analyze_calendar_fatigue({
+        'events': [{'start_date': '2000-01-01', 'start_time': '09:00'}]
+    })
+    engine.calculate_overall_emotion(
+        {'emotion_scores': {'positive': 0.0, 'negative': 0.0, 'neutral': 0.0},
+         'interests': {'entertainment': 0.0}},
+        calendar_analysis
+    )
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """앱 시작/종료 시 실행되는 함수"""
     global emotion_system
     
     # 시작 시 초기화
-    print("🚀 감정 분석 API 서버 시작...")
+    system_logger.info("🚀 감정 분석 API 서버 시작...")
+    app.state.executor = ThreadPoolExecutor(
+        max_workers=EXECUTOR_MAX_WORKERS,
+        thread_name_prefix="emotion-worker"
+    )
+    app.state.user_systems = OrderedDict()
+    app.state.user_systems_lock = asyncio.Lock()
+    app.state.analyze_semaphore = asyncio.Semaphore(ANALYZE_CONCURRENCY)
+    app.state.analyze_in_flight = 0
+    app.state.analysis_jobs = TTLCache(maxsize=ANALYSIS_JOB_CACHE_SIZE, ttl=ANALYSIS_JOB_TTL_SECONDS)
+    # 실행 중인 비동기 분석 작업 (이벤트 루프는 태스크를 약한 참조로만 들고 있으므로
+    # 작업 캐시에서 밀려나도 끝날 때까지 여기서 강한 참조 유지)
+    app.state.running_jobs = set()
     try:
-        if CompleteEmotionSystem:
-            emotion_system = CompleteEmotionSystem()
-            print("✅ 감정 분석 시스템 초기화 완료")
-        else:
-            print("⚠️ 개발 모드 - 감정 분석 시스템 없이 실행")
+        emotion_system = CompleteEmotionSystem()
+        system_logger.success("감정 분석 시스템 초기화 완료")
+        
+        # 컨테이너 시작 시점에 워밍업 (실패해도 서버는 계속 기동)
+        try:
+            await run_blocking(warm_up_system, emotion_system)
+            system_logger.info("🔥 감정 분석 시스템 워밍업 완료")
+        except Exception as e:
+            system_logger.warning("⚠️ 워밍업 실패", {"error": str(e)})
     except Exception as e:
-        print(f"❌ 초기화 실패: {e}")
+        system_logger.error("❌ 초기화 실패", error=e)
     
     yield
     
     # 종료 시 정리
-    print("🛑 감정 분석 API 서버 종료...")
+    system_logger.info("🛑 감정 분석 API 서버 종료...")
+    app.state.executor.shutdown(wait=True)
 
 # FastAPI 앱 생성
 app = FastAPI(
     title="감정 분석 시스템 API",
     description="YouTube와 Calendar 데이터 기반 개인 맞춤형 감정 분석",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
-# CORS 설정 (모든 도메인에서 접근 허용)
+# CORS 설정 (ALLOWED_ORIGINS에 쉼표로 지정한 도메인만 허용, 기본값은 전체 허용)
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_origins=ALLOWED_ORIGINS,
+    allow_credentials=False,
+    allow_methods=["GET", "POST"],
+    allow_headers=["content-type", "if-none-match"],
+    max_age=CORS_MAX_AGE_SECONDS,
 )
 
+# 응답 압축 (1KB 이상 JSON 응답만 gzip 적용)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=6)
+
+async def run_blocking(func, *args, **kwargs):
+    """블로킹 함수를 스레드풀에서 실행 (이벤트 루프 점유 방지)"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        app.state.executor, functools.partial(func, *args, **kwargs)
+    )
+
+async def get_user_system(user_id: str):
+    """사용자별 (시스템 인스턴스, 실행 락) 조회 (없으면 생성, LRU로 개수 제한)
+    
+    인스턴스는 실행 단위 상태(수집 데이터, 분석 결과 등)를 속성에 담으므로
+    같은 사용자의 분석은 함께 반환되는 락으로 한 번에 하나씩만 실행해야 함.
+    """
+    user_systems = app.state.user_systems
+    async with app.state.user_systems_lock:
+        entry = user_systems.get(user_id)
+        if entry is not None:
+            user_systems.move_to_end(user_id)
+            return entry
+    
+    # 생성은 전역 락 밖에서 (다른 사용자의 요청이 이 생성을 기다리지 않도록)
+    # 엔진과 Firebase 매니저는 전역 시스템의 것을 공유
+    user_system = await run_blocking(
+        CompleteEmotionSystem,
+        user_id,
+        emotion_engine=emotion_system.emotion_engine,
+        firebase_manager=emotion_system.firebase_manager
+    )
+    
+    async with app.state.user_systems_lock:
+        # 그 사이 같은 사용자의 다른 요청이 먼저 등록했으면 그 인스턴스를 사용
+        entry = user_systems.get(user_id)
+        if entry is None:
+            entry = (user_system, asyncio.Lock())
+            user_systems[user_id] = entry
+            if len(user_systems) > USER_SYSTEM_CACHE_SIZE:
+                user_systems.popitem(last=False)
+        else:
+            user_systems.move_to_end(user_id)
+        return entry
+
+async def run_analysis(user_id: str) -> Dict:
+    """동시 실행 수 제한 안에서 사용자 감정 분석 파이프라인 실행"""
+    # 사용자별 시스템 인스턴스 조회 (캐시 재사용)
+    user_system, run_lock = await get_user_system(user_id)
+    
+    # 같은 사용자의 분석은 순서대로 (인스턴스의 실행 상태를 서로 덮어쓰지 않도록)
+    async with run_lock:
+        async with app.state.analyze_semaphore:
+            app.state.analyze_in_flight += 1
+            try:
+                # 감정 분석 실행 (스레드풀에서 실행)
+                return await run_blocking(user_system.run_complete_analysis)
+            finally:
+                app.state.analyze_in_flight -= 1
+
+# 초 단위로 캐시한 현재 시각 문자열: (epoch 초, ISO 문자열)
+_now_iso_cache = (0, "")
+
+def now_iso() -> str:
+    """현재 시각 ISO 문자열 (초 단위로 한 번만 포맷팅)"""
+    global _now_iso_cache
+    second = int(time.time())
+    cached_second, cached_iso = _now_iso_cache
+    if second != cached_second:
+        cached_iso = datetime.fromtimestamp(second).isoformat()
+        _now_iso_cache = (second, cached_iso)
+    return cached_iso
+
+def _json_default(obj):
+    """orjson이 직접 처리하지 못하는 타입 변환 (Firestore 타임스탬프 등 datetime 하위 클래스)"""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+def store_json_payload(cache_key: tuple, payload: Dict) -> tuple:
+    """페이로드를 JSON 바이트로 직렬화해 응답 캐시에 저장하고 (ETag, 바이트) 반환"""
+    body = orjson.dumps(payload, default=_json_default)
+    etag = f'"{hashlib.md5(body).hexdigest()}"'
+    cached = (etag, body)
+    response_cache.set(cache_key, cached)
+    return cached
+
+async def cached_json_response(request: Request, cache_key: tuple, build_payload, refresh: bool = False):
+    """응답 JSON을 캐시하고 ETag가 일치하면 304 반환"""
+    cached = None if refresh else response_cache.get(cache_key)
+    
+    if cached is None:
+        cached = store_json_payload(cache_key, await build_payload())
+    
+    etag, body = cached
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"private, max-age={RESPONSE_CACHE_TTL_SECONDS}"
+    }
+    
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    
+    return Response(content=body, media_type="application/json", headers=headers)
+
+def parse_fields(fields: Optional[str]) -> Optional[frozenset]:
+    """fields 쿼리 파라미터를 필드명 집합으로 변환 (미지정 시 None)"""
+    if not fields:
+        return None
+    selected = frozenset(name.strip() for name in fields.split(",") if name.strip())
+    return selected or None
+
+def project_fields(data: Dict, selected: frozenset) -> Dict:
+    """선택된 필드만 남긴 딕셔너리 반환"""
+    return {key: value for key, value in data.items() if key in selected}
+
+def invalidate_user_responses(user_id: str):
+    """사용자의 캐시된 /history, /trends 응답 제거"""
+    response_cache.pop_where(lambda key: key[1] == user_id)
+
+async def build_history_payload(user_id: str, limit: int, selected: Optional[frozenset],
+                                source: str = HISTORY_SOURCE_CACHE) -> Dict:
+    """/history 응답 페이로드 생성"""
+    # Firebase에서 히스토리 조회 (AsyncClient로 직접 await)
+    history = await emotion_system.firebase_manager.get_user_history_async(
+        user_id, limit, source=source
+    )
+    
+    if selected:
+        history = [project_fields(item, selected) for item in history]
+    
+    return {
+        "success": True,
+        "user_id": user_id,
+        "history_count": len(history),
+        "history": history
+    }
+
+async def build_trends_payload(user_id: str, days: int) -> Dict:
+    """/trends 응답 페이로드 생성"""
+    # Firebase에서 트렌드 데이터 조회 (AsyncClient로 직접 await)
+    trends = await emotion_system.firebase_manager.get_emotion_trends_async(user_id, days)
+    
+    return {
+        "success": True,
+        "user_id": user_id,
+        "analysis_period": f"{days}일",
+        "trends": trends
+    }
+
+async def stream_history_ndjson(user_id: str, limit: int, selected: Optional[frozenset]):
+    """Firestore에서 읽히는 대로 히스토리 문서를 NDJSON 줄로 반환"""
+    async for item in emotion_system.firebase_manager.iter_user_history_async(user_id, limit):
+        if selected:
+            item = project_fields(item, selected)
+        yield orjson.dumps(item, default=_json_default, option=orjson.OPT_APPEND_NEWLINE)
+
+async def _prefetch_user_views(user_id: str):
+    """분석 직후 기본 파라미터의 /history, /trends 응답을 미리 캐시에 채움"""
+    try:
+        history, trends = await asyncio.gather(
+            build_history_payload(user_id, PREFETCH_HISTORY_LIMIT, None, source=HISTORY_SOURCE_SERVER),
+            build_trends_payload(user_id, PREFETCH_TRENDS_DAYS)
+        )
+        store_json_payload(("history", user_id, PREFETCH_HISTORY_LIMIT, None), history)
+        store_json_payload(("trends", user_id, PREFETCH_TRENDS_DAYS), trends)
+    except Exception as e:
+        system_logger.warning("⚠️ 히스토리 프리페치 실패", {"user_id": user_id, "error": str(e)})
+
 # 요청/응답 모델 정의
 class AnalysisRequest(BaseModel):
     user_id: str = "default_user"
@@ -84,6 +344,8 @@ class HealthResponse(BaseModel):
     status: str
     timestamp: str
     version: str
+    analyze_in_flight: int = 0
+    analyze_capacity: int = ANALYZE_CONCURRENCY
 
 @app.get("/", response_model=Dict)
 async def root():
@@ -91,7 +353,7 @@ async def root():
     return {
         "message": "감정 분석 시스템 API",
         "status": "running",
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": now_iso(),
         "endpoints": {
             "health": "/health",
             "analyze": "/analyze",
@@ -104,16 +366,13 @@ async def health_check():
     """헬스 체크 엔드포인트"""
     return HealthResponse(
         status="healthy",
-        timestamp=datetime.now().isoformat(),
-        version="1.0.0"
+        timestamp=now_iso(),
+        version="1.0.0",
+        analyze_in_flight=app.state.analyze_in_flight
     )
 
-@app.post("/analyze", response_model=AnalysisResponse)
-async def analyze_emotion(
-    request: AnalysisRequest,
-    background_tasks: BackgroundTasks
-):
-    """감정 분석 실행 엔드포인트"""
+async def execute_analysis(user_id: str) -> Tuple[AnalysisResponse, Optional[Dict]]:
+    """감정 분석을 실행하고 (응답 모델, 원본 결과) 반환 (실패 시 success=False, 원본 결과 None)"""
     try:
         if not emotion_system:
             raise HTTPException(
@@ -121,22 +380,22 @@ async def analyze_emotion(
                 detail="감정 분석 시스템이 초기화되지 않았습니다"
             )
         
-        print(f"🎯 감정 분석 요청: {request.user_id}")
-        
-        # 사용자별 시스템 인스턴스 생성
-        user_system = CompleteEmotionSystem(request.user_id)
+        system_logger.debug("🎯 감정 분석 요청", {"user_id": user_id})
         
-        # 감정 분석 실행
-        result = user_system.run_complete_analysis()
+        result = await run_analysis(user_id)
         
         if result.get('success', False):
-            return AnalysisResponse(
+            # 새 분석 결과가 생겼으므로 캐시된 조회 응답 무효화
+            invalidate_user_responses(user_id)
+            
+            response = AnalysisResponse(
                 success=True,
-                user_id=request.user_id,
+                user_id=user_id,
                 timestamp=result['analysis_timestamp'],
                 emotion_summary=result['emotion_summary'],
                 personalized_feedback=result['personalized_feedback']
             )
+            return response, result
         else:
             raise HTTPException(
                 status_code=500,
@@ -144,17 +403,105 @@ async def analyze_emotion(
             )
             
     except Exception as e:
-        print(f"❌ 분석 오류: {e}")
-        return AnalysisResponse(
+        system_logger.error("❌ 분석 오류", error=e, extra_data={"user_id": user_id})
+        response = AnalysisResponse(
             success=False,
-            user_id=request.user_id,
-            timestamp=datetime.now().isoformat(),
+            user_id=user_id,
+            timestamp=now_iso(),
             error_message=str(e)
         )
+        return response, None
+
+async def _after_analysis(user_id: str, result: Dict):
+    """분석 성공 후처리: 히스토리/트렌드 프리페치와 (설정 시) 결과 파일 저장"""
+    tasks = [_prefetch_user_views(user_id)]
+    if PERSIST_LOCAL:
+        tasks.append(_persist_result(result))
+    await asyncio.gather(*tasks)
+
+async def _persist_result(result: Dict):
+    """분석 결과 파일 저장 (실패해도 응답에는 영향 없음)"""
+    try:
+        result_file = await persist_result_async(result)
+        system_logger.debug("💾 분석 결과 파일 저장", {"file": result_file})
+    except Exception as e:
+        system_logger.warning("⚠️ 분석 결과 파일 저장 실패", {"error": str(e)})
+
+async def _run_analysis_job(user_id: str) -> AnalysisResponse:
+    """비동기 분석 작업 본문 (완료 전에 후처리까지 마침)"""
+    response, result = await execute_analysis(user_id)
+    if response.success:
+        await _after_analysis(user_id, result)
+    return response
+
+def _on_job_done(task: asyncio.Task):
+    """비동기 분석 작업 종료 처리 (실행 중 목록에서 제거, 예외는 조회 여부와 상관없이 기록)"""
+    app.state.running_jobs.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        system_logger.error("❌ 비동기 분석 작업 실패", extra_data={"error": repr(task.exception())})
+
+@app.post("/analyze", response_model=AnalysisResponse)
+async def analyze_emotion(
+    request: AnalysisRequest,
+    background_tasks: BackgroundTasks,
+    fields: Optional[str] = Query(None, description=ANALYZE_FIELDS_DESCRIPTION),
+    run_async: bool = Query(False, alias="async", description=ANALYZE_ASYNC_DESCRIPTION)
+):
+    """감정 분석 실행 엔드포인트 (async=true면 202와 job_id를 즉시 반환)"""
+    if run_async:
+        job_id = uuid.uuid4().hex
+        task = asyncio.create_task(_run_analysis_job(request.user_id))
+        app.state.running_jobs.add(task)
+        task.add_done_callback(_on_job_done)
+        app.state.analysis_jobs.set(job_id, task)
+        return ORJSONResponse(
+            {"job_id": job_id, "status": JOB_STATUS_PENDING, "status_url": f"/analyze/{job_id}"},
+            status_code=202
+        )
+    
+    response, result = await execute_analysis(request.user_id)
+    
+    if response.success:
+        # 곧이어 조회될 히스토리/트렌드 프리페치와 결과 파일 저장은 응답 후 처리
+        background_tasks.add_task(_after_analysis, request.user_id, result)
+    
+    selected = parse_fields(fields)
+    if selected:
+        return ORJSONResponse(
+            project_fields(response.model_dump(), selected | ANALYZE_REQUIRED_FIELDS)
+        )
+    return response
+
+@app.get("/analyze/{job_id}")
+async def get_analysis_job(job_id: str):
+    """비동기 분석 작업 상태 조회 (완료 시 분석 결과 포함)"""
+    task = app.state.analysis_jobs.get(job_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="분석 작업을 찾을 수 없습니다")
+    
+    if not task.done():
+        return {"job_id": job_id, "status": JOB_STATUS_PENDING}
+    
+    # 취소되었거나 예외로 끝난 작업은 500 대신 오류 상태로 응답 (예외는 _on_job_done에서 기록됨)
+    if task.cancelled():
+        return {"job_id": job_id, "status": JOB_STATUS_ERROR, "error": "분석 작업이 취소되었습니다"}
+    if task.exception() is not None:
+        return {"job_id": job_id, "status": JOB_STATUS_ERROR, "error": str(task.exception())}
+    
+    return {"job_id": job_id, "status": JOB_STATUS_DONE, "result": task.result().model_dump()}
 
 @app.get("/history/{user_id}")
-async def get_user_history(user_id: str, limit: int = 10):
-    """사용자 감정 분석 히스토리 조회"""
+async def get_user_history(
+    request: Request,
+    user_id: str,
+    limit: int = 10,
+    fresh: bool = False,
+    fields: Optional[str] = Query(None, description=HISTORY_FIELDS_DESCRIPTION)
+):
+    """사용자 감정 분석 히스토리 조회 (fresh=true면 캐시를 건너뛰고 서버 조회)
+    
+    Accept: application/x-ndjson으로 요청하면 캐시 없이 문서를 한 줄씩 스트리밍
+    """
     try:
         if not emotion_system:
             raise HTTPException(
@@ -162,24 +509,31 @@ async def get_user_history(user_id: str, limit: int = 10):
                 detail="감정 분석 시스템이 초기화되지 않았습니다"
             )
         
-        print(f"📊 히스토리 조회: {user_id}")
+        system_logger.debug("📊 히스토리 조회", {"user_id": user_id})
         
-        # Firebase에서 히스토리 조회
-        history = emotion_system.firebase_manager.get_user_history(user_id, limit)
+        selected = parse_fields(fields)
         
-        return {
-            "success": True,
-            "user_id": user_id,
-            "history_count": len(history),
-            "history": history
-        }
+        # 대량 조회용: 첫 문서부터 바로 전송하고 전체 목록을 메모리에 모으지 않음
+        if NDJSON_MEDIA_TYPE in request.headers.get("accept", ""):
+            return StreamingResponse(
+                stream_history_ndjson(user_id, limit, selected), media_type=NDJSON_MEDIA_TYPE
+            )
+        
+        source = HISTORY_SOURCE_SERVER if fresh else HISTORY_SOURCE_CACHE
+        
+        return await cached_json_response(
+            request,
+            ("history", user_id, limit, selected),
+            lambda: build_history_payload(user_id, limit, selected, source=source),
+            refresh=fresh
+        )
         
     except Exception as e:
-        print(f"❌ 히스토리 조회 오류: {e}")
+        system_logger.error("❌ 히스토리 조회 오류", error=e, extra_data={"user_id": user_id})
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/trends/{user_id}")
-async def get_emotion_trends(user_id: str, days: int = 7):
+async def get_emotion_trends(request: Request, user_id: str, days: int = 7):
     """감정 변화 트렌드 조회"""
     try:
         if not emotion_system:
@@ -188,20 +542,14 @@ async def get_emotion_trends(user_id: str, days: int = 7):
                 detail="감정 분석 시스템이 초기화되지 않았습니다"
             )
         
-        print(f"📈 트렌드 분석: {user_id}")
+        system_logger.debug("📈 트렌드 분석", {"user_id": user_id})
         
-        # Firebase에서 트렌드 데이터 조회
-        trends = emotion_system.firebase_manager.get_emotion_trends(user_id, days)
-        
-        return {
-            "success": True,
-            "user_id": user_id,
-            "analysis_period": f"{days}일",
-            "trends": trends
-        }
+        return await cached_json_response(
+            request, ("trends", user_id, days), lambda: build_trends_payload(user_id, days)
+        )
         
     except Exception as e:
-        print(f"❌ 트렌드 분석 오류: {e}")
+        system_logger.error("❌ 트렌드 분석 오류", error=e, extra_data={"user_id": user_id})
         raise HTTPException(status_code=500, detail=str(e))
 
 # 개발용 실행 함수
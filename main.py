@@ -7,18 +7,31 @@
 - 포괄적인 로깅 시스템
 """
 
-import json
 import sys
 import os
+import contextvars
+import functools
+import itertools
+import aiofiles
+import numpy as np
+import orjson
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional
 
-# 모듈 경로 추가
-sys.path.append('/Users/kjw/emotion-analysis-system/src')
+# 모듈 경로 추가 (이 파일 기준 src 디렉토리, 이미 등록된 경우 생략)
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src')
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
 
-from data_integration import IntegratedCollector
-from analysis.emotion_engine import EmotionAnalysisEngine
-from database.firebase_manager import FirebaseManager
+# 수집기/분석 엔진/Firebase 매니저는 google-api-python-client, firebase_admin 등
+# 무거운 라이브러리를 끌어오므로 처음 사용할 때 import (타입 검사용으로만 여기서 import)
+if TYPE_CHECKING:
+    from data_integration import IntegratedCollector
+    from analysis.emotion_engine import EmotionAnalysisEngine
+    from database.firebase_manager import FirebaseManager
 
 # 강화된 유틸리티 import
 from utils.logging_system import (
@@ -27,18 +40,122 @@ from utils.logging_system import (
     validate_data, safe_execute
 )
 from utils.performance_monitor import performance_monitor, monitor_performance
-from utils.config_manager import config_manager
+from utils.config_manager import AnalysisConfig, config_manager
+from utils import paths
+
+# 감정 점수 구간별 기본 추천사항
+POSITIVE_RECOMMENDATIONS = (
+    "긍정적인 감정을 유지하고 계시네요! 👍",
+    "좋아하시는 콘텐츠를 더 탐색해보세요.",
+    "현재의 좋은 에너지를 활용해 새로운 도전을 해보세요."
+)
+NEGATIVE_RECOMMENDATIONS = (
+    "조금 힘든 시기를 보내고 계시는 것 같아요. 💪",
+    "충분한 휴식과 자신만의 시간을 가져보세요.",
+    "친구나 가족과의 대화 시간을 늘려보세요.",
+    "좋아하는 음악이나 영상을 시청해보세요."
+)
+NEUTRAL_RECOMMENDATIONS = (
+    "안정적인 감정 상태를 유지하고 계시네요. 😊",
+    "새로운 취미나 관심사를 탐색해보는 건 어떨까요?",
+    "규칙적인 생활 패턴을 유지해보세요."
+)
+
+# 감정 점수가 이 값을 넘으면 긍정, -이 값보다 낮으면 부정 구간
+FEEDBACK_SCORE_THRESHOLD = 0.3
+
+# 감정 구간(1: 긍정, -1: 부정, 0: 중립)별 추천사항
+FEEDBACK_RECOMMENDATIONS = {
+    1: POSITIVE_RECOMMENDATIONS,
+    -1: NEGATIVE_RECOMMENDATIONS,
+    0: NEUTRAL_RECOMMENDATIONS
+}
+
+# 동시에 실행하는 분석 단계용 스레드풀 크기 (API 서버 동시 분석 8개 × 그룹당 추가 단계 2개)
+STAGE_MAX_WORKERS = 16
+
+# 프로세스 전체가 함께 쓰는 단계 실행 스레드풀 (분석마다 스레드/이벤트 루프를 새로 만들지 않음)
+_STAGE_EXECUTOR = ThreadPoolExecutor(max_workers=STAGE_MAX_WORKERS, thread_name_prefix="stage")
+
+# 기존 설정 파일 경로 (있으면 환경 변수 검증 생략)
+GOOGLE_CREDENTIALS_PATH = paths.CONFIG / "google_credentials.json"
+FIREBASE_CONFIG_PATH = paths.CONFIG / "firebase_service_account.json"
+
+@functools.lru_cache(maxsize=1)
+def credential_files_present() -> bool:
+    """Google/Firebase 설정 파일 존재 여부 (프로세스당 한 번만 확인)"""
+    return os.path.exists(GOOGLE_CREDENTIALS_PATH) and os.path.exists(FIREBASE_CONFIG_PATH)
+
+def invalidate_creds_cache():
+    """설정 파일을 교체한 뒤 존재 여부를 다시 확인하도록 캐시 비우기"""
+    credential_files_present.cache_clear()
+
+# 현재 감정 점수와 최근 평균의 차이 부호별 트렌드 방향
+TREND_DIRECTIONS = {1: "improving", 0: "stable", -1: "declining"}
+
+# 트렌드 비교에 사용하는 최근 분석 수
+TREND_WINDOW = 5
+
+# 저장 실패 시 다음 저장까지 보관할 최대 분석 결과 수
+MAX_PENDING_SAVES = 50
+
+# 분석 결과 파일 저장 위치
+RESULT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config')
+
+def result_file_path() -> str:
+    """현재 시각 기준 분석 결과 파일 경로"""
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    return os.path.join(RESULT_DIR, f"complete_analysis_{timestamp}.json")
+
+def serialize_result(result: Dict) -> bytes:
+    """분석 결과를 들여쓰기된 JSON 바이트로 직렬화 (orjson은 datetime을 ISO 8601로 변환)"""
+    return orjson.dumps(result, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+
+async def persist_result_async(result: Dict) -> str:
+    """분석 결과 파일을 이벤트 루프를 막지 않고 저장"""
+    result_file = result_file_path()
+    async with aiofiles.open(result_file, 'wb') as f:
+        await f.write(serialize_result(result))
+    return result_file
 
 class CompleteEmotionSystem:
     """완전한 감정 분석 시스템 (강화된 버전)"""
     
-    def __init__(self, user_id: str = "김재원", environment: str = "development"):
+    # 사용자별 인스턴스가 많이 생성되므로 인스턴스 __dict__ 없이 고정 속성만 사용
+    __slots__ = (
+        'user_id', 'environment', '_analysis_config', 'system_config',
+        '_data_collector', '_emotion_engine', '_firebase_manager',
+        'collected_data', 'analysis_result', 'history_data',
+        '_pending_saves', 'system_health'
+    )
+    
+    # 분석 단계 그룹: (단계 이름, 메서드 이름). 같은 그룹의 단계는 서로 독립적이라 동시에 실행
+    # - 히스토리 조회(Firestore 읽기)는 감정 분석(CPU)과 겹쳐 실행하고,
+    #   이번 분석이 저장되기 전에 읽으므로 트렌드는 이전 분석들과 비교됨
+    # - Firebase 저장(쓰기)은 트렌드 분석/피드백 생성과 겹쳐 실행
+    _STAGE_GROUPS = (
+        (("데이터 수집", "_collect_data_safe"),),
+        (("감정 분석", "_analyze_emotions_safe"),
+         ("히스토리 분석", "_analyze_history_safe")),
+        (("Firebase 저장", "_save_to_firebase_safe"),
+         ("트렌드 분석", "_analyze_trends_safe"),
+         ("개인화 피드백", "_generate_feedback_safe")),
+    )
+    _STAGE_COUNT = sum(len(group) for group in _STAGE_GROUPS)
+    
+    # 실패하면 전체 분석을 중단하는 필수 단계 / 실패해도 기록만 하고 넘어가는 선택 단계
+    _REQUIRED_STAGES = frozenset({"데이터 수집", "감정 분석"})
+    _OPTIONAL_STAGES = frozenset({"히스토리 분석", "트렌드 분석"})
+    
+    def __init__(self, user_id: str = "김재원", environment: str = "development",
+                 emotion_engine: Optional["EmotionAnalysisEngine"] = None,
+                 firebase_manager: Optional["FirebaseManager"] = None):
         self.user_id = user_id
         self.environment = environment
         
-        # 설정 로드
+        # 설정 로드 (분석 설정은 처음 접근할 때 로드)
+        self._analysis_config = None
         try:
-            self.analysis_config = config_manager.get_analysis_config(environment)
             self.system_config = config_manager.get_system_config(environment)
             
             system_logger.info("시스템 초기화 시작", {
@@ -51,37 +168,82 @@ class CompleteEmotionSystem:
             system_logger.error("설정 로드 실패", error=e)
             raise EmotionSystemError("시스템 설정을 로드할 수 없습니다.", "CONFIG_ERROR")
         
-        # 컴포넌트 초기화 (에러 처리 강화)
-        try:
-            self.data_collector = IntegratedCollector(user_id)
-            self.emotion_engine = EmotionAnalysisEngine()
-            self.firebase_manager = FirebaseManager()
-            
-            system_logger.success("모든 컴포넌트 초기화 완료")
-            
-        except Exception as e:
-            system_logger.error("컴포넌트 초기화 실패", error=e)
-            raise EmotionSystemError("시스템 컴포넌트 초기화 실패", "COMPONENT_INIT_ERROR")
+        # 컴포넌트는 처음 접근할 때 생성 (import 비용을 실제 분석 시점으로 미룸)
+        # 엔진/Firebase 매니저는 사용자와 무관하므로 주입받으면 재사용
+        self._data_collector = None
+        self._emotion_engine = emotion_engine
+        self._firebase_manager = firebase_manager
         
         # 시스템 상태
         self.collected_data = None
         self.analysis_result = None
         self.history_data = []
+        # Firebase에 아직 저장되지 못한 분석 결과 (다음 저장 때 한 배치로 함께 커밋)
+        self._pending_saves = deque(maxlen=MAX_PENDING_SAVES)
         self.system_health = {
             "last_successful_run": None,
             "consecutive_failures": 0,
             "data_quality_score": 0.0
         }
     
+    @staticmethod
+    def _create_component(name: str, factory):
+        """컴포넌트 생성 (실패 시 시스템 예외로 변환)"""
+        try:
+            component = factory()
+            system_logger.debug(f"{name} 초기화 완료")
+            return component
+        except Exception as e:
+            system_logger.error(f"{name} 초기화 실패", error=e)
+            raise EmotionSystemError("시스템 컴포넌트 초기화 실패", "COMPONENT_INIT_ERROR")
+    
+    @property
+    def analysis_config(self) -> AnalysisConfig:
+        """분석 설정 (첫 사용 시 로드, 설정 파일 파싱 결과는 config_manager가 캐시)"""
+        if self._analysis_config is None:
+            try:
+                self._analysis_config = config_manager.get_analysis_config(self.environment)
+            except Exception as e:
+                system_logger.error("설정 로드 실패", error=e)
+                raise EmotionSystemError("시스템 설정을 로드할 수 없습니다.", "CONFIG_ERROR")
+        return self._analysis_config
+    
+    @property
+    def data_collector(self) -> "IntegratedCollector":
+        """통합 데이터 수집기 (첫 사용 시 생성)"""
+        if self._data_collector is None:
+            def factory():
+                from data_integration import IntegratedCollector
+                return IntegratedCollector(self.user_id)
+            self._data_collector = self._create_component("데이터 수집기", factory)
+        return self._data_collector
+    
+    @property
+    def emotion_engine(self) -> "EmotionAnalysisEngine":
+        """감정 분석 엔진 (첫 사용 시 생성)"""
+        if self._emotion_engine is None:
+            def factory():
+                from analysis.emotion_engine import EmotionAnalysisEngine
+                return EmotionAnalysisEngine()
+            self._emotion_engine = self._create_component("감정 분석 엔진", factory)
+        return self._emotion_engine
+    
+    @property
+    def firebase_manager(self) -> "FirebaseManager":
+        """Firebase 매니저 (첫 사용 시 생성)"""
+        if self._firebase_manager is None:
+            def factory():
+                from database.firebase_manager import FirebaseManager
+                return FirebaseManager()
+            self._firebase_manager = self._create_component("Firebase 매니저", factory)
+        return self._firebase_manager
+    
     def _validate_system_health(self) -> bool:
         """시스템 상태 검증 (기존 파일 우선 확인)"""
         try:
             # 기존 설정 파일들 확인 (환경 변수보다 우선)
-            google_creds = "/Users/kjw/emotion-analysis-system/config/google_credentials.json"
-            firebase_config = "/Users/kjw/emotion-analysis-system/config/firebase_service_account.json"
-            
             # 핵심 파일들이 있으면 환경 변수 검사 건너뛰기
-            if os.path.exists(google_creds) and os.path.exists(firebase_config):
+            if credential_files_present():
                 system_logger.info("기존 설정 파일 발견 - 환경 변수 검증 건너뜀", {
                     "google_creds": True,
                     "firebase_config": True
@@ -113,336 +275,120 @@ class CompleteEmotionSystem:
     @monitor_performance
     def run_complete_analysis(self) -> Dict:
         """전체 감정 분석 프로세스 실행 (강화된 버전)"""
-        system_logger.info("🎯 === 통합 감정 분석 시스템 시작 ===", {
-            "user_id": self.user_id,
-            "environment": self.environment,
-            "timestamp": datetime.now().isoformat()
-        })
-        
-        try:
-            # 시스템 상태 사전 검증
-            if not self._validate_system_health():
-                raise EmotionSystemError("시스템 사전 검증 실패", "HEALTH_CHECK_FAILED")
-            
-            # 단계별 실행
-            stages = [
-                ("데이터 수집", self._collect_data_safe),
-                ("감정 분석", self._analyze_emotions_safe),
-                ("Firebase 저장", self._save_to_firebase_safe),
-                ("히스토리 분석", self._analyze_history_safe),
-                ("트렌드 분석", self._analyze_trends_safe),
-                ("개인화 피드백", self._generate_feedback_safe)
-            ]
-            
-            results = {}
-            for stage_name, stage_func in stages:
-                try:
-                    system_logger.info(f"🚀 {stage_name} 시작")
-                    
-                    stage_result = stage_func()
-                    if stage_result.get('success', False):
-                        system_logger.success(f"{stage_name} 완료")
-                        results[stage_name] = stage_result
-                    else:
-                        system_logger.error(f"{stage_name} 실패", extra_data=stage_result)
-                        # 비필수 단계는 계속 진행
-                        if stage_name in ["히스토리 분석", "트렌드 분석"]:
-                            results[stage_name] = {"success": False, "optional": True}
-                            continue
-                        else:
-                            raise EmotionSystemError(f"{stage_name} 실패", "STAGE_FAILED")
-                    
-                except Exception as e:
-                    system_logger.error(f"{stage_name} 예외 발생", error=e)
-                    if stage_name in ["데이터 수집", "감정 분석"]:  # 필수 단계
-                        raise
-                    else:  # 선택적 단계
-                        results[stage_name] = {"success": False, "error": str(e)}
-            
-            # 성공적인 실행 기록
-            self.system_health["last_successful_run"] = datetime.now()
-            self.system_health["consecutive_failures"] = 0
-            
-            final_result = {
-                "success": True,
-                "user_id": self.user_id,
-                "timestamp": datetime.now().isoformat(),
-                "stages": results,
-                "system_health": self.system_health,
-                "performance_summary": performance_monitor.get_performance_summary(1)
-            }
-            
-            system_logger.success("🎉 전체 분석 프로세스 완료", {
-                "stages_completed": len([r for r in results.values() if r.get('success')]),
-                "total_stages": len(stages)
-            })
-            
-            return final_result
-            
-        except Exception as e:
-            # 실패 카운터 증가
-            self.system_health["consecutive_failures"] += 1
-            
-            system_logger.error("감정 분석 시스템 실행 실패", error=e, extra_data={
-                "consecutive_failures": self.system_health["consecutive_failures"]
-            })
+        # 이 실행(과 실행의 단계들)에서 남긴 로그만 메모리에 모았다가 실행이 끝날 때 한 번에 기록
+        with system_logger.buffered():
+            # 한 번의 실행은 하나의 기준 시각을 공유
+            run_ts = datetime.now()
+            run_iso = run_ts.isoformat()
             
-            return {
-                "success": False,
-                "error": str(e),
-                "error_type": type(e).__name__,
+            system_logger.info("🎯 === 통합 감정 분석 시스템 시작 ===", {
                 "user_id": self.user_id,
-                "timestamp": datetime.now().isoformat(),
-                "system_health": self.system_health
-            }
-        
-        # 3단계: Firebase 저장
-        success = self._save_to_firebase()
-        if not success:
-            return {'success': False, 'error': 'Firebase 저장 실패'}
-        
-        # 4단계: 히스토리 비교 분석
-        self._analyze_trends()
-        
-        # 5단계: 개인화된 피드백 생성
-        personalized_feedback = self._generate_personalized_feedback()
-        
-        # 6단계: 최종 결과 정리
-        final_result = self._compile_final_result(personalized_feedback)
-        
-        print("🎉 === 통합 감정 분석 완료 ===")
-        return final_result
-    
-    def _collect_data(self) -> bool:
-        """1단계: 통합 데이터 수집"""
-        try:
-            print("\n📊 1단계: 데이터 수집 중...")
-            self.collected_data = self.data_collector.collect_all_data()
+                "environment": self.environment,
+                "timestamp": run_iso
+            })
             
-            if not self.collected_data.get('analysis_ready', False):
-                print("❌ 데이터 수집 실패 또는 데이터 부족")
-                return False
+            try:
+                # 시스템 상태 사전 검증
+                if not self._validate_system_health():
+                    raise EmotionSystemError("시스템 사전 검증 실패", "HEALTH_CHECK_FAILED")
                 
-            youtube_count = self.collected_data.get('youtube_data', {}).get('subscription_count', 0)
-            calendar_count = self.collected_data.get('calendar_data', {}).get('event_count', 0)
-            
-            print(f"✅ 데이터 수집 완료!")
-            print(f"   📺 YouTube: 구독 {youtube_count}개")
-            print(f"   📅 Calendar: 일정 {calendar_count}개")
-            
-            return True
-            
-        except Exception as e:
-            print(f"❌ 데이터 수집 오류: {e}")
-            return False
-    
-    def _analyze_emotions(self) -> bool:
-        """2단계: 감정 분석 실행"""
-        try:
-            print("\n🧠 2단계: 감정 분석 중...")
-            
-            # YouTube 감정 분석
-            youtube_analysis = self.emotion_engine.analyze_youtube_emotions(
-                self.collected_data['youtube_data']
-            )
-            
-            # Calendar 피로도 분석
-            calendar_analysis = self.emotion_engine.analyze_calendar_fatigue(
-                self.collected_data['calendar_data']
-            )
-            
-            # 전체 감정 상태 계산
-            overall_emotion = self.emotion_engine.calculate_overall_emotion(
-                youtube_analysis, calendar_analysis
-            )
-            
-            # 분석 결과 정리
-            self.analysis_result = {
-                'analysis_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                'user_id': self.user_id,
-                'youtube_analysis': youtube_analysis,
-                'calendar_analysis': calendar_analysis,
-                'overall_emotion': overall_emotion
-            }
-            
-            print(f"✅ 감정 분석 완료!")
-            print(f"   {overall_emotion['mood_emoji']} 현재 감정: {overall_emotion['emotion_state']}")
-            
-            return True
-            
-        except Exception as e:
-            print(f"❌ 감정 분석 오류: {e}")
-            return False
-    
-    def _save_to_firebase(self) -> bool:
-        """3단계: Firebase에 결과 저장"""
-        try:
-            print("\n☁️ 3단계: Firebase 저장 중...")
-            
-            # Firebase 초기화
-            if not self.firebase_manager.initialize_firebase():
-                print("⚠️ Firebase 초기화 실패, 로컬 저장으로 진행")
-                return True  # 로컬 저장은 성공으로 처리
-            
-            # Firebase에 저장
-            analysis_id = self.firebase_manager.save_emotion_analysis(
-                self.user_id, self.analysis_result
-            )
-            
-            if analysis_id:
-                print(f"✅ Firebase 저장 완료!")
-                print(f"   📊 분석 ID: {analysis_id}")
-                return True
-            else:
-                print("❌ Firebase 저장 실패")
-                return False
+                # 단계별 실행 (같은 그룹의 단계는 서로 독립적이므로 동시에 실행)
+                results = {}
+                success_count = 0
+                for group in self._STAGE_GROUPS:
+                    stages = [(stage_name, getattr(self, method_name)) for stage_name, method_name in group]
+                    for (stage_name, _), stage_result in zip(stages, self._run_stage_group(stages)):
+                        results[stage_name] = stage_result
+                        if stage_result.get('success'):
+                            success_count += 1
                 
-        except Exception as e:
-            print(f"❌ Firebase 저장 오류: {e}")
-            return False
-    
-    def _analyze_trends(self):
-        """4단계: 히스토리 기반 트렌드 분석"""
-        try:
-            print("\n📈 4단계: 감정 변화 트렌드 분석 중...")
-            
-            # 히스토리 조회
-            self.history_data = self.firebase_manager.get_user_history(self.user_id, limit=7)
-            
-            if len(self.history_data) < 2:
-                print("ℹ️ 트렌드 분석을 위한 히스토리가 부족합니다 (최소 2개 필요)")
-                return
-            
-            # 감정 점수 변화 분석
-            emotion_scores = []
-            stress_levels = []
-            dates = []
-            
-            for data in self.history_data:
-                overall = data.get('overall_emotion', {})
-                calendar = data.get('calendar_analysis', {})
+                # 성공적인 실행 기록
+                self.system_health["last_successful_run"] = run_ts
+                self.system_health["consecutive_failures"] = 0
+                
+                final_result = {
+                    "success": True,
+                    "user_id": self.user_id,
+                    "timestamp": run_iso,
+                    "analysis_timestamp": run_iso,
+                    "emotion_summary": self._build_emotion_summary(),
+                    "personalized_feedback": results.get("개인화 피드백", {}).get("feedback"),
+                    "stages": results,
+                    "system_health": self.system_health,
+                    "performance_summary": performance_monitor.get_performance_summary(1)
+                }
                 
-                emotion_scores.append(overall.get('emotion_score', 0))
-                stress_levels.append(calendar.get('stress_level', 'unknown'))
-                dates.append(data.get('analysis_date', ''))
-            
-            # 트렌드 계산
-            if len(emotion_scores) >= 2:
-                recent_avg = sum(emotion_scores[:2]) / 2
-                older_avg = sum(emotion_scores[2:]) / len(emotion_scores[2:]) if len(emotion_scores) > 2 else recent_avg
+                system_logger.success("🎉 전체 분석 프로세스 완료", {
+                    "stages_completed": success_count,
+                    "total_stages": self._STAGE_COUNT
+                })
                 
-                trend = "상승" if recent_avg > older_avg else "하락" if recent_avg < older_avg else "유지"
+                return final_result
                 
-                print(f"✅ 트렌드 분석 완료!")
-                print(f"   📊 최근 평균 감정: {recent_avg:.2f}")
-                print(f"   📈 감정 트렌드: {trend}")
+            except Exception as e:
+                # 실패 카운터 증가
+                self.system_health["consecutive_failures"] += 1
                 
-                # 분석 결과에 트렌드 정보 추가
-                self.analysis_result['trend_analysis'] = {
-                    'emotion_trend': trend,
-                    'recent_average': recent_avg,
-                    'historical_average': older_avg,
-                    'data_points': len(emotion_scores)
-                }
+                system_logger.error("감정 분석 시스템 실행 실패", error=e, extra_data={
+                    "consecutive_failures": self.system_health["consecutive_failures"]
+                })
                 
-        except Exception as e:
-            print(f"❌ 트렌드 분석 오류: {e}")
+                return {
+                    "success": False,
+                    "error": str(e),
+                    "error_type": type(e).__name__,
+                    "user_id": self.user_id,
+                    "timestamp": run_iso,
+                    "system_health": self.system_health
+                }
+    
+    def _build_emotion_summary(self) -> Dict:
+        """API 응답용 핵심 감정 요약"""
+        calendar_analysis = self.analysis_result.get("calendar_analysis", {})
+        return {
+            "current_mood": self.analysis_result.get("emotion_state"),
+            "emotion_score": self.analysis_result.get("overall_emotion"),
+            "stress_level": calendar_analysis.get("stress_level"),
+            "fatigue_index": calendar_analysis.get("fatigue_index")
+        }
     
-    def _generate_personalized_feedback(self) -> Dict:
-        """5단계: 개인화된 피드백 생성"""
+    def _run_stage(self, stage_name: str, stage_func) -> Dict:
+        """단계 하나를 실행하고 결과 기록용 딕셔너리 반환 (필수 단계 실패 시 예외 발생)"""
         try:
-            print("\n💡 5단계: 개인화된 피드백 생성 중...")
-            
-            overall = self.analysis_result['overall_emotion']
-            calendar = self.analysis_result['calendar_analysis']
-            youtube = self.analysis_result['youtube_analysis']
-            trend = self.analysis_result.get('trend_analysis', {})
-            
-            feedback = {
-                'current_state': overall['emotion_state'],
-                'recommendations': [],
-                'insights': [],
-                'action_items': []
-            }
-            
-            # 현재 상태 기반 추천
-            emotion_state = overall['emotion_state']
-            stress_level = calendar['stress_level']
-            top_interest = overall['top_interest']
-            
-            # 기본 추천사항
-            feedback['recommendations'].extend(overall.get('recommendations', []))
-            
-            # 트렌드 기반 추천
-            emotion_trend = trend.get('emotion_trend', '')
-            if emotion_trend == "하락":
-                feedback['recommendations'].append("😔 최근 감정이 하락 추세입니다. 스트레스 관리에 더 신경써보세요.")
-                feedback['action_items'].append("이번 주 휴식 시간을 늘려보세요")
-            elif emotion_trend == "상승":
-                feedback['recommendations'].append("😊 감정이 좋아지고 있어요! 현재 패턴을 유지해보세요.")
-                feedback['action_items'].append("현재의 긍정적 활동들을 계속 이어가세요")
-            
-            # 관심사 기반 구체적 추천
-            if top_interest == 'entertainment':
-                if stress_level == 'high':
-                    feedback['action_items'].append("좋아하는 음악이나 영화로 스트레스를 풀어보세요")
-                else:
-                    feedback['action_items'].append("새로운 엔터테인먼트 콘텐츠를 탐색해보세요")
-            
-            # 인사이트 생성
-            youtube_positive = youtube['emotion_scores'].get('positive', 0)
-            if youtube_positive > 0.7:
-                feedback['insights'].append(f"🎯 관심사가 긍정적이에요! {top_interest} 분야에서 더 많은 활동을 추천합니다.")
-            
-            fatigue_index = calendar['fatigue_index']
-            if fatigue_index > 1.5:
-                feedback['insights'].append(f"📅 일정이 다소 빡빡해요. 피로도 지수: {fatigue_index:.1f}")
-            else:
-                feedback['insights'].append("📅 일정 관리가 잘 되고 있어요!")
+            system_logger.debug(f"🚀 {stage_name} 시작")
             
-            print(f"✅ 개인화된 피드백 생성 완료!")
-            print(f"   💡 추천사항: {len(feedback['recommendations'])}개")
-            print(f"   🔍 인사이트: {len(feedback['insights'])}개")
-            print(f"   ✅ 액션 아이템: {len(feedback['action_items'])}개")
+            stage_result = stage_func()
+            if stage_result.get('success', False):
+                system_logger.debug(f"{stage_name} 완료")
+                return stage_result
             
-            return feedback
+            system_logger.error(f"{stage_name} 실패", extra_data=stage_result)
+            # 비필수 단계는 계속 진행
+            if stage_name in self._OPTIONAL_STAGES:
+                return {"success": False, "optional": True}
+            raise EmotionSystemError(f"{stage_name} 실패", "STAGE_FAILED")
             
         except Exception as e:
-            print(f"❌ 피드백 생성 오류: {e}")
-            return {}
+            system_logger.error(f"{stage_name} 예외 발생", error=e)
+            if stage_name in self._REQUIRED_STAGES:
+                raise
+            return {"success": False, "error": str(e)}
     
-    def _compile_final_result(self, feedback: Dict) -> Dict:
-        """6단계: 최종 결과 정리"""
-        final_result = {
-            'success': True,
-            'user_id': self.user_id,
-            'analysis_timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            
-            # 핵심 결과
-            'emotion_summary': {
-                'current_mood': self.analysis_result['overall_emotion']['emotion_state'],
-                'mood_emoji': self.analysis_result['overall_emotion']['mood_emoji'],
-                'emotion_score': self.analysis_result['overall_emotion']['emotion_score'],
-                'stress_level': self.analysis_result['calendar_analysis']['stress_level'],
-                'fatigue_index': self.analysis_result['calendar_analysis']['fatigue_index']
-            },
-            
-            # 상세 분석
-            'detailed_analysis': self.analysis_result,
-            
-            # 개인화된 피드백
-            'personalized_feedback': feedback,
-            
-            # 메타 정보
-            'data_quality': {
-                'youtube_items': self.analysis_result['youtube_analysis']['total_channels'] + 
-                               self.analysis_result['youtube_analysis']['total_liked'],
-                'calendar_events': self.analysis_result['calendar_analysis'].get('daily_counts', {}),
-                'history_available': len(self.history_data)
-            }
-        }
-        
-        return final_result
+    def _run_stage_group(self, group: List) -> List[Dict]:
+        """단계 그룹 실행 (첫 단계는 호출한 스레드에서, 나머지는 공유 스레드풀에서 동시에 실행)"""
+        (first_name, first_func), *rest = group
+        # 호출한 스레드의 컨텍스트(실행 로그 버퍼 포함)를 복사해 스레드풀에서 실행
+        futures = [
+            _STAGE_EXECUTOR.submit(contextvars.copy_context().run, self._run_stage, stage_name, stage_func)
+            for stage_name, stage_func in rest
+        ]
+        try:
+            first_result = self._run_stage(first_name, first_func)
+        finally:
+            # 첫 단계가 예외로 끝나도 나머지 단계가 끝난 뒤에 반환 (실행 중인 단계를 남겨두지 않음)
+            wait(futures)
+        # 필수 단계의 예외는 result()에서 다시 발생
+        return [first_result] + [future.result() for future in futures]
     
     def print_beautiful_summary(self, result: Dict):
         """결과를 아름답게 출력"""
@@ -495,14 +441,14 @@ class CompleteEmotionSystem:
         print(f"\n🔧 시스템 상태:")
         print(f"  📅 마지막 성공: {system_health.get('last_successful_run', 'N/A')}")
         print(f"  🔄 연속 실패: {system_health.get('consecutive_failures', 0)}회")
-        print(f"  📊 완료된 단계: {len([s for s in stages.values() if s.get('success')])}/{len(stages)}개")
+        print(f"  📊 완료된 단계: {sum(1 for s in stages.values() if s.get('success'))}/{len(stages)}개")
         
         print("="*60)
     
     def _collect_data_safe(self) -> Dict:
         """안전한 데이터 수집"""
         try:
-            system_logger.info("데이터 수집 시작")
+            system_logger.debug("데이터 수집 시작")
             data = safe_execute(
                 lambda: self.data_collector.collect_all_data(),
                 default_return={"youtube": {"subscriptions": [], "liked_videos": []}, "calendar": {"events": []}},
@@ -568,7 +514,7 @@ class CompleteEmotionSystem:
             if not self.collected_data:
                 return {"success": False, "error": "수집된 데이터가 없습니다"}
             
-            system_logger.info("감정 분석 시작")
+            system_logger.debug("감정 분석 시작")
             analysis = safe_execute(
                 lambda: {
                     "youtube_analysis": self.emotion_engine.analyze_youtube_emotions(
@@ -600,17 +546,27 @@ class CompleteEmotionSystem:
             if not self.analysis_result:
                 return {"success": False, "error": "분석 결과가 없습니다"}
             
-            system_logger.info("Firebase 저장 시작")
-            save_result = safe_execute(
-                lambda: self.firebase_manager.save_emotion_analysis(self.user_id, self.analysis_result),
-                default_return=False,
+            system_logger.debug("Firebase 저장 시작")
+            self._pending_saves.append((self.user_id, self.analysis_result))
+            saved_ids = safe_execute(
+                lambda: self.firebase_manager.save_emotion_analysis_batch(list(self._pending_saves)),
+                default_return=[],
                 error_message="Firebase 저장 실패"
             )
             
-            if save_result:
-                return {"success": True, "firebase_saved": True}
+            # 커밋된 앞쪽 항목만 제거 (중간 배치가 실패해도 이미 저장된 분석은 다시 저장하지 않음)
+            for _ in range(len(saved_ids)):
+                self._pending_saves.popleft()
+            
+            if not self._pending_saves:
+                return {"success": True, "firebase_saved": True, "saved_count": len(saved_ids)}
             else:
-                return {"success": False, "error": "Firebase 저장 실패"}
+                return {
+                    "success": False,
+                    "error": "Firebase 저장 실패",
+                    "saved_count": len(saved_ids),
+                    "pending_saves": len(self._pending_saves)
+                }
                 
         except Exception as e:
             system_logger.error("Firebase 저장 중 예외 발생", error=e)
@@ -619,7 +575,7 @@ class CompleteEmotionSystem:
     def _analyze_history_safe(self) -> Dict:
         """안전한 히스토리 분석"""
         try:
-            system_logger.info("히스토리 분석 시작")
+            system_logger.debug("히스토리 분석 시작")
             history = safe_execute(
                 lambda: self.firebase_manager.get_user_history(self.user_id, limit=10),
                 default_return=[],
@@ -636,7 +592,7 @@ class CompleteEmotionSystem:
     def _analyze_trends_safe(self) -> Dict:
         """안전한 트렌드 분석"""
         try:
-            system_logger.info("트렌드 분석 시작")
+            system_logger.debug("트렌드 분석 시작")
             
             if not self.history_data:
                 return {"success": True, "message": "히스토리 데이터가 없어 트렌드 분석을 건너뜁니다"}
@@ -649,13 +605,17 @@ class CompleteEmotionSystem:
             }
             
             if len(self.history_data) >= 2:
-                recent_scores = [item.get("overall_emotion", 0) for item in self.history_data[:5]]
-                trend_data["recent_average"] = sum(recent_scores) / len(recent_scores)
+                # 최근 항목만 순회하며 점수를 바로 배열로 모음 (중간 리스트 없음)
+                recent_scores = np.fromiter(
+                    (item.get("overall_emotion", 0)
+                     for item in itertools.islice(self.history_data, TREND_WINDOW)),
+                    dtype=np.float64
+                )
+                recent_average = float(recent_scores.mean())
+                trend_data["recent_average"] = recent_average
                 
-                if self.analysis_result.get("overall_emotion", 0) > trend_data["recent_average"]:
-                    trend_data["trend_direction"] = "improving"
-                elif self.analysis_result.get("overall_emotion", 0) < trend_data["recent_average"]:
-                    trend_data["trend_direction"] = "declining"
+                direction = np.sign(self.analysis_result.get("overall_emotion", 0) - recent_average)
+                trend_data["trend_direction"] = TREND_DIRECTIONS[int(direction)]
             
             return {"success": True, "trend_data": trend_data}
             
@@ -666,7 +626,7 @@ class CompleteEmotionSystem:
     def _generate_feedback_safe(self) -> Dict:
         """안전한 개인화 피드백 생성"""
         try:
-            system_logger.info("개인화 피드백 생성 시작")
+            system_logger.debug("개인화 피드백 생성 시작")
             
             if not self.analysis_result:
                 return {"success": False, "error": "분석 결과가 없습니다"}
@@ -675,32 +635,21 @@ class CompleteEmotionSystem:
             emotion_state = self.analysis_result.get("emotion_state", "중성적")
             
             # 감정 상태별 맞춤 피드백
+            # 점수 구간으로 추천사항 선택 (읽기 전용 튜플을 그대로 공유, JSON 직렬화 시 배열)
+            # 대부분의 점수가 중립 구간이므로 중립 여부를 먼저 확인
+            if -FEEDBACK_SCORE_THRESHOLD <= emotion_score <= FEEDBACK_SCORE_THRESHOLD:
+                bucket = 0
+            elif emotion_score > FEEDBACK_SCORE_THRESHOLD:
+                bucket = 1
+            else:
+                bucket = -1
+            
             feedback = {
                 "main_message": f"현재 {emotion_state} 감정 상태입니다.",
                 "score": emotion_score,
-                "recommendations": []
+                "recommendations": FEEDBACK_RECOMMENDATIONS[bucket]
             }
             
-            if emotion_score > 0.3:
-                feedback["recommendations"] = [
-                    "긍정적인 감정을 유지하고 계시네요! 👍",
-                    "좋아하시는 콘텐츠를 더 탐색해보세요.",
-                    "현재의 좋은 에너지를 활용해 새로운 도전을 해보세요."
-                ]
-            elif emotion_score < -0.3:
-                feedback["recommendations"] = [
-                    "조금 힘든 시기를 보내고 계시는 것 같아요. 💪",
-                    "충분한 휴식과 자신만의 시간을 가져보세요.",
-                    "친구나 가족과의 대화 시간을 늘려보세요.",
-                    "좋아하는 음악이나 영상을 시청해보세요."
-                ]
-            else:
-                feedback["recommendations"] = [
-                    "안정적인 감정 상태를 유지하고 계시네요. 😊",
-                    "새로운 취미나 관심사를 탐색해보는 건 어떨까요?",
-                    "규칙적인 생활 패턴을 유지해보세요."
-                ]
-            
             return {"success": True, "feedback": feedback}
             
         except Exception as e:
@@ -718,22 +667,8 @@ def main():
     system.print_beautiful_summary(result)
     
     # 결과 파일 저장
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    result_file = f"/Users/kjw/emotion-analysis-system/config/complete_analysis_{timestamp}.json"
-    
-    # datetime 객체 문자열 변환
-    def serialize_datetime(obj):
-        if isinstance(obj, datetime):
-            return obj.isoformat()
-        elif isinstance(obj, dict):
-            return {k: serialize_datetime(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [serialize_datetime(item) for item in obj]
-        else:
-            return obj
-    
-    with open(result_file, 'w', encoding='utf-8') as f:
-        json.dump(serialize_datetime(result), f, ensure_ascii=False, indent=2)
+    result_file = result_file_path()
+    Path(result_file).write_bytes(serialize_result(result))
     
     print(f"\n💾 상세 결과 저장: {result_file}")
     
@@ -5,82 +5,256 @@
 - 실제 수집된 데이터 기반 분석
 """
 
-import json
+import functools
 import math
-from datetime import datetime, timedelta
-from typing import Dict, List, Tuple
+import re
+import numpy as np
+import orjson
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from utils.logging_system import system_logger
+
+# 다중 키워드 검색용 Aho-Corasick 오토마톤 (없으면 키워드별 부분 문자열 검색)
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# 다른 단어의 일부로 자주 쓰여 단독 단어로 나올 때만 인정하는 키워드 (예: '급식'의 '급')
+WHOLE_WORD_KEYWORDS = frozenset({'급'})
+
+# 텍스트별 키워드 매칭 결과 캐시 크기 (구독 채널명은 분석마다 반복해서 들어옴)
+KEYWORD_MATCH_CACHE_SIZE = 4096
+
+# 추천사항 캐시 크기 (감정 등급 5 × 스트레스 레벨 3 × 관심사 4 조합이 모두 들어가는 크기)
+RECOMMENDATION_CACHE_SIZE = 64
+
+# 종합 감정 등급 (높을수록 긍정적, 0 이하 -1부터 부정적)
+EMOTION_VERY_POSITIVE = 2
+EMOTION_POSITIVE = 1
+EMOTION_NEUTRAL = 0
+EMOTION_SOMEWHAT_NEGATIVE = -1
+EMOTION_NEGATIVE = -2
+
+# 피로도 지수 가중치 (일정 밀도, 일정 간격, 시간대)
+FATIGUE_WEIGHTS = (0.5, 0.3, 0.2)
+
+
+def _fatigue_index(total_events: int, days_with_events: int, max_daily_events: int,
+                   night_events: int, timed_events: int) -> float:
+    """피로도 지수 계산 (일정 밀도·간격·밤 일정 비율의 가중합)"""
+    if days_with_events <= 0:
+        return 0.0
+    
+    fatigue_density = total_events / days_with_events
+    fatigue_gap = max_daily_events / 10.0  # 10개 이상이면 최대
+    fatigue_time = night_events / timed_events if timed_events > 0 else 0.0
+    
+    alpha, beta, gamma = FATIGUE_WEIGHTS
+    return alpha * fatigue_density + beta * fatigue_gap + gamma * fatigue_time
+
+
+def _overall_score(positive: float, negative: float, stress_impact: float) -> float:
+    """YouTube 감정 점수에서 스트레스 영향을 뺀 전체 감정 점수"""
+    return (positive - negative) - stress_impact
+
+
+def _classify_emotion(yt_positive: float, yt_negative: float,
+                      stress_level: str, top_interest: str) -> Tuple[float, str, str, Tuple[str, ...]]:
+    """종합 감정 점수·상태·이모지·추천 계산"""
+    stress_impact = {'low': 0.1, 'medium': 0.3, 'high': 0.5}[stress_level]
+    
+    # 전체 감정 점수 계산
+    stress_adjusted_emotion = _overall_score(yt_positive, yt_negative, stress_impact)
+    
+    # 감정 상태 분류
+    if stress_adjusted_emotion > 0.3:
+        emotion_class, emotion_state, mood_emoji = EMOTION_VERY_POSITIVE, "매우 긍정적", "😊"
+    elif stress_adjusted_emotion > 0.1:
+        emotion_class, emotion_state, mood_emoji = EMOTION_POSITIVE, "긍정적", "🙂"
+    elif stress_adjusted_emotion > -0.1:
+        emotion_class, emotion_state, mood_emoji = EMOTION_NEUTRAL, "보통", "😐"
+    elif stress_adjusted_emotion > -0.3:
+        emotion_class, emotion_state, mood_emoji = EMOTION_SOMEWHAT_NEGATIVE, "다소 부정적", "😔"
+    else:
+        emotion_class, emotion_state, mood_emoji = EMOTION_NEGATIVE, "부정적", "😞"
+    
+    recommendations = _generate_recommendations(emotion_class, stress_level, top_interest)
+    return stress_adjusted_emotion, emotion_state, mood_emoji, recommendations
+
+
+@functools.lru_cache(maxsize=RECOMMENDATION_CACHE_SIZE)
+def _generate_recommendations(emotion_class: int, stress_level: str, interest: str) -> Tuple[str, ...]:
+    """상태 기반 맞춤형 추천 (emotion_class: EMOTION_* 감정 등급, 조합이 적으므로 결과 캐시)"""
+    recommendations = []
+    
+    if stress_level == 'high':
+        recommendations.append("😌 휴식이 필요한 시간입니다. 잠시 일정을 조정해보세요.")
+        
+    if emotion_class <= EMOTION_SOMEWHAT_NEGATIVE:
+        if interest == 'entertainment':
+            recommendations.append("🎬 좋아하는 영화나 음악으로 기분 전환을 해보세요.")
+        elif interest == 'lifestyle':
+            recommendations.append("🧘 힐링센터나 운동으로 스트레스를 풀어보세요.")
+    
+    if emotion_class == EMOTION_VERY_POSITIVE:
+        recommendations.append("✨ 좋은 컨디션이네요! 새로운 도전을 해보는 것도 좋겠어요.")
+        
+    return tuple(recommendations)
 
 class EmotionAnalysisEngine:
     """감정 분석을 수행하는 클래스"""
     
+    # 시간대 이름과 시(0~23)별 시간대 번호: 6~11시 morning, 12~17시 afternoon, 18~21시 evening, 나머지 night
+    _TIME_SLOTS = ('morning', 'afternoon', 'evening', 'night')
+    _NIGHT = 3
+    _HOUR_BUCKETS = (_NIGHT,) * 6 + (0,) * 6 + (1,) * 6 + (2,) * 4 + (_NIGHT,) * 2
+    
     def __init__(self):
         # Time Decay 파라미터 (λ - 람다값)
         self.lambda_decay = 0.1  # 하루에 10%씩 영향도 감소
+        self._decay_cache: Dict[int, float] = {}  # 경과 일수 -> 시간 가중치
         
         # Forgetting Factor (망각 인수)
         self.forgetting_factor = 0.05  # 하루에 5%씩 가중치 감소
         
-        # 감정 키워드 사전 (실제 데이터에 맞게 확장)
+        # 감정 키워드 사전 (실제 데이터에 맞게 확장, 매처 생성 후 바뀌지 않도록 튜플)
         self.emotion_keywords = {
-            'positive': ['힐링', '치유', '행복', '즐거', '웃음', '재미', '놀이', '게임', '음악', '재즈', 'jazz', 
-                        '영화', '리뷰', '찐뷰', '네고막', '책임', '연습', '베이스'],
-            'negative': ['스트레스', '피곤', '힘들', '우울', '불안', '걱정', '급', '재해'],
-            'neutral': ['정보', '뉴스', '공부', '학습', '회의', '센터', '풋살']
+            'positive': ('힐링', '치유', '행복', '즐거', '웃음', '재미', '놀이', '게임', '음악', '재즈', 'jazz', 
+                        '영화', '리뷰', '찐뷰', '네고막', '책임', '연습', '베이스'),
+            'negative': ('스트레스', '피곤', '힘들', '우울', '불안', '걱정', '급', '재해'),
+            'neutral': ('정보', '뉴스', '공부', '학습', '회의', '센터', '풋살')
         }
         
-        # 관심사 카테고리 분류 (실제 데이터 반영)
+        # 관심사 카테고리 분류 (실제 데이터 반영, 튜플)
         self.interest_categories = {
-            'entertainment': ['영화', '리뷰', '게임', '음악', '재즈', 'jazz', '찐뷰', '네고막', '애니'],
-            'lifestyle': ['힐링', '센터', '연습', '풋살', '베이스', '강남'],
-            'education': ['공부', '학습', '정보', '책임'],
-            'social': ['모임', '회의', '만남', '앱']
+            'entertainment': ('영화', '리뷰', '게임', '음악', '재즈', 'jazz', '찐뷰', '네고막', '애니'),
+            'lifestyle': ('힐링', '센터', '연습', '풋살', '베이스', '강남'),
+            'education': ('공부', '학습', '정보', '책임'),
+            'social': ('모임', '회의', '만남', '앱')
         }
+        
+        # 점수 행렬의 열 순서: 감정 분류 다음에 관심사 분류
+        self._emotion_names = tuple(self.emotion_keywords)
+        self._interest_names = tuple(self.interest_categories)
+        self._bucket_count = len(self._emotion_names) + len(self._interest_names)
+        
+        # 키워드별 (키워드, 해당 분류 열 번호들) 항목과 텍스트를 한 번만 훑는 매처
+        # 단독 단어 키워드는 부분 문자열 매처에서 빼고 단어 경계 정규식으로 따로 확인
+        # (텍스트는 항목마다 한 번만 소문자로 바꾼 뒤 매칭)
+        entries = self._build_keyword_entries()
+        self._keyword_entries = tuple(e for e in entries if e[0] not in WHOLE_WORD_KEYWORDS)
+        self._whole_word_entries = {e[0]: e for e in entries if e[0] in WHOLE_WORD_KEYWORDS}
+        self._whole_word_pattern = self._build_whole_word_pattern()
+        self._keyword_automaton = self._build_keyword_automaton()
+        
+        # 같은 텍스트는 다시 훑지 않고 이전 매칭 결과 재사용 (인스턴스별 캐시)
+        self._match_keywords = functools.lru_cache(maxsize=KEYWORD_MATCH_CACHE_SIZE)(
+            self._scan_keywords
+        )
+    
+    def _build_keyword_entries(self) -> Tuple[Tuple[str, Tuple[int, ...]], ...]:
+        """감정/관심사 사전을 키워드 하나당 (키워드, 분류 열 번호들) 항목 하나로 합침 (키워드는 소문자로 정규화)"""
+        columns = {}
+        bucket_keywords = list(self.emotion_keywords.values()) + list(self.interest_categories.values())
+        for column, keywords in enumerate(bucket_keywords):
+            for keyword in keywords:
+                bucket_columns = columns.setdefault(keyword.lower(), [])
+                if column not in bucket_columns:
+                    bucket_columns.append(column)
+        
+        return tuple((keyword, tuple(cols)) for keyword, cols in columns.items())
+    
+    def _build_whole_word_pattern(self):
+        """단독 단어 키워드 전체를 하나의 정규식 대안으로 컴파일 (없으면 None)
+        
+        단어 경계가 있으므로 한 위치에서는 키워드 하나만 일치 (긴 키워드 우선으로 정렬)
+        """
+        if not self._whole_word_entries:
+            return None
+        
+        keywords = sorted(self._whole_word_entries, key=len, reverse=True)
+        return re.compile(r"(?<!\w)(?:" + "|".join(map(re.escape, keywords)) + r")(?!\w)")
+    
+    def _build_keyword_automaton(self):
+        """모든 키워드를 담은 Aho-Corasick 오토마톤 생성 (라이브러리가 없으면 None)"""
+        if not AHOCORASICK_AVAILABLE:
+            return None
+        
+        automaton = ahocorasick.Automaton()
+        for entry in self._keyword_entries:
+            automaton.add_word(entry[0], entry)
+        automaton.make_automaton()
+        return automaton
+    
+    def _scan_keywords(self, text: str) -> np.ndarray:
+        """텍스트의 분류별 키워드 일치 수 벡터 반환 (같은 키워드는 한 번만, 캐시 공유용 읽기 전용)"""
+        if self._keyword_automaton is not None:
+            matched = list({entry for _, entry in self._keyword_automaton.iter(text)})
+        else:
+            matched = [entry for entry in self._keyword_entries if entry[0] in text]
+        
+        if self._whole_word_pattern is not None:
+            matched.extend(self._whole_word_entries[keyword]
+                           for keyword in set(self._whole_word_pattern.findall(text)))
+        
+        hits = np.zeros(self._bucket_count)
+        for _, columns in matched:
+            hits[list(columns)] += 1
+        hits.flags.writeable = False
+        return hits
+    
+    def _hit_matrix(self, texts: List[str]) -> np.ndarray:
+        """(텍스트 수 × 분류 수) 키워드 일치 행렬"""
+        if not texts:
+            return np.zeros((0, self._bucket_count))
+        return np.vstack([self._match_keywords(text.lower()) for text in texts])
+    
+    def _time_weights(self, dates: List[str], now: datetime) -> np.ndarray:
+        """날짜별 Time Decay 가중치 벡터 (최근일수록 높은 가중치, now: 분석 기준 시각)"""
+        today_ordinal = now.toordinal()
+        return np.fromiter(
+            (self._time_weight(self._calculate_days_ago(date_str, today_ordinal, now)) for date_str in dates),
+            dtype=np.float64,
+            count=len(dates)
+        )
     
     def analyze_youtube_emotions(self, youtube_data: Dict) -> Dict:
         """YouTube 데이터에서 감정 성향 분석"""
-        print("📺 YouTube 감정 분석 중...")
-        
         # 구독 채널 분석
         subscriptions = youtube_data.get('subscriptions', [])
         liked_videos = youtube_data.get('liked_videos', [])
         
-        emotion_scores = {'positive': 0, 'negative': 0, 'neutral': 0}
-        interests = {'entertainment': 0, 'lifestyle': 0, 'education': 0, 'social': 0}
+        # 데이터가 없으면 행렬 계산 없이 모든 점수가 0인 결과 (헬스 체크 등, 동점이므로 첫 관심사)
+        if not subscriptions and not liked_videos:
+            return {
+                'emotion_scores': dict.fromkeys(self._emotion_names, 0.0),
+                'interests': dict.fromkeys(self._interest_names, 0.0),
+                'top_interest': self._interest_names[0],
+                'total_channels': 0,
+                'total_liked': 0
+            }
         
-        # 구독 채널명 분석
-        for sub in subscriptions:
-            channel_name = sub['channel_name'].lower()
-            subscribed_date = sub['subscribed_at']
-            
-            # 시간 가중치 계산 (최근일수록 높은 가중치)
-            days_ago = self._calculate_days_ago(subscribed_date)
-            time_weight = math.exp(-self.lambda_decay * days_ago)
-            
-            # 감정 분석
-            for emotion, keywords in self.emotion_keywords.items():
-                for keyword in keywords:
-                    if keyword in channel_name:
-                        emotion_scores[emotion] += time_weight
-                        
-            # 관심사 분석
-            for category, keywords in self.interest_categories.items():
-                for keyword in keywords:
-                    if keyword in channel_name:
-                        interests[category] += time_weight
-        
-        # 좋아요한 동영상 제목 분석
-        for video in liked_videos:
-            title = video['title'].lower()
-            published_date = video['published_at']
-            
-            days_ago = self._calculate_days_ago(published_date)
-            time_weight = math.exp(-self.lambda_decay * days_ago)
-            
-            # 감정 키워드 분석
-            for emotion, keywords in self.emotion_keywords.items():
-                for keyword in keywords:
-                    if keyword in title:
-                        emotion_scores[emotion] += time_weight * 1.5  # 좋아요는 더 높은 가중치
+        n_emotions = len(self._emotion_names)
+        now = datetime.now()  # 분석 한 번에 기준 시각 하나 (항목마다 시계를 읽지 않음)
+        
+        # 구독 채널명: 감정 + 관심사 분류 모두에 시간 가중치 합산
+        # (항목 수,) 가중치 벡터 @ (항목 수 × 분류 수) 일치 행렬로 분류별 합계를 한 번에 계산
+        sub_weights = self._time_weights([sub['subscribed_at'] for sub in subscriptions], now)
+        totals = sub_weights @ self._hit_matrix([sub['channel_name'] for sub in subscriptions])
+        
+        # 좋아요한 동영상 제목: 감정 분류만 합산 (좋아요는 더 높은 가중치)
+        video_weights = self._time_weights([video['published_at'] for video in liked_videos], now) * 1.5
+        video_hits = self._hit_matrix([video['title'] for video in liked_videos])
+        totals[:n_emotions] += video_weights @ video_hits[:, :n_emotions]
+        
+        emotion_scores = dict(zip(self._emotion_names, totals[:n_emotions].tolist()))
+        interests = dict(zip(self._interest_names, totals[n_emotions:].tolist()))
+        # 정규화해도 순위는 같으므로 합계 벡터에서 바로 주요 관심사 결정 (동점이면 앞쪽 분류)
+        top_interest = self._interest_names[int(np.argmax(totals[n_emotions:]))]
         
         # 정규화
         total_emotion = sum(emotion_scores.values())
@@ -91,76 +265,59 @@ class EmotionAnalysisEngine:
         if total_interest > 0:
             interests = {k: v/total_interest for k, v in interests.items()}
         
-        print(f"   😊 긍정 성향: {emotion_scores['positive']:.2f}")
-        print(f"   😔 부정 성향: {emotion_scores['negative']:.2f}")
-        print(f"   😐 중립 성향: {emotion_scores['neutral']:.2f}")
+        system_logger.debug("📺 YouTube 감정 분석 완료", emotion_scores)
         
         return {
             'emotion_scores': emotion_scores,
             'interests': interests,
+            'top_interest': top_interest,
             'total_channels': len(subscriptions),
             'total_liked': len(liked_videos)
         }
     
     def analyze_calendar_fatigue(self, calendar_data: Dict) -> Dict:
         """Calendar 데이터에서 피로도 분석"""
-        print("📅 Calendar 피로도 분석 중...")
-        
         events = calendar_data.get('events', [])
         schedule_analysis = calendar_data.get('schedule_analysis', {})
         
         if not events:
             return {'fatigue_index': 0, 'stress_level': 'low'}
         
-        # 피로도 계산 변수들
-        daily_counts = {}
-        time_distribution = {'morning': 0, 'afternoon': 0, 'evening': 0, 'night': 0}
+        # 피로도 계산 변수들 (일정 목록을 한 번만 순회하며 모두 집계)
+        daily_counts = Counter()
+        max_daily_events = 0
+        timed_events = 0
+        slot_counts = [0] * len(self._TIME_SLOTS)  # 시간대 번호로 집계, 반환할 때만 dict로 변환
         
         for event in events:
             date = event['start_date']
             time_str = event['start_time']
             
-            # 날짜별 일정 카운트
-            daily_counts[date] = daily_counts.get(date, 0) + 1
-            
-            # 시간대별 분포 (종일 일정이 아닌 경우)
-            if time_str != "종일" and ":" in time_str:
-                hour = int(time_str.split(':')[0])
-                if 6 <= hour < 12:
-                    time_distribution['morning'] += 1
-                elif 12 <= hour < 18:
-                    time_distribution['afternoon'] += 1
-                elif 18 <= hour < 22:
-                    time_distribution['evening'] += 1
-                else:
-                    time_distribution['night'] += 1
-        
-        # 피로도 지수 계산
-        days_with_events = len(daily_counts)
-        if days_with_events > 0:
-            # 1. 일정 밀도 (Fatigue_density)
-            total_events = len(events)
-            fatigue_density = total_events / days_with_events
-            
-            # 2. 일정 간격 피로도 (연속된 일정이 많을수록 피로도 증가)
-            max_daily_events = max(daily_counts.values()) if daily_counts else 0
-            fatigue_gap = max_daily_events / 10.0  # 10개 이상이면 최대
+            # 날짜별 일정 카운트와 하루 최대 일정 수
+            count = daily_counts[date] + 1
+            daily_counts[date] = count
+            if count > max_daily_events:
+                max_daily_events = count
             
-            # 3. 시간대 피로도 (밤 일정이 많을수록 피로도 증가)
-            total_timed_events = sum(time_distribution.values())
-            if total_timed_events > 0:
-                night_ratio = time_distribution['night'] / total_timed_events
-                fatigue_time = night_ratio
-            else:
-                fatigue_time = 0
-            
-            # 전체 피로도 지수 (가중 평균)
-            alpha, beta, gamma = 0.5, 0.3, 0.2  # 가중치
-            fatigue_index = (alpha * fatigue_density + 
-                           beta * fatigue_gap + 
-                           gamma * fatigue_time)
-        else:
-            fatigue_index = 0
+            # 시간대별 분포 (종일 일정이 아닌 경우, "종일"에는 ':'가 없으므로 위치 검색 한 번으로 판별)
+            colon = time_str.find(':')
+            if colon != -1:
+                timed_events += 1
+                hour = int(time_str[:colon])
+                # 범위를 벗어난 값(24시 등)은 기존과 같이 night로 분류
+                slot = self._HOUR_BUCKETS[hour] if 0 <= hour < 24 else self._NIGHT
+                slot_counts[slot] += 1
+        
+        time_distribution = dict(zip(self._TIME_SLOTS, slot_counts))
+        
+        # 피로도 지수 계산 (밀도·간격·밤 일정 비율의 가중합)
+        fatigue_index = _fatigue_index(
+            len(events),
+            len(daily_counts),
+            max_daily_events,
+            slot_counts[self._NIGHT],
+            timed_events
+        )
         
         # 스트레스 레벨 결정
         if fatigue_index > 2.0:
@@ -170,9 +327,11 @@ class EmotionAnalysisEngine:
         else:
             stress_level = 'low'
         
-        print(f"   📊 피로도 지수: {fatigue_index:.2f}")
-        print(f"   😰 스트레스 레벨: {stress_level}")
-        print(f"   🌙 밤 일정 비율: {time_distribution['night']}/{sum(time_distribution.values()) if sum(time_distribution.values()) > 0 else 1}")
+        system_logger.debug("📅 Calendar 피로도 분석 완료", {
+            "fatigue_index": fatigue_index,
+            "stress_level": stress_level,
+            "time_distribution": time_distribution
+        })
         
         return {
             'fatigue_index': fatigue_index,
@@ -184,8 +343,6 @@ class EmotionAnalysisEngine:
     
     def calculate_overall_emotion(self, youtube_analysis: Dict, calendar_analysis: Dict) -> Dict:
         """전체적인 감정 상태 계산"""
-        print("🎯 전체 감정 상태 분석 중...")
-        
         # YouTube 감정 점수
         yt_emotions = youtube_analysis['emotion_scores']
         yt_positive = yt_emotions.get('positive', 0)
@@ -193,73 +350,57 @@ class EmotionAnalysisEngine:
         
         # Calendar 스트레스
         stress_level = calendar_analysis['stress_level']
-        stress_impact = {'low': 0.1, 'medium': 0.3, 'high': 0.5}[stress_level]
         
-        # 전체 감정 점수 계산
-        base_emotion = yt_positive - yt_negative
-        stress_adjusted_emotion = base_emotion - stress_impact
+        # 관심사 기반 추천 (YouTube 분석에서 이미 정한 값 사용, 없으면 관심사 점수에서 계산)
+        top_interest = youtube_analysis.get('top_interest')
+        if top_interest is None:
+            top_interest = max(youtube_analysis['interests'].items(), key=lambda x: x[1])[0]
         
-        # 감정 상태 분류
-        if stress_adjusted_emotion > 0.3:
-            emotion_state = "매우 긍정적"
-            mood_emoji = "😊"
-        elif stress_adjusted_emotion > 0.1:
-            emotion_state = "긍정적"
-            mood_emoji = "🙂"
-        elif stress_adjusted_emotion > -0.1:
-            emotion_state = "보통"
-            mood_emoji = "😐"
-        elif stress_adjusted_emotion > -0.3:
-            emotion_state = "다소 부정적"
-            mood_emoji = "😔"
-        else:
-            emotion_state = "부정적"
-            mood_emoji = "😞"
-        
-        # 관심사 기반 추천
-        top_interest = max(youtube_analysis['interests'].items(), key=lambda x: x[1])
+        stress_adjusted_emotion, emotion_state, mood_emoji, recommendations = _classify_emotion(
+            yt_positive, yt_negative, stress_level, top_interest
+        )
         
-        print(f"   {mood_emoji} 감정 상태: {emotion_state}")
-        print(f"   🎯 주요 관심사: {top_interest[0]}")
+        system_logger.debug(f"{mood_emoji} 전체 감정 상태 분석 완료", {
+            "emotion_state": emotion_state,
+            "top_interest": top_interest
+        })
         
         return {
             'emotion_score': stress_adjusted_emotion,
             'emotion_state': emotion_state,
             'mood_emoji': mood_emoji,
-            'top_interest': top_interest[0],
-            'recommendations': self._generate_recommendations(emotion_state, stress_level, top_interest[0])
+            'top_interest': top_interest,
+            'recommendations': list(recommendations)
         }
     
-    def _calculate_days_ago(self, date_str: str) -> int:
-        """날짜로부터 며칠 전인지 계산"""
+    def _time_weight(self, days_ago: int) -> float:
+        """경과 일수별 Time Decay 가중치 (일수는 정수이므로 값마다 한 번만 계산)"""
+        weight = self._decay_cache.get(days_ago)
+        if weight is None:
+            weight = math.exp(-self.lambda_decay * days_ago)
+            self._decay_cache[days_ago] = weight
+        return weight
+    
+    def _calculate_days_ago(self, date_str: str, today_ordinal: Optional[int] = None,
+                            now: Optional[datetime] = None) -> int:
+        """날짜로부터 며칠 전인지 계산 (today_ordinal/now: 여러 날짜를 계산할 때 한 번만 구한 기준 날짜 서수/시각)"""
         try:
-            if len(date_str) == 10:  # YYYY-MM-DD 형식
-                date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-            else:  # ISO 형식
-                date_obj = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+            if len(date_str) == 10:  # YYYY-MM-DD 형식 (strptime 대신 슬라이싱으로 직접 파싱)
+                if date_str[4] != '-' or date_str[7] != '-':
+                    return 0
+                if today_ordinal is None:
+                    today_ordinal = date.today().toordinal()
+                date_ordinal = date(int(date_str[:4]), int(date_str[5:7]), int(date_str[8:10])).toordinal()
+                return max(0, today_ordinal - date_ordinal)
             
-            days_ago = (datetime.now() - date_obj).days
+            # ISO 형식
+            date_obj = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+            if now is None:
+                now = datetime.now()
+            days_ago = (now - date_obj).days
             return max(0, days_ago)
         except:
             return 0
-    
-    def _generate_recommendations(self, emotion_state: str, stress_level: str, interest: str) -> List[str]:
-        """상태 기반 맞춤형 추천"""
-        recommendations = []
-        
-        if stress_level == 'high':
-            recommendations.append("😌 휴식이 필요한 시간입니다. 잠시 일정을 조정해보세요.")
-            
-        if '부정적' in emotion_state:
-            if interest == 'entertainment':
-                recommendations.append("🎬 좋아하는 영화나 음악으로 기분 전환을 해보세요.")
-            elif interest == 'lifestyle':
-                recommendations.append("🧘 힐링센터나 운동으로 스트레스를 풀어보세요.")
-        
-        if emotion_state == "매우 긍정적":
-            recommendations.append("✨ 좋은 컨디션이네요! 새로운 도전을 해보는 것도 좋겠어요.")
-            
-        return recommendations
 
 def test_emotion_analysis():
     """실제 수집된 데이터로 감정 분석 테스트"""
@@ -267,8 +408,8 @@ def test_emotion_analysis():
     
     # 실제 수집된 데이터 로드
     try:
-        with open('/Users/kjw/emotion-analysis-system/config/collected_data_20260202_194351.json', 'r', encoding='utf-8') as f:
-            collected_data = json.load(f)
+        with open('/Users/kjw/emotion-analysis-system/config/collected_data_20260202_194351.json', 'rb') as f:
+            collected_data = orjson.loads(f.read())
     except FileNotFoundError:
         print("❌ 수집된 데이터 파일을 찾을 수 없습니다.")
         return False
@@ -317,8 +458,8 @@ def test_emotion_analysis():
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     result_file = f"/Users/kjw/emotion-analysis-system/config/emotion_analysis_{timestamp}.json"
     
-    with open(result_file, 'w', encoding='utf-8') as f:
-        json.dump(analysis_result, f, ensure_ascii=False, indent=2)
+    with open(result_file, 'wb') as f:
+        f.write(orjson.dumps(analysis_result, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
     
     print(f"\n💾 분석 결과 저장: {result_file}")
     print("="*50)
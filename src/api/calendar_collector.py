@@ -5,9 +5,17 @@ Google Calendar 데이터 수집기
 """
 
 import json
-import os
 from datetime import datetime, timedelta
-from googleapiclient.discovery import build
+
+from api.google_service import build_service
+from utils import paths
+
+# 저장된 OAuth 토큰과 클라이언트 자격 증명 파일 (시스템 기준 설정 디렉토리)
+TOKEN_FILE = str(paths.CONFIG / "token.json")
+CREDENTIALS_FILE = str(paths.CONFIG / "google_credentials.json")
+
+# 일정 조회 시 응답에 포함할 필드 (사용하는 필드만 받아 응답 크기와 JSON 파싱 시간 감소)
+EVENT_LIST_FIELDS = "items(summary,start,description,location)"
 
 class CalendarCollector:
     """Google Calendar 데이터를 수집하는 클래스"""
@@ -21,27 +29,31 @@ class CalendarCollector:
             print("📅 Calendar API 연결 중...")
             
             # 먼저 저장된 토큰으로 시도
-            token_file = "/Users/kjw/emotion-analysis-system/config/token.json"
-            if os.path.exists(token_file):
-                print("🎫 저장된 토큰 사용...")
-                from google.oauth2.credentials import Credentials
+            token_file = TOKEN_FILE
+            from google.oauth2.credentials import Credentials
+            try:
                 creds = Credentials.from_authorized_user_file(token_file)
+            except FileNotFoundError:
+                creds = None  # 저장된 토큰 없음
+            
+            if creds is not None:
+                print("🎫 저장된 토큰 사용...")
                 
                 # Calendar API 서비스 생성
-                self.service = build('calendar', 'v3', credentials=creds)
+                self.service = build_service('calendar', 'v3', creds)
                 print("✅ Calendar API 연결 성공! (토큰 재사용)")
                 return True
             
             # 토큰이 없으면 새로 인증
             from google_auth_oauthlib.flow import InstalledAppFlow
-            credentials_file = "/Users/kjw/emotion-analysis-system/config/google_credentials.json"
+            credentials_file = CREDENTIALS_FILE
             scopes = ['https://www.googleapis.com/auth/calendar.readonly']
             
             flow = InstalledAppFlow.from_client_secrets_file(credentials_file, scopes)
             creds = flow.run_local_server(port=8080)
             
             # Calendar API 서비스 생성
-            self.service = build('calendar', 'v3', credentials=creds)
+            self.service = build_service('calendar', 'v3', creds)
             print("✅ Calendar API 연결 성공! (새 인증)")
             return True
             
@@ -98,12 +110,13 @@ class CalendarCollector:
                 timeMax=time_max,
                 maxResults=max_results,
                 singleEvents=True,
-                orderBy='startTime'
+                orderBy='startTime',
+                fields=EVENT_LIST_FIELDS
             )
             response = request.execute()
             
             events = []
-            for item in response['items']:
+            for item in response.get('items', []):  # 필드 마스크 적용 시 빈 목록은 생략될 수 있음
                 # 시작 시간 처리
                 start = item['start'].get('dateTime', item['start'].get('date'))
                 if 'T' in start:
@@ -0,0 +1,49 @@
+"""
+Google API 서비스 생성 도우미
+- 디스커버리 문서를 프로세스당 한 번만 읽고 파싱해서 재사용
+- 서비스 객체(httplib2 연결)는 스레드 안전하지 않으므로 연결할 때마다 새로 생성
+- 대신 스레드마다 httplib2.Http 하나를 재사용해서 같은 호스트로의 TCP/TLS 연결 유지 (keep-alive)
+"""
+
+import threading
+
+import google_auth_httplib2
+import httplib2
+import orjson
+from googleapiclient import discovery_cache
+from googleapiclient.discovery import build, build_from_document
+
+# HTTP 요청 타임아웃 (초)
+HTTP_TIMEOUT_SECONDS = 30
+
+# (API 이름, 버전) -> 파싱된 디스커버리 문서
+_DISCOVERY_DOCS = {}
+_DISCOVERY_LOCK = threading.Lock()
+
+# 스레드별 재사용 HTTP 연결 (httplib2.Http는 스레드 간 공유하면 안 됨)
+_THREAD_LOCAL = threading.local()
+
+def _get_discovery_doc(api_name, version):
+    """라이브러리에 포함된 정적 디스커버리 문서를 한 번만 파싱 (없으면 None)"""
+    key = (api_name, version)
+    with _DISCOVERY_LOCK:
+        if key not in _DISCOVERY_DOCS:
+            content = discovery_cache.get_static_doc(api_name, version)
+            _DISCOVERY_DOCS[key] = orjson.loads(content) if content else None
+        return _DISCOVERY_DOCS[key]
+
+def _get_thread_http():
+    """현재 스레드의 httplib2.Http (처음 호출할 때 생성, 이후 연결 재사용)"""
+    http = getattr(_THREAD_LOCAL, 'http', None)
+    if http is None:
+        http = httplib2.Http(timeout=HTTP_TIMEOUT_SECONDS)
+        _THREAD_LOCAL.http = http
+    return http
+
+def build_service(api_name, version, credentials):
+    """API 서비스 객체 생성 (캐시된 디스커버리 문서 + 스레드별 keep-alive 연결 사용)"""
+    http = google_auth_httplib2.AuthorizedHttp(credentials, http=_get_thread_http())
+    doc = _get_discovery_doc(api_name, version)
+    if doc is None:
+        return build(api_name, version, http=http)
+    return build_from_document(doc, http=http)
@@ -5,14 +5,19 @@ YouTube 데이터 수집기
 """
 
 import json
-import os
-from googleapiclient.discovery import build
+
+from api.google_service import build_service
+from utils import paths
+
+# 저장된 OAuth 토큰과 클라이언트 자격 증명 파일 (시스템 기준 설정 디렉토리)
+TOKEN_FILE = str(paths.CONFIG / "token.json")
+CREDENTIALS_FILE = str(paths.CONFIG / "google_credentials.json")
 
 class YouTubeCollector:
     """YouTube 데이터를 수집하는 클래스"""
     
     def __init__(self):
-        self.token_file = "/Users/kjw/emotion-analysis-system/config/token.json"
+        self.token_file = TOKEN_FILE
         self.service = None
         
     def connect(self):
@@ -21,27 +26,31 @@ class YouTubeCollector:
             print("🔗 YouTube API 연결 중...")
             
             # 먼저 저장된 토큰으로 시도
-            token_file = "/Users/kjw/emotion-analysis-system/config/token.json"
-            if os.path.exists(token_file):
-                print("🎫 저장된 토큰 사용...")
-                from google.oauth2.credentials import Credentials
+            token_file = TOKEN_FILE
+            from google.oauth2.credentials import Credentials
+            try:
                 creds = Credentials.from_authorized_user_file(token_file)
+            except FileNotFoundError:
+                creds = None  # 저장된 토큰 없음
+            
+            if creds is not None:
+                print("🎫 저장된 토큰 사용...")
                 
                 # YouTube API 서비스 생성
-                self.service = build('youtube', 'v3', credentials=creds)
+                self.service = build_service('youtube', 'v3', creds)
                 print("✅ YouTube API 연결 성공! (토큰 재사용)")
                 return True
             
             # 토큰이 없으면 새로 인증
             from google_auth_oauthlib.flow import InstalledAppFlow
-            credentials_file = "/Users/kjw/emotion-analysis-system/config/google_credentials.json"
+            credentials_file = CREDENTIALS_FILE
             scopes = ['https://www.googleapis.com/auth/youtube.readonly']
             
             flow = InstalledAppFlow.from_client_secrets_file(credentials_file, scopes)
             creds = flow.run_local_server(port=8080)
             
             # YouTube API 서비스 생성
-            self.service = build('youtube', 'v3', credentials=creds)
+            self.service = build_service('youtube', 'v3', creds)
             print("✅ YouTube API 연결 성공! (새 인증)")
             return True
             
@@ -75,76 +84,114 @@ class YouTubeCollector:
             print(f"❌ 테스트 실패: {e}")
             return False
     
+    def _subscriptions_request(self, max_results):
+        """구독 채널 목록 요청 생성"""
+        return self.service.subscriptions().list(
+            part="snippet",
+            mine=True,
+            maxResults=max_results
+        )
+    
+    def _liked_videos_request(self, max_results):
+        """좋아요한 동영상 목록 요청 생성"""
+        return self.service.videos().list(
+            part="snippet",
+            myRating="like",
+            maxResults=max_results
+        )
+    
+    def _parse_subscriptions(self, response):
+        """구독 채널 응답을 채널 정보 리스트로 변환"""
+        subscriptions = []
+        for item in response['items']:
+            channel_info = {
+                'channel_name': item['snippet']['title'],
+                'channel_id': item['snippet']['resourceId']['channelId'],
+                'subscribed_at': item['snippet']['publishedAt'][:10]  # 날짜만
+            }
+            subscriptions.append(channel_info)
+            
+        print(f"✅ 구독 채널 {len(subscriptions)}개 수집 완료!")
+        
+        # 결과 미리보기
+        for i, sub in enumerate(subscriptions[:3], 1):
+            print(f"   {i}. {sub['channel_name']} (구독일: {sub['subscribed_at']})")
+        
+        if len(subscriptions) > 3:
+            print(f"   ... 외 {len(subscriptions)-3}개")
+            
+        return subscriptions
+    
+    def _parse_liked_videos(self, response):
+        """좋아요한 동영상 응답을 동영상 정보 리스트로 변환"""
+        liked_videos = []
+        for item in response['items']:
+            video_info = {
+                'title': item['snippet']['title'],
+                'video_id': item['id'],
+                'channel': item['snippet']['channelTitle'],
+                'published_at': item['snippet']['publishedAt'][:10]
+            }
+            liked_videos.append(video_info)
+            
+        print(f"✅ 좋아요한 동영상 {len(liked_videos)}개 수집 완료!")
+        
+        # 결과 미리보기
+        for i, video in enumerate(liked_videos[:3], 1):
+            print(f"   {i}. {video['title'][:50]}... ({video['channel']})")
+        
+        if len(liked_videos) > 3:
+            print(f"   ... 외 {len(liked_videos)-3}개")
+            
+        return liked_videos
+    
     def get_subscriptions(self, max_results=10):
         """구독한 채널 목록 가져오기 (처음에는 10개만)"""
         try:
             print(f"📺 구독 채널 {max_results}개 가져오는 중...")
-            
-            request = self.service.subscriptions().list(
-                part="snippet",
-                mine=True,
-                maxResults=max_results
-            )
-            response = request.execute()
-            
-            subscriptions = []
-            for item in response['items']:
-                channel_info = {
-                    'channel_name': item['snippet']['title'],
-                    'channel_id': item['snippet']['resourceId']['channelId'],
-                    'subscribed_at': item['snippet']['publishedAt'][:10]  # 날짜만
-                }
-                subscriptions.append(channel_info)
-                
-            print(f"✅ 구독 채널 {len(subscriptions)}개 수집 완료!")
-            
-            # 결과 미리보기
-            for i, sub in enumerate(subscriptions[:3], 1):
-                print(f"   {i}. {sub['channel_name']} (구독일: {sub['subscribed_at']})")
-            
-            if len(subscriptions) > 3:
-                print(f"   ... 외 {len(subscriptions)-3}개")
-                
-            return subscriptions
+            response = self._subscriptions_request(max_results).execute()
+            return self._parse_subscriptions(response)
             
         except Exception as e:
             print(f"❌ 구독 채널 가져오기 실패: {e}")
+            return []
+    
     def get_liked_videos(self, max_results=10):
         """좋아요한 동영상 목록 가져오기"""
         try:
             print(f"👍 좋아요한 동영상 {max_results}개 가져오는 중...")
+            response = self._liked_videos_request(max_results).execute()
+            return self._parse_liked_videos(response)
             
-            request = self.service.videos().list(
-                part="snippet",
-                myRating="like",
-                maxResults=max_results
-            )
-            response = request.execute()
-            
-            liked_videos = []
-            for item in response['items']:
-                video_info = {
-                    'title': item['snippet']['title'],
-                    'video_id': item['id'],
-                    'channel': item['snippet']['channelTitle'],
-                    'published_at': item['snippet']['publishedAt'][:10]
-                }
-                liked_videos.append(video_info)
-                
-            print(f"✅ 좋아요한 동영상 {len(liked_videos)}개 수집 완료!")
+        except Exception as e:
+            print(f"❌ 좋아요한 동영상 가져오기 실패: {e}")
+            return []
+    
+    def get_subscriptions_and_liked_videos(self, max_results=10):
+        """구독 채널과 좋아요한 동영상을 한 번의 배치 HTTP 요청으로 가져오기 (왕복 1회)"""
+        responses = {}
+        
+        def on_response(request_id, response, exception):
+            if exception is not None:
+                print(f"❌ {request_id} 가져오기 실패: {exception}")
+                return
+            responses[request_id] = response
+        
+        try:
+            print(f"📺 구독 채널/좋아요한 동영상 {max_results}개씩 가져오는 중...")
             
-            # 결과 미리보기
-            for i, video in enumerate(liked_videos[:3], 1):
-                print(f"   {i}. {video['title'][:50]}... ({video['channel']})")
+            batch = self.service.new_batch_http_request(callback=on_response)
+            batch.add(self._subscriptions_request(max_results), request_id="subscriptions")
+            batch.add(self._liked_videos_request(max_results), request_id="liked_videos")
+            batch.execute()
             
-            if len(liked_videos) > 3:
-                print(f"   ... 외 {len(liked_videos)-3}개")
-                
-            return liked_videos
+            subscriptions = self._parse_subscriptions(responses["subscriptions"]) if "subscriptions" in responses else []
+            liked_videos = self._parse_liked_videos(responses["liked_videos"]) if "liked_videos" in responses else []
+            return subscriptions, liked_videos
             
         except Exception as e:
-            print(f"❌ 좋아요한 동영상 가져오기 실패: {e}")
-            return []
+            print(f"❌ 배치 요청 실패: {e}")
+            return [], []
 
 def test_youtube_api():
     """YouTube API 테스트 실행"""
@@ -12,17 +12,16 @@ from datetime import datetime, timedelta
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
+from api.google_service import build_service
 from googleapiclient.errors import HttpError
+import threading
 import time
 
 # 로깅 시스템 import
-import sys
-sys.path.append('/Users/kjw/emotion-analysis-system/src')
-
 try:
     from utils.logging_system import system_logger, log_execution, retry_operation, DataCollectionError
     from utils.config_manager import config_manager
+    from utils import paths
 except ImportError:
     # 테스트 환경에서는 기본 로깅 사용
     class MockLogger:
@@ -50,10 +49,31 @@ except ImportError:
             return APIConfig()
     config_manager = MockConfigManager()
 
+# 필요한 권한 범위 (Google에서 권장하는 형식, 불변 튜플이라 캐시 키로 바로 사용)
+OAUTH_SCOPES = (
+    'https://www.googleapis.com/auth/youtube.readonly',
+    'https://www.googleapis.com/auth/calendar.readonly',
+    'https://www.googleapis.com/auth/userinfo.email',
+    'https://www.googleapis.com/auth/userinfo.profile',
+    'openid'
+)
+
+# 자격 증명 파일 검증 결과 재사용 시간 (초, 같은 파일을 연달아 다시 열지 않도록)
+CREDENTIALS_CHECK_TTL_SECONDS = 5.0
+
+# 자격 증명 파일 경로 -> (검증 시각(time.monotonic), 검증 결과)
+_CREDENTIALS_CHECKS = {}
+
 class GoogleAuthenticator:
     """Google OAuth 인증을 관리하는 클래스 (강화된 버전)"""
     
-    def __init__(self, config_path="/Users/kjw/emotion-analysis-system/config"):
+    # 프로세스 내 자격 증명 캐시: (토큰 파일, 권한 범위) -> Credentials (인스턴스 간 공유)
+    _CREDS_CACHE = {}
+    _CREDS_LOCK = threading.Lock()
+    # 백그라운드 갱신이 진행 중인 캐시 키 (키마다 갱신 스레드 하나만)
+    _REFRESHING_KEYS = set()
+    
+    def __init__(self, config_path=str(paths.CONFIG)):
         self.config_path = config_path
         self.credentials_file = f"{config_path}/google_credentials.json"
         self.token_file = f"{config_path}/token.json"
@@ -67,14 +87,8 @@ class GoogleAuthenticator:
         except Exception as e:
             system_logger.error("API 설정 로드 실패", error=e)
         
-        # 필요한 권한 범위 (Google에서 권장하는 형식)
-        self.scopes = [
-            'https://www.googleapis.com/auth/youtube.readonly',
-            'https://www.googleapis.com/auth/calendar.readonly',
-            'https://www.googleapis.com/auth/userinfo.email',
-            'https://www.googleapis.com/auth/userinfo.profile',
-            'openid'
-        ]
+        # 필요한 권한 범위 (모든 인스턴스가 같은 튜플 공유)
+        self.scopes = OAUTH_SCOPES
         
         # 인증 상태 추적
         self.last_auth_time = None
@@ -87,11 +101,17 @@ class GoogleAuthenticator:
         })
     
     def _validate_credentials_file(self) -> bool:
-        """자격 증명 파일 검증"""
-        if not os.path.exists(self.credentials_file):
-            system_logger.error("Google 자격 증명 파일이 없습니다")
-            return False
+        """자격 증명 파일 검증 (CREDENTIALS_CHECK_TTL_SECONDS 안에 검증한 파일은 이전 결과 사용)"""
+        cached = _CREDENTIALS_CHECKS.get(self.credentials_file)
+        if cached is not None and time.monotonic() - cached[0] < CREDENTIALS_CHECK_TTL_SECONDS:
+            return cached[1]
         
+        valid = self._check_credentials_file()
+        _CREDENTIALS_CHECKS[self.credentials_file] = (time.monotonic(), valid)
+        return valid
+    
+    def _check_credentials_file(self) -> bool:
+        """자격 증명 파일을 열어 필수 필드 확인"""
         try:
             with open(self.credentials_file, 'r') as f:
                 creds_data = json.load(f)
@@ -110,6 +130,9 @@ class GoogleAuthenticator:
             system_logger.info("자격 증명 파일 검증 성공")
             return True
             
+        except FileNotFoundError:
+            system_logger.error("Google 자격 증명 파일이 없습니다")
+            return False
         except json.JSONDecodeError as e:
             system_logger.error("자격 증명 파일 형식 오류", error=e)
             return False
@@ -125,9 +148,78 @@ class GoogleAuthenticator:
         time_until_expiry = creds.expiry - datetime.utcnow()
         return time_until_expiry.total_seconds() < (threshold_minutes * 60)
     
+    def _cache_key(self):
+        """자격 증명 캐시 키 (scopes가 이미 튜플이면 tuple()은 복사 없이 그대로 반환)"""
+        return (self.token_file, tuple(self.scopes))
+    
+    def _get_cached_credentials(self):
+        """캐시된 자격 증명 (유효할 때만, 없으면 None; 곧 만료되면 백그라운드 갱신 시작)"""
+        with self._CREDS_LOCK:
+            creds = self._CREDS_CACHE.get(self._cache_key())
+        if creds and creds.valid:
+            if self._is_token_expired_soon(creds):
+                self._start_background_refresh(creds)
+            return creds
+        return None
+    
+    def _save_token(self, creds):
+        """토큰 파일을 원자적으로 저장 (임시 파일에 한 번에 쓰고 디스크에 반영한 뒤 교체)"""
+        # 스레드별 임시 파일 (백그라운드 갱신과 전경 로그인이 겹쳐도 서로 덮어쓰지 않음)
+        tmp_file = f"{self.token_file}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_file, 'w') as token:
+                token.write(creds.to_json())
+                token.flush()
+                os.fsync(token.fileno())
+            os.replace(tmp_file, self.token_file)
+        except Exception:
+            try:
+                os.remove(tmp_file)
+            except FileNotFoundError:
+                pass
+            raise
+    
+    def _start_background_refresh(self, creds):
+        """곧 만료될 토큰을 백그라운드 스레드에서 갱신 (이미 갱신 중이면 무시)"""
+        if not creds.refresh_token:
+            return
+        
+        key = self._cache_key()
+        with self._CREDS_LOCK:
+            if key in self._REFRESHING_KEYS:
+                return
+            self._REFRESHING_KEYS.add(key)
+        
+        threading.Thread(target=self._background_refresh, args=(creds, key), daemon=True).start()
+    
+    def _background_refresh(self, creds, key):
+        """토큰 갱신 후 파일과 캐시 반영 (호출자는 기다리지 않음)"""
+        try:
+            creds.refresh(Request())
+            self._save_token(creds)
+            self._cache_credentials(creds)
+            system_logger.info("토큰 백그라운드 갱신 완료")
+        except Exception as e:
+            system_logger.warning("토큰 백그라운드 갱신 실패", extra_data={"error": str(e)})
+        finally:
+            with self._CREDS_LOCK:
+                self._REFRESHING_KEYS.discard(key)
+    
+    def _cache_credentials(self, creds):
+        """로그인/갱신에 성공한 자격 증명을 캐시에 저장"""
+        with self._CREDS_LOCK:
+            self._CREDS_CACHE[self._cache_key()] = creds
+    
     @log_execution
     def login(self):
         """Google 계정으로 로그인 (강화된 버전)"""
+        # 같은 프로세스에서 이미 로그인했으면 토큰 파일을 다시 읽지 않음
+        creds = self._get_cached_credentials()
+        if creds:
+            self.auth_failures = 0
+            self.last_auth_time = datetime.now()
+            return creds
+        
         system_logger.info("🔐 Google 로그인을 시작합니다...")
         
         # 자격 증명 파일 검증
@@ -137,48 +229,54 @@ class GoogleAuthenticator:
         creds = None
         
         try:
-            # 기존 토큰이 있고 유효하면 사용
-            if os.path.exists(self.token_file):
-                try:
-                    creds = Credentials.from_authorized_user_file(self.token_file, self.scopes)
+            # 기존 토큰이 있고 유효하면 사용 (파일 존재 여부는 열어 보면서 확인)
+            try:
+                creds = Credentials.from_authorized_user_file(self.token_file, self.scopes)
+                
+                # 토큰이 유효함 (곧 만료되면 사용은 그대로 하고 갱신은 백그라운드에서)
+                if creds and creds.valid:
+                    system_logger.success("기존 토큰 사용 (유효함)")
+                    self._cache_credentials(creds)
+                    if self._is_token_expired_soon(creds):
+                        self._start_background_refresh(creds)
+                    self.auth_failures = 0
+                    self.last_auth_time = datetime.now()
+                    return creds
+                
+                # 토큰이 만료되었지만 refresh_token이 있음
+                elif creds and creds.expired and creds.refresh_token:
+                    system_logger.info("토큰 갱신 중...")
+                    creds.refresh(Request())
                     
-                    # 토큰이 유효하고 곧 만료되지 않음
-                    if creds and creds.valid and not self._is_token_expired_soon(creds):
-                        system_logger.success("기존 토큰 사용 (유효함)")
-                        self.auth_failures = 0
-                        self.last_auth_time = datetime.now()
-                        return creds
+                    # 갱신된 토큰 저장
+                    self._save_token(creds)
                     
-                    # 토큰이 만료되었지만 refresh_token이 있음
-                    elif creds and creds.expired and creds.refresh_token:
-                        system_logger.info("토큰 갱신 중...")
-                        creds.refresh(Request())
-                        
-                        # 갱신된 토큰 저장
-                        with open(self.token_file, 'w') as token:
-                            token.write(creds.to_json())
-                        
-                        system_logger.success("토큰 갱신 완료")
-                        self.auth_failures = 0
-                        self.last_auth_time = datetime.now()
-                        return creds
+                    system_logger.success("토큰 갱신 완료")
+                    self._cache_credentials(creds)
+                    self.auth_failures = 0
+                    self.last_auth_time = datetime.now()
+                    return creds
+                
+                else:
+                    system_logger.warning("토큰이 유효하지 않거나 refresh_token이 없습니다")
                     
-                    else:
-                        system_logger.warning("토큰이 유효하지 않거나 refresh_token이 없습니다")
-                        
-                except Exception as e:
-                    system_logger.warning("기존 토큰 사용 실패", extra_data={"error": str(e)})
-                    # 문제가 있는 토큰 파일 삭제
-                    if os.path.exists(self.token_file):
-                        os.remove(self.token_file)
-                        system_logger.info("문제가 있는 토큰 파일 삭제")
+            except FileNotFoundError:
+                pass  # 저장된 토큰 없음
+            except Exception as e:
+                system_logger.warning("기존 토큰 사용 실패", extra_data={"error": str(e)})
+                # 문제가 있는 토큰 파일 삭제
+                try:
+                    os.remove(self.token_file)
+                    system_logger.info("문제가 있는 토큰 파일 삭제")
+                except FileNotFoundError:
+                    pass
             
             # 새로운 인증이 필요한 경우
             system_logger.info("새로운 Google 인증이 필요합니다")
             
-            if os.path.exists(self.credentials_file):
+            try:
                 flow = InstalledAppFlow.from_client_secrets_file(self.credentials_file, self.scopes)
-            else:
+            except FileNotFoundError:
                 # 자격증명 파일이 없는 경우 환경변수에서 가져오기
                 client_config = {
                     "installed": {
@@ -191,28 +289,21 @@ class GoogleAuthenticator:
                 }
                 flow = InstalledAppFlow.from_client_config(client_config, self.scopes)
             
-            # 로컬 서버 포트 동적 설정
-            import socket
-            def get_free_port():
-                with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                    s.bind(('', 0))
-                    return s.getsockname()[1]
-            
-            port = get_free_port()
-            system_logger.info(f"인증 서버를 포트 {port}에서 시작합니다")
+            # 로컬 서버 포트는 OS가 빈 포트를 골라서 바로 바인딩 (port=0, 미리 찾은 포트를 빼앗길 틈 없음)
+            system_logger.info("인증 서버를 임의의 빈 포트에서 시작합니다")
             
             creds = flow.run_local_server(
-                port=port,
+                port=0,
                 access_type='offline',
                 prompt='consent',
                 include_granted_scopes='true'
             )
             
             # 토큰 저장
-            with open(self.token_file, 'w') as token:
-                token.write(creds.to_json())
+            self._save_token(creds)
             
             system_logger.success("새로운 Google 인증 완료")
+            self._cache_credentials(creds)
             
             self.auth_failures = 0
             self.last_auth_time = datetime.now()
@@ -227,7 +318,7 @@ class GoogleAuthenticator:
     def get_user_info(self, creds):
         """사용자 기본 정보 가져오기"""
         try:
-            service = build('oauth2', 'v2', credentials=creds)
+            service = build_service('oauth2', 'v2', creds)
             user_info = service.userinfo().get().execute()
             
             system_logger.success("사용자 정보 조회 성공", {
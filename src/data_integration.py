@@ -4,79 +4,126 @@
 - 감정 분석을 위한 통합 데이터 구조 생성
 """
 
-import json
-import sys
+import asyncio
 import os
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime
 
-# 현재 디렉토리를 Python 경로에 추가
-sys.path.append('/Users/kjw/emotion-analysis-system/src')
+import orjson
 
 from api.youtube_collector import YouTubeCollector
 from api.calendar_collector import CalendarCollector
 
+# 두 소스 동시 수집 대기 한도 (초과한 소스는 빈 데이터로 처리)
+COLLECTION_TIMEOUT_SECONDS = 60
+
+# 수집 전용 스레드풀 크기 (API 서버 동시 분석 8개 × 소스 2개)
+COLLECTION_MAX_WORKERS = 16
+
+# 프로세스 전체가 함께 쓰는 수집 스레드풀
+# (스레드가 분석마다 새로 생기지 않으므로 스레드별 HTTP 연결이 다음 수집에서도 재사용됨)
+_COLLECTION_EXECUTOR = ThreadPoolExecutor(
+    max_workers=COLLECTION_MAX_WORKERS,
+    thread_name_prefix="collector"
+)
+
 class IntegratedCollector:
     """YouTube + Calendar 통합 데이터 수집"""
     
     def __init__(self, user_id="김재원"):
         self.user_id = user_id
+        # 수집기는 connect()에서 서비스 객체를 다시 만들므로 인스턴스마다 따로 생성 (공유하지 않음)
         self.youtube_collector = YouTubeCollector()
         self.calendar_collector = CalendarCollector()
         
-    def collect_all_data(self):
-        """모든 데이터 수집"""
-        print("🔄 통합 데이터 수집 시작...")
-        
-        # 수집된 데이터를 저장할 구조
-        integrated_data = {
-            'user_id': self.user_id,
-            'collection_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'youtube_data': {},
-            'calendar_data': {},
-            'analysis_ready': False
-        }
-        
-        # YouTube 데이터 수집
+    def collect_youtube_data(self):
+        """YouTube 데이터 수집 (구독 채널 + 좋아요 동영상)"""
         print("\n📺 YouTube 데이터 수집 중...")
-        if self.youtube_collector.connect():
-            # 구독 채널
-            subscriptions = self.youtube_collector.get_subscriptions(10)
-            # 좋아요 동영상  
-            liked_videos = self.youtube_collector.get_liked_videos(10)
-            
-            integrated_data['youtube_data'] = {
-                'subscriptions': subscriptions,
-                'liked_videos': liked_videos,
-                'subscription_count': len(subscriptions),
-                'liked_count': len(liked_videos)
-            }
-            print("✅ YouTube 데이터 수집 완료!")
-        else:
+        if not self.youtube_collector.connect():
             print("❌ YouTube 데이터 수집 실패")
-            
-        # Calendar 데이터 수집
+            return {}
+        
+        # 구독 채널 + 좋아요 동영상 (두 요청을 한 번의 배치 HTTP 요청으로)
+        subscriptions, liked_videos = self.youtube_collector.get_subscriptions_and_liked_videos(10)
+        
+        print("✅ YouTube 데이터 수집 완료!")
+        return {
+            'subscriptions': subscriptions,
+            'liked_videos': liked_videos,
+            'subscription_count': len(subscriptions),
+            'liked_count': len(liked_videos)
+        }
+    
+    def collect_calendar_data(self):
+        """Calendar 데이터 수집 (최근 일정 + 일정 밀도 분석)"""
         print("\n📅 Calendar 데이터 수집 중...")
-        if self.calendar_collector.connect():
-            # 최근 일정
-            events = self.calendar_collector.get_recent_events(14, 20)  # 2주간 20개
-            # 일정 밀도 분석
-            analysis = self.calendar_collector.analyze_schedule_density(events)
-            
-            integrated_data['calendar_data'] = {
-                'events': events,
-                'schedule_analysis': analysis,
-                'event_count': len(events)
-            }
-            print("✅ Calendar 데이터 수집 완료!")
-        else:
+        if not self.calendar_collector.connect():
             print("❌ Calendar 데이터 수집 실패")
-            
-        # 수집 상태 체크
-        youtube_ok = len(integrated_data['youtube_data']) > 0
-        calendar_ok = len(integrated_data['calendar_data']) > 0
-        integrated_data['analysis_ready'] = youtube_ok and calendar_ok
+            return {}
         
-        return integrated_data
+        # 최근 일정
+        events = self.calendar_collector.get_recent_events(14, 20)  # 2주간 20개
+        # 일정 밀도 분석
+        analysis = self.calendar_collector.analyze_schedule_density(events)
+        
+        print("✅ Calendar 데이터 수집 완료!")
+        return {
+            'events': events,
+            'schedule_analysis': analysis,
+            'event_count': len(events)
+        }
+    
+    async def collect_all_data_async(self):
+        """모든 데이터 수집 (YouTube와 Calendar를 동시에 요청, 이벤트 루프용)"""
+        print("🔄 통합 데이터 수집 시작...")
+        
+        collection_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        
+        # 두 API 호출은 서로 독립적이므로 별도 스레드에서 동시에 실행
+        youtube_data, calendar_data = await asyncio.gather(
+            asyncio.to_thread(self.collect_youtube_data),
+            asyncio.to_thread(self.collect_calendar_data)
+        )
+        
+        return self._build_collected_data(collection_date, youtube_data, calendar_data)
+    
+    def collect_all_data(self):
+        """모든 데이터 수집 (YouTube와 Calendar를 공유 수집 스레드풀에서 동시에 요청)
+        
+        호출자는 한 번의 블로킹 호출로 보되, 두 API 왕복 시간은 겹쳐서 기다림.
+        이벤트 루프를 만들지 않으므로 실행 중인 루프 안의 스레드에서도 호출 가능.
+        전체 대기 시간은 COLLECTION_TIMEOUT_SECONDS로 제한 (늦은 소스는 빈 데이터).
+        """
+        print("🔄 통합 데이터 수집 시작...")
+        
+        collection_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        
+        youtube_future = _COLLECTION_EXECUTOR.submit(self.collect_youtube_data)
+        calendar_future = _COLLECTION_EXECUTOR.submit(self.collect_calendar_data)
+        # 시간 초과된 수집은 기다리지 않고 반환 (스레드는 끝나면 풀로 돌아감)
+        wait([youtube_future, calendar_future], timeout=COLLECTION_TIMEOUT_SECONDS)
+        youtube_data = self._result_or_empty(youtube_future, "YouTube")
+        calendar_data = self._result_or_empty(calendar_future, "Calendar")
+        
+        return self._build_collected_data(collection_date, youtube_data, calendar_data)
+    
+    @staticmethod
+    def _result_or_empty(future, source):
+        """제한 시간 안에 끝난 수집 결과 (끝나지 않았으면 빈 데이터)"""
+        if not future.done():
+            print(f"⏰ {source} 데이터 수집 시간 초과 ({COLLECTION_TIMEOUT_SECONDS}초)")
+            return {}
+        return future.result()
+    
+    def _build_collected_data(self, collection_date, youtube_data, calendar_data):
+        """수집 결과를 통합 데이터 구조로 묶기 (수집 상태 포함)"""
+        return {
+            'user_id': self.user_id,
+            'collection_date': collection_date,
+            'youtube_data': youtube_data,
+            'calendar_data': calendar_data,
+            'analysis_ready': len(youtube_data) > 0 and len(calendar_data) > 0
+        }
     
     def save_data(self, data, filename=None):
         """수집된 데이터를 JSON 파일로 저장"""
@@ -85,8 +132,8 @@ class IntegratedCollector:
                 timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
                 filename = f"/Users/kjw/emotion-analysis-system/config/collected_data_{timestamp}.json"
                 
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
                 
             print(f"💾 데이터 저장 완료: {filename}")
             return filename
@@ -96,33 +143,36 @@ class IntegratedCollector:
             return None
     
     def print_summary(self, data):
-        """수집 결과 요약 출력"""
-        print("\n" + "="*50)
-        print("📊 데이터 수집 결과 요약")
-        print("="*50)
-        
-        print(f"👤 사용자: {data['user_id']}")
-        print(f"📅 수집 시간: {data['collection_date']}")
+        """수집 결과 요약 출력 (전체 요약을 모아서 한 번에 출력)"""
+        lines = [
+            "\n" + "="*50,
+            "📊 데이터 수집 결과 요약",
+            "="*50,
+            f"👤 사용자: {data['user_id']}",
+            f"📅 수집 시간: {data['collection_date']}",
+        ]
         
         # YouTube 요약
         yt_data = data.get('youtube_data', {})
-        print(f"\n📺 YouTube 데이터:")
-        print(f"   📌 구독 채널: {yt_data.get('subscription_count', 0)}개")
-        print(f"   👍 좋아요 동영상: {yt_data.get('liked_count', 0)}개")
+        lines.append(f"\n📺 YouTube 데이터:")
+        lines.append(f"   📌 구독 채널: {yt_data.get('subscription_count', 0)}개")
+        lines.append(f"   👍 좋아요 동영상: {yt_data.get('liked_count', 0)}개")
         
         # Calendar 요약  
         cal_data = data.get('calendar_data', {})
         analysis = cal_data.get('schedule_analysis', {})
-        print(f"\n📅 Calendar 데이터:")
-        print(f"   📋 최근 일정: {cal_data.get('event_count', 0)}개")
+        lines.append(f"\n📅 Calendar 데이터:")
+        lines.append(f"   📋 최근 일정: {cal_data.get('event_count', 0)}개")
         if analysis:
-            print(f"   📊 평균 일정/일: {analysis.get('avg_per_day', 0):.1f}개")
-            print(f"   😴 추정 피로도: {analysis.get('fatigue_level', 'N/A')}")
+            lines.append(f"   📊 평균 일정/일: {analysis.get('avg_per_day', 0):.1f}개")
+            lines.append(f"   😴 추정 피로도: {analysis.get('fatigue_level', 'N/A')}")
         
         # 분석 준비 상태
         ready = "✅ 준비완료" if data['analysis_ready'] else "❌ 데이터 부족"
-        print(f"\n🎯 감정분석 준비상태: {ready}")
-        print("="*50)
+        lines.append(f"\n🎯 감정분석 준비상태: {ready}")
+        lines.append("="*50)
+        
+        print("\n".join(lines))
 
 def test_integrated_collection():
     """통합 데이터 수집 테스트"""
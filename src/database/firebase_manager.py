@@ -5,50 +5,114 @@ Firebase Firestore 데이터베이스 관리자
 - 시계열 데이터 추적
 """
 
-import json
+import asyncio
+import functools
+import inspect
 import os
+import threading
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+import orjson
+
+from utils import paths
+from utils.cache import TTLCache
+from utils.logging_system import system_logger
 
 # Firebase 설정 파일이 있을 때만 임포트
 try:
     import firebase_admin
-    from firebase_admin import credentials, firestore
+    from firebase_admin import credentials, firestore, firestore_async
     FIREBASE_AVAILABLE = True
 except ImportError:
     print("⚠️ Firebase 라이브러리가 설치되지 않았거나 설정이 필요합니다.")
     FIREBASE_AVAILABLE = False
 
+# 히스토리 조회 소스 (cache: 캐시 우선, server: 항상 서버 조회 후 캐시 갱신)
+HISTORY_SOURCE_CACHE = "cache"
+HISTORY_SOURCE_SERVER = "server"
+
+# 히스토리 캐시 유지 시간 (초)
+HISTORY_CACHE_TTL_SECONDS = 60
+
+# Firestore WriteBatch 한 번에 담을 수 있는 최대 쓰기 수와 분석 1건당 쓰기 수 (분석 문서 + 사용자 요약)
+MAX_BATCH_WRITES = 500
+WRITES_PER_ANALYSIS = 2
+
+# 프로세스 전역 Firestore 클라이언트 (동기, 비동기): FirebaseManager 인스턴스가 여러 개여도 한 번만 생성
+_FIRESTORE_CLIENTS = None
+_FIRESTORE_LOCK = threading.Lock()
+
+def _get_firestore_clients(service_account_path):
+    """Firestore 클라이언트 쌍을 프로세스당 한 번만 생성 (인증서 파싱, gRPC 채널 공유)"""
+    global _FIRESTORE_CLIENTS
+    with _FIRESTORE_LOCK:
+        if _FIRESTORE_CLIENTS is None:
+            # Firebase 앱 초기화 (이미 초기화된 경우 스킵)
+            if not firebase_admin._apps:
+                cred = credentials.Certificate(service_account_path)
+                firebase_admin.initialize_app(cred)
+            
+            # 클라이언트마다 gRPC 채널(HTTP/2 keep-alive)을 유지하므로 프로세스당 한 번만 만들고 공유
+            _FIRESTORE_CLIENTS = (firestore.client(), firestore_async.client())
+        return _FIRESTORE_CLIENTS
+
+def _require_initialized(default_factory, warn=True):
+    """Firebase 초기화 전에는 메서드 본문을 건너뛰고 기본값 반환 (동기/비동기 메서드 모두 지원)"""
+    def decorator(func):
+        def _not_initialized():
+            if warn:
+                print("⚠️ Firebase가 초기화되지 않았습니다.")
+            return default_factory()
+        
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(self, *args, **kwargs):
+                if not self.initialized:
+                    return _not_initialized()
+                return await func(self, *args, **kwargs)
+            return async_wrapper
+        
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            if not self.initialized:
+                return _not_initialized()
+            return func(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
 class FirebaseManager:
     """Firebase Firestore 데이터베이스 관리 클래스"""
     
     def __init__(self):
         self.db = None
+        self.async_db = None  # 비동기 조회용 AsyncClient (이벤트 루프에서 직접 await)
         self.initialized = False
         
+        # 사용자별 히스토리 캐시: user_id -> (조회 limit, 결과 리스트)
+        self._history_cache = TTLCache(maxsize=256, ttl=HISTORY_CACHE_TTL_SECONDS)
+        
         # Firebase 서비스 계정 키 파일 경로
-        self.service_account_path = "/Users/kjw/emotion-analysis-system/config/firebase_service_account.json"
+        self.service_account_path = str(paths.CONFIG / "firebase_service_account.json")
         
     def initialize_firebase(self):
-        """Firebase 초기화"""
+        """Firebase 초기화 (이미 초기화된 경우 기존 클라이언트와 연결을 그대로 재사용)"""
+        if self.initialized:
+            return True
+        
         if not FIREBASE_AVAILABLE:
             print("❌ Firebase 라이브러리를 먼저 설치해주세요: pip install firebase-admin")
             return False
             
         try:
-            # Firebase 서비스 계정 키 확인
-            if not os.path.exists(self.service_account_path):
+            # Firebase 서비스 계정 키 확인 (다른 인스턴스가 이미 클라이언트를 만들었으면 불필요)
+            if _FIRESTORE_CLIENTS is None and not os.path.exists(self.service_account_path):
                 print(f"⚠️ Firebase 서비스 계정 키 파일이 없습니다: {self.service_account_path}")
                 print("💡 Firebase 콘솔에서 서비스 계정 키를 다운로드하고 설정해주세요.")
                 return False
             
-            # Firebase 앱 초기화 (이미 초기화된 경우 스킵)
-            if not firebase_admin._apps:
-                cred = credentials.Certificate(self.service_account_path)
-                firebase_admin.initialize_app(cred)
-                
-            # Firestore 클라이언트 생성
-            self.db = firestore.client()
+            # Firestore 클라이언트 (동기 + 비동기, 프로세스 전역 공유)
+            self.db, self.async_db = _get_firestore_clients(self.service_account_path)
             self.initialized = True
             
             print("✅ Firebase 초기화 완료!")
@@ -60,114 +124,241 @@ class FirebaseManager:
     
     def save_emotion_analysis(self, user_id: str, analysis_data: Dict) -> Optional[str]:
         """감정 분석 결과를 Firestore에 저장"""
-        if not self.initialized:
-            print("⚠️ Firebase가 초기화되지 않았습니다.")
-            return None
-            
+        saved_ids = self.save_emotion_analysis_batch([(user_id, analysis_data)])
+        return saved_ids[0] if saved_ids else None
+    
+    @_require_initialized(list)
+    def save_emotion_analysis_batch(self, items: List[Tuple[str, Dict]]) -> List[str]:
+        """여러 감정 분석 결과를 WriteBatch로 묶어 저장 (배치당 최대 500개 쓰기)
+        
+        커밋에 성공한 분석 ID만 items 순서대로 반환 (중간 배치 커밋이 실패하면 그 앞 배치까지의 ID)
+        """
+        if not items:
+            return []
+        
+        # 커밋까지 끝난 분석 ID (items 앞에서부터 순서대로)
+        saved_ids = []
         try:
             # 컬렉션 구조: users/{user_id}/analyses/{analysis_id}
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            analysis_id = f"analysis_{timestamp}"
-            
-            # 저장할 데이터 구조 정리
-            save_data = {
-                'user_id': user_id,
-                'analysis_id': analysis_id,
-                'timestamp': firestore.SERVER_TIMESTAMP,
-                'analysis_date': analysis_data.get('analysis_date'),
-                
-                # YouTube 분석 결과
-                'youtube_analysis': analysis_data.get('youtube_analysis', {}),
+            
+            users_ref = self.db.collection('users')
+            batch = self.db.batch()
+            batch_ids = []
+            pending_writes = 0
+            
+            for index, (user_id, analysis_data) in enumerate(items):
+                # 같은 초에 여러 건을 저장해도 ID가 겹치지 않도록 순번 추가
+                analysis_id = f"analysis_{timestamp}" if len(items) == 1 else f"analysis_{timestamp}_{index:03d}"
+                save_data = self._build_save_data(user_id, analysis_id, analysis_data)
                 
-                # Calendar 분석 결과  
-                'calendar_analysis': analysis_data.get('calendar_analysis', {}),
+                # 분석 문서와 사용자 요약 문서를 같은 배치로 저장
+                user_ref = users_ref.document(user_id)
+                doc_ref = user_ref.collection('analyses').document(analysis_id)
                 
-                # 종합 감정 분석
-                'overall_emotion': analysis_data.get('overall_emotion', {}),
+                if pending_writes + WRITES_PER_ANALYSIS > MAX_BATCH_WRITES:
+                    batch.commit()
+                    saved_ids.extend(batch_ids)
+                    batch = self.db.batch()
+                    batch_ids = []
+                    pending_writes = 0
                 
-                # 메타 데이터
-                'data_source': 'emotion_analysis_system',
-                'version': '1.0'
-            }
+                batch.set(doc_ref, save_data)
+                batch.set(user_ref, {
+                    'user_id': user_id,
+                    'latest_analysis_id': analysis_id,
+                    'last_analysis_date': save_data['analysis_date'],
+                    'updated_at': firestore.SERVER_TIMESTAMP
+                }, merge=True)
+                pending_writes += WRITES_PER_ANALYSIS
+                batch_ids.append(analysis_id)
             
-            # Firestore에 데이터 저장
-            doc_ref = self.db.collection('users').document(user_id).collection('analyses').document(analysis_id)
-            doc_ref.set(save_data)
+            batch.commit()
+            saved_ids.extend(batch_ids)
             
             print(f"✅ 감정 분석 결과 저장 완료!")
-            print(f"   📊 분석 ID: {analysis_id}")
-            print(f"   👤 사용자: {user_id}")
+            print(f"   📊 분석 ID: {', '.join(saved_ids)}")
+            
+        except Exception as e:
+            print(f"❌ 데이터 저장 실패 ({len(saved_ids)}/{len(items)}건 저장됨): {e}")
+        
+        # 새 분석이 추가되었으므로 저장된 분석의 사용자 히스토리 캐시 무효화
+        for user_id in {user_id for user_id, _ in items[:len(saved_ids)]}:
+            self._history_cache.pop(user_id)
+        
+        return saved_ids
+    
+    @staticmethod
+    def _build_save_data(user_id: str, analysis_id: str, analysis_data: Dict) -> Dict:
+        """Firestore에 저장할 분석 문서 구성"""
+        return {
+            'user_id': user_id,
+            'analysis_id': analysis_id,
+            'timestamp': firestore.SERVER_TIMESTAMP,
+            'analysis_date': analysis_data.get('analysis_date'),
+            
+            # YouTube 분석 결과
+            'youtube_analysis': analysis_data.get('youtube_analysis', {}),
+            
+            # Calendar 분석 결과  
+            'calendar_analysis': analysis_data.get('calendar_analysis', {}),
             
-            return analysis_id
+            # 종합 감정 분석
+            'overall_emotion': analysis_data.get('overall_emotion', {}),
+            
+            # 메타 데이터
+            'data_source': 'emotion_analysis_system',
+            'version': '1.0'
+        }
+    
+    @_require_initialized(list)
+    def get_user_history(self, user_id: str, limit: int = 10,
+                         source: str = HISTORY_SOURCE_SERVER) -> List[Dict]:
+        """사용자의 감정 분석 히스토리 가져오기 (source="cache"면 캐시 우선)"""
+        if source == HISTORY_SOURCE_CACHE:
+            cached = self._get_cached_history(user_id, limit)
+            if cached is not None:
+                return cached
+            
+        try:
+            # 최근 분석 결과들을 시간순으로 가져오기 (전체 목록이 필요하므로 get()으로 한 번에)
+            query = self._history_query(self.db, user_id, limit)
+            results = [doc.to_dict() for doc in query.get()]
+            
+            self._history_cache.set(user_id, (limit, results))
+                
+            system_logger.debug("✅ 사용자 히스토리 조회 완료", {"user_id": user_id, "count": len(results)})
+            return results
             
         except Exception as e:
-            print(f"❌ 데이터 저장 실패: {e}")
-            return None
+            print(f"❌ 히스토리 조회 실패: {e}")
+            return []
     
-    def get_user_history(self, user_id: str, limit: int = 10) -> List[Dict]:
-        """사용자의 감정 분석 히스토리 가져오기"""
+    def iter_user_history(self, user_id: str, limit: int = 10) -> Iterator[Dict]:
+        """사용자 히스토리를 문서 단위로 순차 반환 (필요한 만큼만 읽고 멈출 수 있음)"""
         if not self.initialized:
             print("⚠️ Firebase가 초기화되지 않았습니다.")
-            return []
-            
+            return
+        
+        query = self._history_query(self.db, user_id, limit)
+        for doc in query.stream():
+            yield doc.to_dict()
+    
+    @_require_initialized(list)
+    async def get_user_history_async(self, user_id: str, limit: int = 10,
+                                     source: str = HISTORY_SOURCE_SERVER) -> List[Dict]:
+        """get_user_history의 비동기 버전 (AsyncClient로 조회, 스레드 전환 없음)"""
+        if source == HISTORY_SOURCE_CACHE:
+            cached = self._get_cached_history(user_id, limit)
+            if cached is not None:
+                return cached
+        
         try:
-            # 최근 분석 결과들을 시간순으로 가져오기
-            analyses_ref = self.db.collection('users').document(user_id).collection('analyses')
-            query = analyses_ref.order_by('timestamp', direction=firestore.Query.DESCENDING).limit(limit)
-            
-            results = []
-            for doc in query.stream():
-                data = doc.to_dict()
-                results.append(data)
-                
-            print(f"✅ 사용자 히스토리 {len(results)}개 조회 완료")
+            query = self._history_query(self.async_db, user_id, limit)
+            results = [doc.to_dict() for doc in await query.get()]
+            
+            self._history_cache.set(user_id, (limit, results))
+            
+            system_logger.debug("✅ 사용자 히스토리 조회 완료", {"user_id": user_id, "count": len(results)})
             return results
             
         except Exception as e:
             print(f"❌ 히스토리 조회 실패: {e}")
             return []
     
+    async def iter_user_history_async(self, user_id: str, limit: int = 10) -> AsyncIterator[Dict]:
+        """사용자 히스토리를 문서 단위로 순차 반환 (전체 목록을 메모리에 모으지 않음)"""
+        if not self.initialized or self.async_db is None:
+            print("⚠️ Firebase가 초기화되지 않았습니다.")
+            return
+        
+        query = self._history_query(self.async_db, user_id, limit)
+        async for doc in query.stream():
+            yield doc.to_dict()
+    
+    @_require_initialized(dict, warn=False)
     def get_emotion_trends(self, user_id: str, days: int = 7) -> Dict:
         """감정 변화 트렌드 분석"""
-        if not self.initialized:
-            return {}
-            
         try:
             # 최근 N일간 데이터 가져오기
             history = self.get_user_history(user_id, limit=days*3)  # 여유분 포함
+            return self._build_trends(history)
             
-            if not history:
-                return {}
-                
-            trends = {
-                'emotion_scores': [],
-                'stress_levels': [],
-                'fatigue_indices': [],
-                'dates': []
-            }
-            
-            for analysis in history:
-                overall = analysis.get('overall_emotion', {})
-                calendar = analysis.get('calendar_analysis', {})
-                
-                trends['emotion_scores'].append(overall.get('emotion_score', 0))
-                trends['stress_levels'].append(calendar.get('stress_level', 'unknown'))
-                trends['fatigue_indices'].append(calendar.get('fatigue_index', 0))
-                trends['dates'].append(analysis.get('analysis_date', ''))
-            
-            print(f"📈 감정 트렌드 분석 완료: {len(trends['dates'])}개 데이터")
-            return trends
+        except Exception as e:
+            print(f"❌ 트렌드 분석 실패: {e}")
+            return {}
+    
+    @_require_initialized(dict, warn=False)
+    async def get_emotion_trends_async(self, user_id: str, days: int = 7) -> Dict:
+        """get_emotion_trends의 비동기 버전"""
+        try:
+            history = await self.get_user_history_async(user_id, limit=days*3)  # 여유분 포함
+            return self._build_trends(history)
             
         except Exception as e:
             print(f"❌ 트렌드 분석 실패: {e}")
             return {}
+    
+    async def get_emotion_trends_many(self, user_ids: List[str], days: int = 7) -> Dict[str, Dict]:
+        """여러 사용자의 감정 트렌드를 동시에 조회 (user_id -> 트렌드, 대기 시간은 가장 느린 사용자 기준)"""
+        trends = await asyncio.gather(*(self.get_emotion_trends_async(user_id, days) for user_id in user_ids))
+        return dict(zip(user_ids, trends))
+    
+    def _get_cached_history(self, user_id: str, limit: int) -> Optional[List[Dict]]:
+        """캐시된 히스토리로 요청을 처리할 수 있으면 반환 (없으면 None)"""
+        cached = self._history_cache.get(user_id)
+        if cached is None:
+            return None
+        
+        cached_limit, cached_results = cached
+        # 더 큰 limit으로 조회했거나 전체 히스토리를 이미 가진 경우만 재사용
+        if cached_limit >= limit or len(cached_results) < cached_limit:
+            return cached_results[:limit]
+        return None
+    
+    @staticmethod
+    def _history_query(client, user_id: str, limit: int):
+        """최근 분석 결과 쿼리 생성 (동기/비동기 클라이언트 공용)"""
+        analyses_ref = client.collection('users').document(user_id).collection('analyses')
+        return analyses_ref.order_by('timestamp', direction=firestore.Query.DESCENDING).limit(limit)
+    
+    @staticmethod
+    def _build_trends(history: List[Dict]) -> Dict:
+        """히스토리에서 트렌드 시계열 추출"""
+        if not history:
+            return {}
+            
+        trends = {
+            'emotion_scores': [],
+            'stress_levels': [],
+            'fatigue_indices': [],
+            'dates': []
+        }
+        
+        for analysis in history:
+            overall = analysis.get('overall_emotion', {})
+            calendar = analysis.get('calendar_analysis', {})
+            
+            trends['emotion_scores'].append(overall.get('emotion_score', 0))
+            trends['stress_levels'].append(calendar.get('stress_level', 'unknown'))
+            trends['fatigue_indices'].append(calendar.get('fatigue_index', 0))
+            trends['dates'].append(analysis.get('analysis_date', ''))
+        
+        system_logger.debug("📈 감정 트렌드 분석 완료", {"count": len(trends['dates'])})
+        return trends
 
 class MockFirebaseManager:
     """Firebase가 설정되지 않았을 때 사용할 Mock 클래스"""
     
     def __init__(self):
         self.initialized = False
-        self.local_storage = "/Users/kjw/emotion-analysis-system/config/mock_firebase_data.json"
+        # 한 줄에 분석 1건씩 덧붙이는 NDJSON 로그 (저장할 때 기존 내용을 다시 읽거나 쓰지 않음)
+        self.local_storage = str(paths.CONFIG / "mock_firebase_data.ndjson")
+        # 이전 형식의 JSON 문서 (user_id -> 분석 목록, 로그가 없을 때 한 번 옮겨 옴)
+        self.legacy_storage = str(paths.CONFIG / "mock_firebase_data.json")
+        self._storage_ready = False
+        # 사용자별 히스토리 인덱스: user_id -> 분석 목록 (첫 조회 때 로그를 한 번 읽어서 생성)
+        self._history_index = None
         
     def initialize_firebase(self):
         """Mock 초기화"""
@@ -177,53 +368,109 @@ class MockFirebaseManager:
     
     def save_emotion_analysis(self, user_id: str, analysis_data: Dict) -> Optional[str]:
         """로컬 파일에 저장"""
+        saved_ids = self.save_emotion_analysis_batch([(user_id, analysis_data)])
+        return saved_ids[0] if saved_ids else None
+    
+    def _prepare_storage(self):
+        """설정 디렉토리를 만들고, 로그가 아직 없으면 이전 JSON 파일의 분석을 로그로 옮김 (인스턴스당 한 번)"""
+        if self._storage_ready:
+            return
+        self._storage_ready = True
+        paths.ensure_directories()
+        
+        if os.path.exists(self.local_storage) or not os.path.exists(self.legacy_storage):
+            return
+        
         try:
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            analysis_id = f"analysis_{timestamp}"
-            
-            # 기존 데이터 로드
-            if os.path.exists(self.local_storage):
-                with open(self.local_storage, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-            else:
-                data = {}
-            
-            # 새 데이터 추가
-            if user_id not in data:
-                data[user_id] = []
-                
-            save_entry = {
-                'analysis_id': analysis_id,
-                'timestamp': datetime.now().isoformat(),
-                **analysis_data
-            }
+            with open(self.legacy_storage, 'rb') as f:
+                legacy_data = orjson.loads(f.read())
+            
+            lines = [
+                orjson.dumps({'user_id': user_id, 'analysis': analysis},
+                             option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+                for user_id, analyses in legacy_data.items()
+                for analysis in analyses
+            ]
+            
+            # 다 쓴 뒤에 이름을 바꿔 중간에 실패해도 반쯤 옮긴 로그가 남지 않음
+            temp_path = f"{self.local_storage}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(b"".join(lines))
+            os.replace(temp_path, self.local_storage)
+            
+            print(f"📦 이전 Mock 데이터 {len(lines)}건을 옮겼습니다: {self.legacy_storage} → {self.local_storage}")
             
-            data[user_id].append(save_entry)
+        except Exception as e:
+            print(f"⚠️ 이전 Mock 데이터 파일을 읽지 못해 무시합니다 ({self.legacy_storage}): {e}")
+    
+    def save_emotion_analysis_batch(self, items: List[Tuple[str, Dict]]) -> List[str]:
+        """여러 분석 결과를 로컬 로그 파일 끝에 한 번에 덧붙여 저장"""
+        if not items:
+            return []
+        
+        try:
+            self._prepare_storage()
+            
+            # 배치 전체가 같은 저장 시각 하나를 공유 (시계는 한 번만 읽음)
+            now = datetime.now()
+            timestamp = now.strftime('%Y%m%d_%H%M%S')
+            saved_at = now.isoformat()
+            
+            # 새 데이터 줄 생성 (같은 초에 여러 건이면 순번으로 ID 구분)
+            saved_ids = []
+            entries = []
+            lines = []
+            for index, (user_id, analysis_data) in enumerate(items):
+                analysis_id = f"analysis_{timestamp}" if len(items) == 1 else f"analysis_{timestamp}_{index:03d}"
+                save_entry = {
+                    'analysis_id': analysis_id,
+                    'timestamp': saved_at,
+                    **analysis_data
+                }
+                entries.append((user_id, save_entry))
+                lines.append(orjson.dumps({'user_id': user_id, 'analysis': save_entry},
+                                          option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE))
+                saved_ids.append(analysis_id)
             
-            # 파일에 저장
-            with open(self.local_storage, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            # 파일 끝에 추가 (배치 전체를 한 번에 기록)
+            with open(self.local_storage, 'ab') as f:
+                f.write(b"".join(lines))
+            
+            # 이미 읽어 둔 인덱스가 있으면 함께 갱신
+            if self._history_index is not None:
+                for user_id, save_entry in entries:
+                    self._history_index.setdefault(user_id, []).append(save_entry)
                 
             print(f"✅ Mock Firebase에 저장 완료! (실제로는 로컬 파일)")
             print(f"   📁 저장 위치: {self.local_storage}")
-            print(f"   📊 분석 ID: {analysis_id}")
+            print(f"   📊 분석 ID: {', '.join(saved_ids)}")
             
-            return analysis_id
+            return saved_ids
             
         except Exception as e:
             print(f"❌ Mock 저장 실패: {e}")
-            return None
+            return []
+    
+    def _load_history_index(self) -> Dict[str, List[Dict]]:
+        """로그 파일을 한 줄씩 읽어 사용자별 히스토리 인덱스 생성 (처음 한 번만)"""
+        if self._history_index is None:
+            self._prepare_storage()
+            index = {}
+            try:
+                with open(self.local_storage, 'rb') as f:
+                    for line in f:
+                        if line.strip():
+                            record = orjson.loads(line)
+                            index.setdefault(record['user_id'], []).append(record['analysis'])
+            except FileNotFoundError:
+                pass  # 아직 저장된 데이터 없음
+            self._history_index = index
+        return self._history_index
     
     def get_user_history(self, user_id: str, limit: int = 10) -> List[Dict]:
         """로컬 파일에서 히스토리 조회"""
         try:
-            if not os.path.exists(self.local_storage):
-                return []
-                
-            with open(self.local_storage, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                
-            user_data = data.get(user_id, [])
+            user_data = self._load_history_index().get(user_id, [])
             return user_data[-limit:] if user_data else []
             
         except Exception as e:
@@ -244,19 +491,22 @@ def test_firebase_integration():
     
     # 최근 감정 분석 결과 로드
     try:
-        analysis_files = [f for f in os.listdir('/Users/kjw/emotion-analysis-system/config/') 
-                         if f.startswith('emotion_analysis_') and f.endswith('.json')]
+        # 가장 최신 파일 사용 (파일명에 타임스탬프가 있으므로 이름이 가장 큰 파일, 정렬 없이 한 번 순회)
+        with os.scandir('/Users/kjw/emotion-analysis-system/config/') as entries:
+            latest_file = max(
+                (entry.name for entry in entries
+                 if entry.name.startswith('emotion_analysis_') and entry.name.endswith('.json') and entry.is_file()),
+                default=None
+            )
         
-        if not analysis_files:
+        if latest_file is None:
             print("❌ 저장된 감정 분석 결과가 없습니다.")
             return False
             
-        # 가장 최신 파일 사용
-        latest_file = sorted(analysis_files)[-1]
         file_path = f"/Users/kjw/emotion-analysis-system/config/{latest_file}"
         
-        with open(file_path, 'r', encoding='utf-8') as f:
-            analysis_data = json.load(f)
+        with open(file_path, 'rb') as f:
+            analysis_data = orjson.loads(f.read())
             
         print(f"📁 분석 결과 파일 로드: {latest_file}")
         
@@ -0,0 +1,67 @@
+"""
+인메모리 캐시 유틸리티
+- 만료 시간(TTL)이 있는 LRU 캐시
+- 스레드풀에서 동시에 접근해도 안전
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """만료 시간이 있는 스레드 안전 LRU 캐시"""
+
+    def __init__(self, maxsize: int = 128, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """캐시 값 조회 (만료된 항목은 제거 후 기본값 반환)"""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """캐시 값 저장 (최대 크기 초과 시 가장 오래된 항목 제거)"""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """캐시 항목 제거"""
+        with self._lock:
+            item = self._data.pop(key, None)
+            return default if item is None else item[1]
+
+    def pop_where(self, predicate) -> int:
+        """조건에 맞는 키의 항목을 모두 제거하고 제거한 개수 반환"""
+        with self._lock:
+            keys = [key for key in self._data if predicate(key)]
+            for key in keys:
+                del self._data[key]
+            return len(keys)
+
+    def clear(self):
+        """캐시 전체 비우기"""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
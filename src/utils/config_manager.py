@@ -7,12 +7,41 @@
 
 import os
 import json
-from typing import Dict, Any, Optional
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional, Tuple
 from dataclasses import dataclass
 from pathlib import Path
+import orjson
 import yaml
 
-@dataclass
+from utils import paths
+
+# libyaml C 파서가 있으면 사용 (순수 Python 파서보다 훨씬 빠름)
+try:
+    from yaml import CSafeLoader as YamlSafeLoader
+except ImportError:
+    from yaml import SafeLoader as YamlSafeLoader
+
+# 설정에 쓰는 환경 변수와 기본값 (ConfigManager 생성 시 한 번만 읽음)
+ENV_DEFAULTS = {
+    "YOUTUBE_API_KEY": "",
+    "GOOGLE_CLIENT_ID": "",
+    "GOOGLE_CLIENT_SECRET": "",
+    "GOOGLE_REDIRECT_URI": "http://localhost:8080/auth/callback",
+}
+
+# 반드시 값이 있어야 하는 환경 변수
+REQUIRED_ENV_VARS = ("YOUTUBE_API_KEY", "GOOGLE_CLIENT_ID", "GOOGLE_CLIENT_SECRET")
+
+def _freeze(value):
+    """파싱된 설정을 읽기 전용으로 변환 (캐시를 공유하는 호출자가 수정하지 못하도록)"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+@dataclass(frozen=True)
 class APIConfig:
     """API 설정"""
     youtube_api_key: str
@@ -21,7 +50,7 @@ class APIConfig:
     redirect_uri: str
     firebase_config_path: str
 
-@dataclass
+@dataclass(frozen=True)
 class AnalysisConfig:
     """분석 설정"""
     time_decay_lambda: float = 0.1
@@ -30,7 +59,7 @@ class AnalysisConfig:
     max_video_count: int = 50
     max_calendar_days: int = 30
 
-@dataclass
+@dataclass(frozen=True)
 class SystemConfig:
     """전체 시스템 설정"""
     debug_mode: bool = False
@@ -43,13 +72,29 @@ class ConfigManager:
     """설정 관리자"""
     
     def __init__(self):
-        self.base_path = Path("/Users/kjw/emotion-analysis-system")
-        self.config_path = self.base_path / "config"
+        self.base_path = paths.BASE
+        self.config_path = paths.CONFIG
+        # 환경별 설정 캐시: environment -> (파일 mtime_ns, 파싱된 설정, 설정 객체 캐시)
+        self._config_cache: Dict[str, Tuple[int, Mapping[str, Any], Dict[str, Any]]] = {}
+        self.refresh_env()
         self.ensure_config_directory()
     
+    def refresh_env(self):
+        """환경 변수를 다시 읽어 스냅샷과 API 설정 갱신 (테스트 등에서 환경 변수를 바꾼 뒤 호출)"""
+        self._env: Mapping[str, str] = MappingProxyType(
+            {name: os.environ.get(name, default) for name, default in ENV_DEFAULTS.items()}
+        )
+        self._api_config = APIConfig(
+            youtube_api_key=self._env["YOUTUBE_API_KEY"],
+            google_client_id=self._env["GOOGLE_CLIENT_ID"],
+            google_client_secret=self._env["GOOGLE_CLIENT_SECRET"],
+            redirect_uri=self._env["GOOGLE_REDIRECT_URI"],
+            firebase_config_path=str(self.config_path / "firebase_config.json")
+        )
+    
     def ensure_config_directory(self):
         """설정 디렉토리 확인/생성"""
-        self.config_path.mkdir(exist_ok=True)
+        paths.ensure_directories()
         
         # 환경별 설정 파일 생성
         env_configs = {
@@ -93,66 +138,107 @@ class ConfigManager:
                 with open(config_file, 'w', encoding='utf-8') as f:
                     yaml.dump(config_data, f, allow_unicode=True, default_flow_style=False)
     
-    def load_config(self, environment: str = "development") -> Dict[str, Any]:
-        """환경별 설정 로드"""
+    def _load_cached(self, environment: str) -> Tuple[Mapping[str, Any], Dict[str, Any]]:
+        """(파싱된 설정, 설정 객체 캐시) 반환 (설정 파일 mtime이 바뀌었을 때만 다시 파싱)"""
         config_file = self.config_path / f"{environment}.yaml"
         
-        if not config_file.exists():
+        try:
+            mtime_ns = config_file.stat().st_mtime_ns
+        except FileNotFoundError:
             raise FileNotFoundError(f"Config file not found: {config_file}")
         
+        cached = self._config_cache.get(environment)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1], cached[2]
+        
+        config = _freeze(self._read_config_file(config_file, mtime_ns))
+        
+        self._config_cache[environment] = (mtime_ns, config, {})
+        return config, self._config_cache[environment][2]
+    
+    def _read_config_file(self, config_file: Path, mtime_ns: int) -> Any:
+        """설정 파일 파싱 (YAML을 JSON으로 변환해 둔 캐시 파일이 최신이면 YAML 파싱 생략)"""
+        cache_file = config_file.with_name(f"{config_file.name}.cache")
+        
+        # 새 프로세스에서도 YAML 파서 대신 JSON 파서로 바로 로드
+        try:
+            with open(cache_file, 'rb') as f:
+                cached = orjson.loads(f.read())
+            if cached.get("source_mtime_ns") == mtime_ns:
+                return cached["config"]
+        except (FileNotFoundError, orjson.JSONDecodeError, AttributeError, KeyError):
+            pass
+        
         with open(config_file, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
+            config = yaml.load(f, Loader=YamlSafeLoader)
+        
+        # 캐시 파일을 원자적으로 교체 (다른 프로세스가 쓰다 만 파일을 읽지 않도록)
+        try:
+            # 날짜 값은 JSON 왕복 시 문자열로 바뀌므로 직렬화 실패로 처리해 캐시하지 않음
+            payload = orjson.dumps({"source_mtime_ns": mtime_ns, "config": config},
+                                   option=orjson.OPT_PASSTHROUGH_DATETIME)
+            tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+            with open(tmp_file, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_file, cache_file)
+        except (TypeError, OSError):
+            pass  # JSON으로 표현할 수 없는 값(날짜, 문자열이 아닌 키 등)이 있거나 쓰기 실패 시 캐시 생략
+        
+        return config
+    
+    def load_config(self, environment: str = "development") -> Mapping[str, Any]:
+        """환경별 설정 로드 (읽기 전용, 파일이 바뀌지 않았으면 캐시된 설정 반환)"""
+        return self._load_cached(environment)[0]
     
     def get_api_config(self, environment: str = "development") -> APIConfig:
-        """API 설정 가져오기"""
-        # 환경 변수에서 민감한 정보 로드
-        return APIConfig(
-            youtube_api_key=os.getenv("YOUTUBE_API_KEY", ""),
-            google_client_id=os.getenv("GOOGLE_CLIENT_ID", ""),
-            google_client_secret=os.getenv("GOOGLE_CLIENT_SECRET", ""),
-            redirect_uri=os.getenv("GOOGLE_REDIRECT_URI", "http://localhost:8080/auth/callback"),
-            firebase_config_path=str(self.config_path / "firebase_config.json")
-        )
+        """API 설정 가져오기 (생성 시 읽어 둔 환경 변수 스냅샷 기반, 불변 객체 공유)"""
+        return self._api_config
     
     def get_analysis_config(self, environment: str = "development") -> AnalysisConfig:
-        """분석 설정 가져오기"""
-        config = self.load_config(environment)
+        """분석 설정 가져오기 (설정 파일이 바뀔 때까지 불변 객체 공유)"""
+        config, config_objects = self._load_cached(environment)
+        if "analysis" in config_objects:
+            return config_objects["analysis"]
+        
         analysis_config = config.get("analysis", {})
         
-        return AnalysisConfig(
+        config_objects["analysis"] = AnalysisConfig(
             time_decay_lambda=analysis_config.get("time_decay_lambda", 0.1),
             forgetting_factor=analysis_config.get("forgetting_factor", 0.05),
             emotion_threshold=analysis_config.get("emotion_threshold", 0.3),
             max_video_count=analysis_config.get("max_video_count", 50),
             max_calendar_days=analysis_config.get("max_calendar_days", 30)
         )
+        return config_objects["analysis"]
     
     def get_system_config(self, environment: str = "development") -> SystemConfig:
-        """시스템 설정 가져오기"""
-        config = self.load_config(environment)
+        """시스템 설정 가져오기 (설정 파일이 바뀔 때까지 불변 객체 공유)"""
+        config, config_objects = self._load_cached(environment)
+        if "system" in config_objects:
+            return config_objects["system"]
+        
         system_config = config.get("system", {})
         
-        return SystemConfig(
+        config_objects["system"] = SystemConfig(
             debug_mode=system_config.get("debug_mode", False),
             log_level=system_config.get("log_level", "INFO"),
             max_retries=system_config.get("max_retries", 3),
             timeout_seconds=system_config.get("timeout_seconds", 30),
             data_backup_enabled=system_config.get("data_backup_enabled", True)
         )
+        return config_objects["system"]
+    
+    def clear_cache(self):
+        """캐시된 환경별 설정 비우기 (파일 수정은 mtime으로 자동 감지, 강제로 다시 읽을 때 사용)"""
+        self._config_cache.clear()
     
     def validate_environment(self) -> Dict[str, bool]:
         """환경 설정 검증"""
         validation_results = {}
         
         # 필수 환경 변수 확인
-        required_env_vars = [
-            "YOUTUBE_API_KEY",
-            "GOOGLE_CLIENT_ID",
-            "GOOGLE_CLIENT_SECRET"
-        ]
-        
-        for var in required_env_vars:
-            validation_results[f"env_{var}"] = bool(os.getenv(var))
+        for var in REQUIRED_ENV_VARS:
+            validation_results[f"env_{var}"] = bool(self._env[var])
         
         # 설정 파일 확인
         config_files = ["development.yaml", "production.yaml"]
@@ -165,8 +251,7 @@ class ConfigManager:
         validation_results["firebase_config"] = firebase_config.exists()
         
         # 로그 디렉토리 확인
-        log_dir = self.base_path / "logs"
-        validation_results["log_directory"] = log_dir.exists()
+        validation_results["log_directory"] = paths.LOGS.exists()
         
         return validation_results
     
@@ -188,6 +273,8 @@ FIREBASE_PROJECT_ID=your_firebase_project_id
 ENVIRONMENT=development
 DEBUG_MODE=true
 LOG_LEVEL=INFO
+# 설정/로그 기준 경로 (기본 ~/emotion-analysis-system)
+EMOTION_SYSTEM_HOME=
 
 # API 설정
 API_SERVER_PORT=8080
@@ -5,103 +5,262 @@
 - 성능 모니터링
 """
 
+import contextlib
 import logging
+import logging.handlers
 import os
+import random
 import sys
+import threading
+import time
 from datetime import datetime
 from typing import Any, Dict, Optional
 import traceback
 import functools
+from contextvars import ContextVar
+
+import orjson
+
+from utils.paths import LOGS, ensure_directories
+
+# 분석 실행 한 번 동안 메모리 버퍼에 모아 둘 최대 로그 레코드 수
+LOG_BUFFER_CAPACITY = 1024
+
+# 실행 로깅/성능 측정 데코레이터 사용 여부 (DEBUG_MODE=false면 데코레이터가 원래 함수를 그대로 반환)
+INSTRUMENTATION_ENABLED = os.getenv("DEBUG_MODE", "true").lower() == "true"
+
+# 재시도 대기 시간 지터 비율 (±20%, 동시에 실패한 호출들이 같은 순간에 재시도하지 않도록)
+RETRY_JITTER = 0.2
+
+# 시스템 루트 로거 이름 (다른 이름의 로거는 이 로거의 하위 로거로 만들어 핸들러를 공유)
+ROOT_LOGGER_NAME = "EmotionSystem"
+
+class TextFormatter(logging.Formatter):
+    """콘솔용 텍스트 포매터 (레코드의 extra_data를 메시지 뒤에 붙임)"""
+    
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        text = super().formatMessage(record)
+        extra_data = getattr(record, 'extra_data', None)
+        if extra_data:
+            text += f" | Data: {extra_data}"
+        return text
+
+class JSONFormatter(logging.Formatter):
+    """파일용 JSON Lines 포매터 (레코드 하나를 JSON 객체 한 줄로 기록)"""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": record.created,
+            "name": record.name,
+            "lvl": record.levelname,
+            "func": record.funcName,
+            "line": record.lineno,
+            "msg": record.getMessage(),
+            "extra": getattr(record, 'extra_data', None)
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return orjson.dumps(entry, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+
+# 핸들러가 함께 쓰는 포매터 (파일은 JSON Lines, 콘솔은 사람이 읽는 텍스트)
+_JSON_FORMATTER = JSONFormatter()
+_TEXT_FORMATTER = TextFormatter(
+    '%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+
+class _StdoutHandler(logging.StreamHandler):
+    """기록할 때마다 현재 sys.stdout에 쓰는 콘솔 핸들러 (설정 후 stdout이 바뀌거나 닫혀도 안전)"""
+    
+    def __init__(self):
+        logging.Handler.__init__(self)
+    
+    @property
+    def stream(self):
+        return sys.stdout
+
+class _OutputHandler(logging.Handler):
+    """레코드를 파일/콘솔 핸들러로 바로 전달"""
+    
+    def __init__(self, targets):
+        super().__init__()
+        self.targets = targets
+    
+    def handle(self, record: logging.LogRecord) -> bool:
+        for target in self.targets:
+            target.handle(record)
+        return True
+    
+    def flush(self):
+        for target in self.targets:
+            target.flush()
+
+class _RunBufferRouter(logging.Handler):
+    """현재 컨텍스트에 실행 버퍼가 있으면 버퍼에 모으고, 없으면 바로 출력 핸들러로 전달"""
+    
+    def __init__(self, output: _OutputHandler):
+        super().__init__()
+        self.output = output
+    
+    def handle(self, record: logging.LogRecord) -> bool:
+        buffer = _RUN_BUFFER.get()
+        return (buffer or self.output).handle(record)
+    
+    def flush(self):
+        buffer = _RUN_BUFFER.get()
+        if buffer is not None:
+            buffer.flush()
+        self.output.flush()
+
+# 현재 실행의 로그 버퍼 (buffered() 블록과 그 컨텍스트를 복사해 실행한 스레드에서만 설정)
+_RUN_BUFFER: ContextVar[Optional[logging.handlers.MemoryHandler]] = ContextVar("run_log_buffer", default=None)
+
+# 루트 로거 핸들러 설정 여부 (프로세스당 한 번만 파일을 열고 핸들러를 붙임)
+_CONFIGURED = False
+_CONFIGURE_LOCK = threading.Lock()
+
+# 파일/콘솔 출력 핸들러 (실행 버퍼가 비워질 때의 대상)
+_OUTPUT_HANDLER: Optional[_OutputHandler] = None
+
+def _configure_once() -> logging.Logger:
+    """루트 로거에 파일/콘솔 핸들러를 한 번만 설정하고 반환"""
+    global _CONFIGURED, _OUTPUT_HANDLER
+    root_logger = logging.getLogger(ROOT_LOGGER_NAME)
+    if _CONFIGURED:
+        return root_logger
+    
+    with _CONFIGURE_LOCK:
+        if _CONFIGURED:
+            return root_logger
+        
+        # 로그 레벨 설정 (LOG_LEVEL 환경 변수, 기본 INFO, 하위 로거는 이 레벨을 따름)
+        root_logger.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+        # 파이썬 루트 로거로 전파하지 않음 (같은 줄이 두 번 찍히는 것 방지)
+        root_logger.propagate = False
+        
+        # 핸들러 추가 (중복 방지)
+        if not root_logger.handlers:
+            # 로그 디렉토리 생성
+            ensure_directories()
+            
+            # 파일 핸들러 (일별 로그, JSON Lines)
+            today = datetime.now().strftime("%Y%m%d")
+            log_file = LOGS / f"emotion_system_{today}.jsonl"
+            file_handler = logging.FileHandler(log_file, encoding='utf-8')
+            file_handler.setLevel(logging.DEBUG)
+            
+            # 콘솔 핸들러 (stdout은 기록 시점에 조회)
+            console_handler = _StdoutHandler()
+            console_handler.setLevel(logging.DEBUG)
+            
+            file_handler.setFormatter(_JSON_FORMATTER)
+            console_handler.setFormatter(_TEXT_FORMATTER)
+            
+            # 평소에는 바로 기록하고, buffered() 블록 안의 로그만 실행 버퍼에 모아 둠
+            _OUTPUT_HANDLER = _OutputHandler((file_handler, console_handler))
+            root_logger.addHandler(_RunBufferRouter(_OUTPUT_HANDLER))
+        
+        _CONFIGURED = True
+    return root_logger
 
 class EmotionSystemLogger:
     """감정 분석 시스템 전용 로거"""
     
-    def __init__(self, name: str = "EmotionSystem"):
-        self.logger = logging.getLogger(name)
-        self.setup_logging()
+    def __init__(self, name: str = ROOT_LOGGER_NAME):
+        root_logger = _configure_once()
+        # 루트가 아닌 이름은 하위 로거로 만들어 새 핸들러 없이 루트 핸들러로 전파
+        if name == ROOT_LOGGER_NAME:
+            self.logger = root_logger
+        else:
+            self.logger = root_logger.getChild(name)
     
     def setup_logging(self):
-        """로깅 설정 초기화"""
-        # 로그 레벨 설정
-        self.logger.setLevel(logging.INFO)
-        
-        # 로그 디렉토리 생성
-        log_dir = "/Users/kjw/emotion-analysis-system/logs"
-        os.makedirs(log_dir, exist_ok=True)
-        
-        # 파일 핸들러 (일별 로그)
-        today = datetime.now().strftime("%Y%m%d")
-        log_file = f"{log_dir}/emotion_system_{today}.log"
-        file_handler = logging.FileHandler(log_file, encoding='utf-8')
-        file_handler.setLevel(logging.INFO)
+        """로깅 설정 초기화 (이미 설정되어 있으면 아무것도 하지 않음)"""
+        _configure_once()
+    
+    def flush(self):
+        """버퍼에 쌓인 로그를 즉시 기록"""
+        for handler in logging.getLogger(ROOT_LOGGER_NAME).handlers:
+            handler.flush()
+    
+    @contextlib.contextmanager
+    def buffered(self):
+        """블록 안(같은 컨텍스트)의 로그를 메모리에 모았다가 블록이 끝날 때 한 번에 기록
         
-        # 콘솔 핸들러
-        console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setLevel(logging.INFO)
+        ERROR 로그가 나오거나 버퍼가 가득 차면 그 전에 기록. 다른 요청/컴포넌트의 로그는 버퍼링하지 않음
+        """
+        _configure_once()
+        if _OUTPUT_HANDLER is None:
+            # 다른 곳에서 핸들러를 붙여 둔 경우 버퍼 없이 그대로 기록
+            yield
+            return
         
-        # 포매터 설정
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
+        buffer = logging.handlers.MemoryHandler(
+            capacity=LOG_BUFFER_CAPACITY,
+            flushLevel=logging.ERROR,
+            target=_OUTPUT_HANDLER
         )
-        
-        file_handler.setFormatter(formatter)
-        console_handler.setFormatter(formatter)
-        
-        # 핸들러 추가 (중복 방지)
-        if not self.logger.handlers:
-            self.logger.addHandler(file_handler)
-            self.logger.addHandler(console_handler)
+        token = _RUN_BUFFER.set(buffer)
+        try:
+            yield
+        finally:
+            _RUN_BUFFER.reset(token)
+            # close()가 남은 레코드를 기록
+            buffer.close()
+    
+    def debug(self, message: str, extra_data: Optional[Dict] = None):
+        """디버그 로그"""
+        self._log(logging.DEBUG, message, extra_data)
     
     def info(self, message: str, extra_data: Optional[Dict] = None):
         """정보 로그"""
-        log_message = f"{message}"
-        if extra_data:
-            log_message += f" | Data: {extra_data}"
-        self.logger.info(log_message)
+        self._log(logging.INFO, message, extra_data)
     
     def warning(self, message: str, extra_data: Optional[Dict] = None):
         """경고 로그"""
-        log_message = f"{message}"
-        if extra_data:
-            log_message += f" | Data: {extra_data}"
-        self.logger.warning(log_message)
+        self._log(logging.WARNING, message, extra_data)
     
     def error(self, message: str, error: Exception = None, extra_data: Optional[Dict] = None):
         """에러 로그"""
-        log_message = f"{message}"
+        if not self.logger.isEnabledFor(logging.ERROR):
+            return
         if error:
-            log_message += f" | Error: {str(error)}"
-        if extra_data:
-            log_message += f" | Data: {extra_data}"
-        self.logger.error(log_message)
-        
-        # 상세 스택 트레이스
-        if error:
-            self.logger.error(f"Stack trace: {traceback.format_exc()}")
+            self._log(logging.ERROR, "%s | Error: %s", extra_data, message, error)
+            # 상세 스택 트레이스
+            self.logger.error("Stack trace: %s", traceback.format_exc(), stacklevel=2)
+        else:
+            self._log(logging.ERROR, message, extra_data)
     
     def success(self, message: str, extra_data: Optional[Dict] = None):
         """성공 로그"""
-        log_message = f"✅ SUCCESS: {message}"
-        if extra_data:
-            log_message += f" | Data: {extra_data}"
-        self.logger.info(log_message)
+        self._log(logging.INFO, "✅ SUCCESS: %s", extra_data, message)
+    
+    def _log(self, level: int, fmt: str, extra_data: Optional[Dict], *args):
+        """%-포맷 인자와 extra_data를 레코드에 그대로 넘겨 기록 (문자열 변환은 포매터가 출력할 때만)"""
+        if not args:
+            fmt, args = "%s", (fmt,)
+        extra = {'extra_data': extra_data} if extra_data else None
+        # stacklevel=3: 로그 위치(funcName:lineno)를 이 클래스가 아닌 호출한 코드로 표시
+        self.logger.log(level, fmt, *args, extra=extra, stacklevel=3)
 
 # 글로벌 로거 인스턴스
 system_logger = EmotionSystemLogger()
 
 def log_execution(func):
-    """함수 실행을 로깅하는 데코레이터"""
+    """함수 실행을 로깅하는 데코레이터 (비활성화 시 호출당 오버헤드 없음)"""
+    if not INSTRUMENTATION_ENABLED:
+        return func
+    
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        start_time = datetime.now()
+        start_ns = time.perf_counter_ns()
         function_name = func.__name__
         
         try:
             system_logger.info(f"🚀 Starting {function_name}")
             result = func(*args, **kwargs)
             
-            execution_time = (datetime.now() - start_time).total_seconds()
+            execution_time = (time.perf_counter_ns() - start_ns) * 1e-9
             system_logger.success(
                 f"Completed {function_name}",
                 {"execution_time_seconds": execution_time}
@@ -110,7 +269,7 @@ def log_execution(func):
             return result
             
         except Exception as e:
-            execution_time = (datetime.now() - start_time).total_seconds()
+            execution_time = (time.perf_counter_ns() - start_ns) * 1e-9
             system_logger.error(
                 f"Failed {function_name}",
                 error=e,
@@ -166,13 +325,11 @@ def validate_data(data: Any, required_fields: list, data_name: str = "data") ->
         system_logger.error(f"Data validation failed for {data_name}", error=e)
         return False
 
-def retry_operation(max_attempts: int = 3, delay_seconds: int = 1):
-    """재시도 데코레이터"""
+def retry_operation(max_attempts: int = 3, delay_seconds: float = 1):
+    """재시도 데코레이터 (대기 시간은 delay_seconds에서 시작해 시도마다 두 배, ±20% 지터)"""
     def decorator(func):
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            import time
-            
             for attempt in range(1, max_attempts + 1):
                 try:
                     return func(*args, **kwargs)
@@ -188,7 +345,8 @@ def retry_operation(max_attempts: int = 3, delay_seconds: int = 1):
                             f"Attempt {attempt} failed for {func.__name__}, retrying...",
                             extra_data={"error": str(e)}
                         )
-                        time.sleep(delay_seconds)
+                        backoff = delay_seconds * (2 ** (attempt - 1))
+                        time.sleep(backoff * random.uniform(1 - RETRY_JITTER, 1 + RETRY_JITTER))
                         
         return wrapper
     return decorator
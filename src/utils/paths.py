@@ -0,0 +1,30 @@
+"""
+시스템 경로 설정
+- 모든 모듈이 같은 기준 경로 사용 (EMOTION_SYSTEM_HOME 환경 변수, 기본 ~/emotion-analysis-system)
+- 경로는 import 시 한 번만 계산하고, 디렉토리 생성도 프로세스당 한 번
+"""
+
+import os
+import threading
+from pathlib import Path
+
+# 시스템 기준 경로와 하위 디렉토리 (환경 변수가 비어 있으면 기본 경로)
+BASE = Path(os.environ.get("EMOTION_SYSTEM_HOME") or Path.home() / "emotion-analysis-system")
+CONFIG = BASE / "config"
+LOGS = BASE / "logs"
+PERF_LOGS = LOGS / "performance"
+
+# 디렉토리 생성 여부 (설정/로깅/성능 모니터 중 먼저 호출한 쪽에서 한 번만 생성)
+_ENSURED = False
+_ENSURE_LOCK = threading.Lock()
+
+def ensure_directories():
+    """설정 및 로그 디렉토리를 한 번만 생성 (PERF_LOGS를 만들면 LOGS도 함께 생성)"""
+    global _ENSURED
+    if _ENSURED:
+        return
+    with _ENSURE_LOCK:
+        if not _ENSURED:
+            CONFIG.mkdir(parents=True, exist_ok=True)
+            PERF_LOGS.mkdir(parents=True, exist_ok=True)
+            _ENSURED = True
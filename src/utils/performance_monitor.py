@@ -6,22 +6,51 @@
 - 시스템 리소스 분석
 """
 
+import math
+import queue
+import sys
 import time
 import psutil
 import threading
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass, field
-from collections import defaultdict, deque
-import json
-import os
+from collections import Counter, defaultdict, deque
 
-@dataclass
+import orjson
+
+from utils.logging_system import INSTRUMENTATION_ENABLED
+from utils.paths import PERF_LOGS, ensure_directories
+
+# 시스템 상태 로그 파일 최대 크기 (넘으면 시각을 붙여 교체)
+SYSTEM_LOG_MAX_BYTES = 1024 * 1024
+
+# 함수별 실행 통계를 모으는 시간 버킷 크기와 보관 개수 (1시간 단위, 최근 24시간)
+STATS_BUCKET_NS = 3600 * 10**9
+STATS_BUCKET_COUNT = 24
+
+# 성능 리포트 쓰기 대기열 크기와 연속 쓰기 사이 대기 시간 (초, 몰려온 요청을 나눠 씀)
+REPORT_QUEUE_SIZE = 16
+REPORT_WRITE_INTERVAL_SECONDS = 0.2
+
+# 시스템 리소스 측정 주기와 시스템 상태 로그 저장 주기 (초)
+SYSTEM_MONITOR_INTERVAL_SECONDS = 60
+SYSTEM_LOG_INTERVAL_SECONDS = 300
+
+# 현재 프로세스 핸들 (작업마다 새로 만들지 않고 재사용)
+_PROCESS = psutil.Process()
+
+def json_default(obj):
+    """orjson이 직접 처리하지 못하는 값은 문자열로 변환 (datetime은 orjson이 ISO 8601로 직렬화)"""
+    return str(obj)
+
+@dataclass(slots=True)
 class PerformanceMetric:
-    """성능 지표 데이터 클래스"""
+    """성능 지표 데이터 클래스 (호출마다 생성되므로 __dict__ 없는 slots 인스턴스)"""
     function_name: str
-    start_time: datetime
-    end_time: Optional[datetime] = None
+    start_time: datetime  # 사람이 읽는 시작 시각 (실행 시간 측정은 아래 ns 카운터로)
+    start_ns: Optional[int] = None  # time.perf_counter_ns() 기준 시작/종료
+    end_ns: Optional[int] = None
     execution_time: Optional[float] = None
     memory_before: Optional[float] = None
     memory_after: Optional[float] = None
@@ -31,15 +60,51 @@ class PerformanceMetric:
     errors: List[str] = field(default_factory=list)
     
     def calculate_execution_time(self):
-        """실행 시간 계산"""
-        if self.end_time and self.start_time:
-            self.execution_time = (self.end_time - self.start_time).total_seconds()
+        """실행 시간 계산 (초)"""
+        if self.start_ns is not None and self.end_ns is not None:
+            self.execution_time = (self.end_ns - self.start_ns) * 1e-9
     
     def calculate_memory_delta(self):
         """메모리 사용량 변화 계산"""
         if self.memory_before is not None and self.memory_after is not None:
             self.memory_delta = self.memory_after - self.memory_before
 
+@dataclass(slots=True)
+class FunctionStats:
+    """함수별 누적 실행 통계 (작업이 끝날 때마다 O(1)로 갱신, 요약할 때는 버킷끼리 합산)"""
+    call_count: int = 0
+    time_count: int = 0  # 실행 시간이 기록된 호출 수
+    time_sum: float = 0.0
+    time_min: float = math.inf
+    time_max: float = -math.inf
+    memory_count: int = 0  # 메모리 변화가 기록된 호출 수
+    memory_sum: float = 0.0
+    error_count: int = 0
+    
+    def add(self, metric: PerformanceMetric):
+        """끝난 작업 하나를 통계에 반영"""
+        self.call_count += 1
+        if metric.execution_time:
+            self.time_count += 1
+            self.time_sum += metric.execution_time
+            self.time_min = min(self.time_min, metric.execution_time)
+            self.time_max = max(self.time_max, metric.execution_time)
+        if metric.memory_delta:
+            self.memory_count += 1
+            self.memory_sum += metric.memory_delta
+        self.error_count += len(metric.errors)
+    
+    def merge(self, other: 'FunctionStats'):
+        """다른 버킷의 통계를 합산"""
+        self.call_count += other.call_count
+        self.time_count += other.time_count
+        self.time_sum += other.time_sum
+        self.time_min = min(self.time_min, other.time_min)
+        self.time_max = max(self.time_max, other.time_max)
+        self.memory_count += other.memory_count
+        self.memory_sum += other.memory_sum
+        self.error_count += other.error_count
+
 class PerformanceMonitor:
     """성능 모니터링 시스템"""
     
@@ -47,28 +112,50 @@ class PerformanceMonitor:
         self.max_history_size = max_history_size
         self.metrics_history: deque = deque(maxlen=max_history_size)
         self.current_metrics: Dict[str, PerformanceMetric] = {}
-        self.api_call_counter = defaultdict(int)
+        # API 호출 횟수 (수집기 스레드에서 동시에 기록하므로 락으로 보호, 전체 합계는 요약할 때 계산)
+        self.api_call_counter = Counter()
+        self._api_call_lock = threading.Lock()
+        # 시간 버킷별 함수 통계: (버킷 번호, {함수 이름: FunctionStats}), 오래된 버킷은 자동으로 밀려남
+        self._stats_buckets: deque = deque(maxlen=STATS_BUCKET_COUNT)
+        self._stats_lock = threading.Lock()
         self.system_stats = {
             'startup_time': datetime.now(),
             'total_operations': 0,
-            'total_api_calls': 0,
             'total_errors': 0
         }
         
+        # 백그라운드 모니터링 스레드가 마지막으로 측정한 CPU 사용률 (작업 종료 시 이 값을 기록)
+        self._latest_cpu: Optional[float] = None
+        # 모니터링 스레드 종료 신호 (대기 중에도 바로 깨어남)
+        self._stop = threading.Event()
+        
         # 백그라운드 시스템 모니터링 시작
         self._start_system_monitoring()
         
+        # 성능 리포트는 전용 스레드가 대기열에서 꺼내 직렬화/저장 (호출한 쪽은 기다리지 않음)
+        self._report_queue: queue.Queue = queue.Queue(maxsize=REPORT_QUEUE_SIZE)
+        self._report_thread = threading.Thread(target=self._write_reports, daemon=True)
+        self._report_thread.start()
+        
         # 로그 파일 경로
-        self.log_dir = "/Users/kjw/emotion-analysis-system/logs/performance"
-        os.makedirs(self.log_dir, exist_ok=True)
+        self.log_dir = PERF_LOGS
+        ensure_directories()
+        # 오늘 날짜의 시스템 상태 로그 경로 (날짜가 바뀔 때만 다시 만듦)
+        self._system_log_file = (None, None)
     
     def _start_system_monitoring(self):
         """백그라운드에서 시스템 리소스 모니터링"""
         def monitor_system():
-            while True:
+            # 첫 호출로 기준점만 잡고, 이후 호출은 직전 호출 이후의 CPU 사용률을 대기 없이 반환
+            psutil.cpu_percent(interval=None)
+            next_save_at = time.monotonic() + SYSTEM_LOG_INTERVAL_SECONDS
+            
+            # 측정 주기마다 깨어나고, 종료 신호가 오면 즉시 빠져나옴
+            while not self._stop.wait(timeout=SYSTEM_MONITOR_INTERVAL_SECONDS):
                 try:
                     # CPU 사용률
-                    cpu_percent = psutil.cpu_percent(interval=1)
+                    cpu_percent = psutil.cpu_percent(interval=None)
+                    self._latest_cpu = cpu_percent
                     
                     # 메모리 사용률
                     memory = psutil.virtual_memory()
@@ -90,53 +177,59 @@ class PerformanceMonitor:
                     }
                     
                     # 시스템 상태 로그 저장 (5분마다)
-                    if timestamp.minute % 5 == 0 and timestamp.second < 2:
+                    if time.monotonic() >= next_save_at:
                         self._save_system_log(system_state)
-                    
-                    time.sleep(60)  # 1분마다 모니터링
+                        next_save_at = time.monotonic() + SYSTEM_LOG_INTERVAL_SECONDS
                     
                 except Exception as e:
                     print(f"시스템 모니터링 오류: {e}")
-                    time.sleep(60)
         
-        monitor_thread = threading.Thread(target=monitor_system, daemon=True)
-        monitor_thread.start()
+        self._monitor_thread = threading.Thread(target=monitor_system, daemon=True)
+        self._monitor_thread.start()
+    
+    def stop_monitoring(self, timeout: Optional[float] = None):
+        """백그라운드 시스템 모니터링 종료 (스레드가 끝날 때까지 최대 timeout초 대기)"""
+        self._stop.set()
+        self._monitor_thread.join(timeout)
     
     def start_operation(self, function_name: str) -> str:
         """작업 시작 모니터링"""
-        operation_id = f"{function_name}_{datetime.now().timestamp()}"
+        # 같은 함수 이름은 하나의 문자열 객체를 공유 (집계 딕셔너리 키 비교가 포인터 비교로 끝남)
+        function_name = sys.intern(function_name)
+        start_time = datetime.now()  # ID와 시작 시각에 같은 값 사용
+        operation_id = f"{function_name}_{start_time.timestamp()}"
         
         # 현재 메모리 사용량 측정
-        process = psutil.Process()
-        memory_before = process.memory_info().rss / (1024**2)  # MB 단위
+        memory_before = _PROCESS.memory_info().rss / (1024**2)  # MB 단위
         
         metric = PerformanceMetric(
             function_name=function_name,
-            start_time=datetime.now(),
+            start_time=start_time,
             memory_before=memory_before
         )
         
         self.current_metrics[operation_id] = metric
         self.system_stats['total_operations'] += 1
         
+        metric.start_ns = time.perf_counter_ns()  # 측정 준비가 끝난 직후부터 시간 측정
         return operation_id
     
     def end_operation(self, operation_id: str, error: Optional[str] = None):
         """작업 종료 모니터링"""
+        end_ns = time.perf_counter_ns()
         if operation_id not in self.current_metrics:
             return
         
         metric = self.current_metrics[operation_id]
-        metric.end_time = datetime.now()
+        metric.end_ns = end_ns
         
         # 실행 시간 계산
         metric.calculate_execution_time()
         
         # 현재 메모리 사용량 측정
         try:
-            process = psutil.Process()
-            metric.memory_after = process.memory_info().rss / (1024**2)  # MB 단위
-            metric.cpu_usage = psutil.cpu_percent()
+            metric.memory_after = _PROCESS.memory_info().rss / (1024**2)  # MB 단위
+            metric.cpu_usage = self._latest_cpu  # 작업마다 따로 측정하지 않고 최근 측정값 사용
             metric.calculate_memory_delta()
         except:
             pass
@@ -149,6 +242,17 @@ class PerformanceMonitor:
         # 히스토리에 추가
         self.metrics_history.append(metric)
         
+        # 종료 시각이 속한 시간 버킷의 함수 통계 갱신
+        bucket_index = end_ns // STATS_BUCKET_NS
+        with self._stats_lock:
+            if not self._stats_buckets or self._stats_buckets[-1][0] != bucket_index:
+                self._stats_buckets.append((bucket_index, {}))
+            bucket = self._stats_buckets[-1][1]
+            stats = bucket.get(metric.function_name)
+            if stats is None:
+                stats = bucket[metric.function_name] = FunctionStats()
+            stats.add(metric)
+        
         # 현재 작업에서 제거
         del self.current_metrics[operation_id]
         
@@ -156,50 +260,53 @@ class PerformanceMonitor:
     
     def record_api_call(self, api_name: str):
         """API 호출 기록"""
-        self.api_call_counter[api_name] += 1
-        self.system_stats['total_api_calls'] += 1
+        api_name = sys.intern(api_name)
+        with self._api_call_lock:
+            self.api_call_counter[api_name] += 1
     
     def get_performance_summary(self, hours: int = 24) -> Dict[str, Any]:
-        """성능 요약 통계"""
-        cutoff_time = datetime.now() - timedelta(hours=hours)
-        recent_metrics = [m for m in self.metrics_history if m.start_time >= cutoff_time]
-        
-        if not recent_metrics:
+        """성능 요약 통계 (최근 hours개 시간 버킷의 누적 통계를 합산, 최대 STATS_BUCKET_COUNT시간)"""
+        first_bucket = time.perf_counter_ns() // STATS_BUCKET_NS - min(hours, STATS_BUCKET_COUNT) + 1
+        
+        # 버킷은 시간 순으로 쌓이므로 최신 버킷부터 거꾸로 보다가 기간 전 버킷에서 멈춤
+        function_stats = defaultdict(FunctionStats)
+        with self._stats_lock:
+            for bucket_index, bucket in reversed(self._stats_buckets):
+                if bucket_index < first_bucket:
+                    break
+                for func_name, stats in bucket.items():
+                    function_stats[func_name].merge(stats)
+        
+        if not function_stats:
             return {"message": "최근 데이터가 없습니다"}
         
-        # 함수별 통계
-        function_stats = defaultdict(list)
-        for metric in recent_metrics:
-            function_stats[metric.function_name].append(metric)
-        
         summary = {
             "period_hours": hours,
-            "total_operations": len(recent_metrics),
+            "total_operations": sum(stats.call_count for stats in function_stats.values()),
             "functions": {}
         }
         
-        for func_name, metrics in function_stats.items():
-            execution_times = [m.execution_time for m in metrics if m.execution_time]
-            memory_deltas = [m.memory_delta for m in metrics if m.memory_delta]
-            error_count = sum(len(m.errors) for m in metrics)
-            
+        for func_name, stats in function_stats.items():
             function_summary = {
-                "call_count": len(metrics),
-                "avg_execution_time": sum(execution_times) / len(execution_times) if execution_times else 0,
-                "max_execution_time": max(execution_times) if execution_times else 0,
-                "min_execution_time": min(execution_times) if execution_times else 0,
-                "avg_memory_delta": sum(memory_deltas) / len(memory_deltas) if memory_deltas else 0,
-                "error_count": error_count,
-                "success_rate": (len(metrics) - error_count) / len(metrics) * 100 if metrics else 0
+                "call_count": stats.call_count,
+                "avg_execution_time": stats.time_sum / stats.time_count if stats.time_count else 0,
+                "max_execution_time": stats.time_max if stats.time_count else 0,
+                "min_execution_time": stats.time_min if stats.time_count else 0,
+                "avg_memory_delta": stats.memory_sum / stats.memory_count if stats.memory_count else 0,
+                "error_count": stats.error_count,
+                "success_rate": (stats.call_count - stats.error_count) / stats.call_count * 100
             }
             
             summary["functions"][func_name] = function_summary
         
         # API 호출 통계
-        summary["api_calls"] = dict(self.api_call_counter)
+        with self._api_call_lock:
+            api_calls = dict(self.api_call_counter)
+        summary["api_calls"] = api_calls
         
         # 전체 시스템 통계
         summary["system_stats"] = self.system_stats.copy()
+        summary["system_stats"]["total_api_calls"] = sum(api_calls.values())
         summary["system_stats"]["uptime_hours"] = (
             datetime.now() - self.system_stats['startup_time']
         ).total_seconds() / 3600
@@ -244,50 +351,35 @@ class PerformanceMonitor:
         return memory_ops
     
     def _save_system_log(self, system_state: Dict):
-        """시스템 상태 로그 저장"""
-        today = datetime.now().strftime("%Y%m%d")
-        log_file = f"{self.log_dir}/system_performance_{today}.json"
+        """시스템 상태 로그 저장 (JSON Lines 파일 끝에 한 줄 추가, 기존 내용은 읽지 않음)"""
+        now = datetime.now()
+        log_date, log_file = self._system_log_file
+        if log_date != now.date():
+            log_file = self.log_dir / f"system_performance_{now.strftime('%Y%m%d')}.jsonl"
+            self._system_log_file = (now.date(), log_file)
         
         try:
-            # 기존 로그 읽기
-            if os.path.exists(log_file):
-                with open(log_file, 'r', encoding='utf-8') as f:
-                    logs = json.load(f)
-            else:
-                logs = []
-            
-            # 새로운 로그 추가
-            logs.append(system_state)
+            # 파일이 너무 커지면 시각을 붙여 옮기고 새 파일에 기록
+            try:
+                if log_file.stat().st_size > SYSTEM_LOG_MAX_BYTES:
+                    log_file.replace(log_file.with_name(f"{log_file.stem}_{now.strftime('%H%M%S')}.jsonl"))
+            except FileNotFoundError:
+                pass
             
-            # 로그 저장 (최대 1000개 유지)
-            if len(logs) > 1000:
-                logs = logs[-1000:]
-            
-            with open(log_file, 'w', encoding='utf-8') as f:
-                json.dump(logs, f, indent=2, ensure_ascii=False)
+            with log_file.open('ab') as f:
+                f.write(orjson.dumps(system_state, default=json_default, option=orjson.OPT_APPEND_NEWLINE))
                 
         except Exception as e:
             print(f"시스템 로그 저장 실패: {e}")
     
     def save_performance_report(self):
-        """성능 리포트 저장"""
+        """성능 리포트 저장 요청 (리포트를 만들어 대기열에 넣고 바로 저장될 경로 반환)"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        report_file = f"{self.log_dir}/performance_report_{timestamp}.json"
-        
-        def serialize_datetime(obj):
-            """datetime 객체를 JSON 직렬화 가능한 문자열로 변환"""
-            if isinstance(obj, datetime):
-                return obj.isoformat()
-            elif isinstance(obj, dict):
-                return {k: serialize_datetime(v) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                return [serialize_datetime(item) for item in obj]
-            else:
-                return obj
+        report_file = self.log_dir / f"performance_report_{timestamp}.json"
         
         report = {
             "generated_at": datetime.now().isoformat(),
-            "summary_24h": serialize_datetime(self.get_performance_summary(24)),
+            "summary_24h": self.get_performance_summary(24),
             "slow_operations": self.get_slow_operations(),
             "memory_intensive_operations": self.get_memory_intensive_operations(),
             "recent_metrics": [
@@ -302,24 +394,48 @@ class PerformanceMonitor:
             ]
         }
         
-        try:
-            with open(report_file, 'w', encoding='utf-8') as f:
-                json.dump(report, f, indent=2, ensure_ascii=False)
-            
-            print(f"📊 성능 리포트 저장 완료: {report_file}")
-            return report_file
+        # 대기열이 가득 차면 가장 오래된 리포트를 버림 (모니터링 리포트는 최신 것만 중요)
+        while True:
+            try:
+                self._report_queue.put_nowait((report_file, report))
+                return report_file
+            except queue.Full:
+                try:
+                    self._report_queue.get_nowait()
+                    self._report_queue.task_done()
+                except queue.Empty:
+                    pass
+    
+    def wait_for_reports(self):
+        """대기열에 있는 성능 리포트가 모두 저장될 때까지 대기"""
+        self._report_queue.join()
+    
+    def _write_reports(self):
+        """리포트 쓰기 스레드 (대기열에서 꺼내 JSON으로 저장)"""
+        while True:
+            report_file, report = self._report_queue.get()
+            try:
+                report_file.write_bytes(
+                    orjson.dumps(report, default=json_default, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+                )
+                print(f"📊 성능 리포트 저장 완료: {report_file}")
+            except Exception as e:
+                print(f"성능 리포트 저장 실패: {e}")
+            finally:
+                self._report_queue.task_done()
             
-        except Exception as e:
-            print(f"성능 리포트 저장 실패: {e}")
-            return None
+            time.sleep(REPORT_WRITE_INTERVAL_SECONDS)
 
 # 글로벌 성능 모니터 인스턴스
 performance_monitor = PerformanceMonitor()
 
 def monitor_performance(func):
-    """성능 모니터링 데코레이터"""
+    """성능 모니터링 데코레이터 (비활성화 시 호출당 오버헤드 없음)"""
     import functools
     
+    if not INSTRUMENTATION_ENABLED:
+        return func
+    
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
         operation_id = performance_monitor.start_operation(func.__name__)
@@ -353,13 +469,8 @@ if __name__ == "__main__":
     
     # 성능 요약 출력
     summary = performance_monitor.get_performance_summary(1)
-    # datetime 객체를 문자열로 변환
-    import copy
-    summary_copy = copy.deepcopy(summary)
-    if 'system_stats' in summary_copy and 'startup_time' in summary_copy['system_stats']:
-        summary_copy['system_stats']['startup_time'] = summary_copy['system_stats']['startup_time'].isoformat()
-    
-    print("성능 요약:", json.dumps(summary_copy, indent=2, ensure_ascii=False))
+    print("성능 요약:", orjson.dumps(summary, default=json_default, option=orjson.OPT_INDENT_2).decode())
     
     # 리포트 저장
-    performance_monitor.save_performance_report()
\ No newline at end of file
+    performance_monitor.save_performance_report()
+    performance_monitor.wait_for_reports()
\ No newline at end of file
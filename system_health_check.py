@@ -7,160 +7,225 @@
 
 import sys
 import os
-from datetime import datetime
-import json
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from enum import IntEnum
+from pathlib import Path
 
-sys.path.append('/Users/kjw/emotion-analysis-system/src')
+import orjson
 
-def check_system_health():
-    """전체 시스템 상태 검사"""
-    print("🔍 === 감정 분석 시스템 상태 검증 ===")
-    print(f"📅 검사 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print("="*60)
+# 프로젝트 루트 (이 스크립트가 있는 디렉토리, 소스/테스트 디렉토리 구조 확인에만 사용)
+ROOT = Path(__file__).resolve().parent
+
+sys.path.append(str(ROOT / "src"))
+
+# 설정/로그 경로는 다른 모듈과 같은 기준 경로 사용 (EMOTION_SYSTEM_HOME)
+from utils import paths
+
+CONFIG_DIR = paths.CONFIG
+
+# 상태 보고서 경로 (다음 검사의 캐시로도 사용)
+REPORT_PATH = paths.LOGS / "system_health_report.json"
+
+# Google OAuth 자격 증명 파일 경로 (GoogleAuthenticator, 수집기가 읽는 파일)
+GOOGLE_CREDENTIALS_PATH = CONFIG_DIR / "google_credentials.json"
+
+# Firebase 서비스 계정 키 경로 (FirebaseManager가 읽는 파일)
+FIREBASE_SERVICE_ACCOUNT_PATH = CONFIG_DIR / "firebase_service_account.json"
+
+# 프로젝트 루트에 있어야 하는 디렉토리
+REQUIRED_DIRS = ("src", "tests")
+
+# 기준 경로 아래에 있어야 하는 설정/로그 디렉토리
+REQUIRED_DATA_DIRS = (paths.CONFIG, paths.LOGS)
+
+# 이 시간(초) 안에 저장된 보고서가 있으면 전체 검사를 다시 하지 않고 재사용
+HEALTH_CACHE_TTL_SECONDS = 30
+
+class Status(IntEnum):
+    """컴포넌트 상태 (값이 클수록 심각, 전체 상태는 가장 심각한 값)"""
+    OK = 0
+    WARNING = 1
+    ERROR = 2
+
+def _dir_contents(parent, cache):
+    """디렉토리 항목 이름 집합 (디렉토리마다 scandir 한 번만, 없으면 빈 집합)"""
+    names = cache.get(parent)
+    if names is None:
+        try:
+            with os.scandir(parent) as entries:
+                names = {entry.name for entry in entries}
+        except OSError:
+            names = set()
+        cache[parent] = names
+    return names
+
+def _path_exists(path, cache):
+    """경로 존재 여부 (개별 stat 대신 부모 디렉토리 목록에서 확인)"""
+    return path.name in _dir_contents(path.parent, cache)
+
+def _load_cached_health():
+    """TTL 안에 저장된 상태 보고서 (없거나 오래됐거나 읽을 수 없으면 None)"""
+    try:
+        with open(REPORT_PATH, 'rb') as f:
+            cached = orjson.loads(f.read())
+        checked_at = datetime.fromisoformat(cached["timestamp"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    
+    if datetime.now() - checked_at < timedelta(seconds=HEALTH_CACHE_TTL_SECONDS):
+        return cached
+    return None
+
+def check_logging(dir_cache):
+    """1. 로깅 시스템 확인"""
+    try:
+        from utils.logging_system import EmotionSystemLogger
+        logger_test = EmotionSystemLogger("HealthCheck")
+        logger_test.info("헬스 체크 시작")
+        return "logging", Status.OK, None, "✅ 로깅 시스템: 정상", {}
+    except Exception as e:
+        return "logging", Status.ERROR, str(e), f"❌ 로깅 시스템: 오류 - {e}", {}
+
+def check_config(dir_cache):
+    """2. 설정 관리자 확인"""
+    try:
+        from utils.config_manager import config_manager
+        validation = config_manager.validate_environment()
+        missing_configs = [k for k, v in validation.items() if not v]
+        
+        if missing_configs:
+            return "config", Status.WARNING, f"Missing {missing_configs}", f"⚠️ 설정 관리자: 누락된 설정 - {missing_configs}", {}
+        return "config", Status.OK, None, "✅ 설정 관리자: 정상", {}
+    except Exception as e:
+        return "config", Status.ERROR, str(e), f"❌ 설정 관리자: 오류 - {e}", {}
+
+def check_performance(dir_cache):
+    """3. 성능 모니터링 확인"""
+    try:
+        from utils.performance_monitor import performance_monitor
+        summary = performance_monitor.get_performance_summary(1)
+        extras = {
+            "performance_summary": {
+                "total_operations": summary.get("total_operations", 0),
+                "uptime_hours": summary.get("system_stats", {}).get("uptime_hours", 0)
+            }
+        }
+        return "performance", Status.OK, None, "✅ 성능 모니터링: 정상", extras
+    except Exception as e:
+        return "performance", Status.ERROR, str(e), f"❌ 성능 모니터링: 오류 - {e}", {}
+
+def check_google_auth(dir_cache):
+    """4. Google 인증 시스템 확인"""
+    try:
+        # 자격 증명 파일만 확인 (실제 로그인은 하지 않으므로 Google 라이브러리는 import하지 않음)
+        if _path_exists(GOOGLE_CREDENTIALS_PATH, dir_cache):
+            return "google_auth", Status.OK, None, "✅ Google 인증: 정상 (자격증명 파일 확인됨)", {}
+        return "google_auth", Status.WARNING, "No credentials file", "⚠️ Google 인증: 자격증명 파일 없음", {}
+    except Exception as e:
+        return "google_auth", Status.ERROR, str(e), f"❌ Google 인증: 오류 - {e}", {}
+
+def check_emotion_engine(dir_cache):
+    """5. 감정 분석 엔진 확인"""
+    try:
+        from analysis.emotion_engine import EmotionAnalysisEngine
+        engine = EmotionAnalysisEngine()
+        # 간단한 테스트 실행 (실제 메서드명 사용)
+        test_data = {"subscriptions": [], "liked_videos": []}
+        result = engine.analyze_youtube_emotions(test_data)
+        if result and 'emotion_scores' in result:
+            return "emotion_engine", Status.OK, None, "✅ 감정 분석 엔진: 정상", {}
+        return "emotion_engine", Status.WARNING, "Invalid result", "⚠️ 감정 분석 엔진: 결과 형식 이상", {}
+    except Exception as e:
+        return "emotion_engine", Status.ERROR, str(e), f"❌ 감정 분석 엔진: 오류 - {e}", {}
+
+def check_firebase(dir_cache):
+    """6. Firebase 관리자 확인"""
+    try:
+        # FirebaseManager가 읽는 서비스 계정 키 확인 (파일 확인만 하므로 firebase-admin은 import하지 않음)
+        if _path_exists(FIREBASE_SERVICE_ACCOUNT_PATH, dir_cache):
+            return "firebase", Status.OK, None, "✅ Firebase 관리자: 정상 (설정 파일 확인됨)", {}
+        return "firebase", Status.WARNING, "No config file", "⚠️ Firebase 관리자: 설정 파일 없음", {}
+    except Exception as e:
+        return "firebase", Status.ERROR, str(e), f"❌ Firebase 관리자: 오류 - {e}", {}
+
+def check_directory_structure(dir_cache):
+    """7. 디렉토리 구조 확인"""
+    # 루트 디렉토리 목록 한 번으로 소스/테스트 확인, 설정/로그는 기준 경로에서 확인
+    root_entries = _dir_contents(ROOT, dir_cache)
+    missing_dirs = [str(ROOT / name) for name in REQUIRED_DIRS if name not in root_entries]
+    missing_dirs.extend(str(path) for path in REQUIRED_DATA_DIRS if not _path_exists(path, dir_cache))
+    
+    if missing_dirs:
+        return "directory_structure", Status.WARNING, f"Missing {missing_dirs}", f"⚠️ 디렉토리 구조: 누락된 디렉토리 - {missing_dirs}", {}
+    return "directory_structure", Status.OK, None, "✅ 디렉토리 구조: 정상", {}
+
+# 컴포넌트 검사 목록: (검사 시작 메시지, 검사 함수), 결과는 이 순서대로 출력
+COMPONENT_CHECKS = [
+    ("🧾 로깅 시스템 확인...", check_logging),
+    ("⚙️ 설정 관리자 확인...", check_config),
+    ("📊 성능 모니터링 확인...", check_performance),
+    ("🔐 Google 인증 시스템 확인...", check_google_auth),
+    ("🧠 감정 분석 엔진 확인...", check_emotion_engine),
+    ("🔥 Firebase 관리자 확인...", check_firebase),
+    ("📁 디렉토리 구조 확인...", check_directory_structure),
+]
+
+def check_system_health(force=False):
+    """전체 시스템 상태 검사 (force=True 또는 FORCE_HEALTHCHECK=true면 캐시를 무시하고 다시 검사)"""
+    if not force and os.getenv("FORCE_HEALTHCHECK", "false").lower() != "true":
+        cached = _load_cached_health()
+        if cached is not None:
+            print(f"♻️ 캐시된 상태 보고서 사용 ({cached['timestamp']}): {cached['overall_status']}")
+            return cached
+    
+    # 검사 시각은 한 번만 읽어 출력과 보고서에 같이 사용
+    now = datetime.now()
+    
+    # 진행 출력은 모아 두었다가 검사가 끝나면 한 번에 출력
+    lines = [
+        "🔍 === 감정 분석 시스템 상태 검증 ===",
+        f"📅 검사 시간: {now.strftime('%Y-%m-%d %H:%M:%S')}",
+        "="*60,
+    ]
     
     health_status = {
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": now.isoformat(),
         "components": {},
         "overall_status": "UNKNOWN"
     }
     
+    # 검사 한 번 동안 읽은 디렉토리 목록 (같은 디렉토리는 다시 읽지 않음)
+    dir_cache = {}
+    # 컴포넌트별 상태 (보고서에는 이름 문자열로 기록)
+    statuses = []
+    
     try:
-        # 1. 로깅 시스템 확인
-        print("\n🧾 로깅 시스템 확인...")
-        try:
-            from utils.logging_system import system_logger, EmotionSystemLogger
-            logger_test = EmotionSystemLogger("HealthCheck")
-            logger_test.info("헬스 체크 시작")
-            health_status["components"]["logging"] = "OK"
-            print("✅ 로깅 시스템: 정상")
-        except Exception as e:
-            health_status["components"]["logging"] = f"ERROR: {e}"
-            print(f"❌ 로깅 시스템: 오류 - {e}")
-        
-        # 2. 설정 관리자 확인
-        print("\n⚙️ 설정 관리자 확인...")
-        try:
-            from utils.config_manager import config_manager
-            validation = config_manager.validate_environment()
-            missing_configs = [k for k, v in validation.items() if not v]
+        # 서로 독립적인 컴포넌트 검사를 동시에 실행 (import/디스크 대기 시간이 겹침)
+        with ThreadPoolExecutor(max_workers=len(COMPONENT_CHECKS)) as executor:
+            futures = [executor.submit(check, dir_cache) for _, check in COMPONENT_CHECKS]
             
-            if missing_configs:
-                health_status["components"]["config"] = f"WARNING: Missing {missing_configs}"
-                print(f"⚠️ 설정 관리자: 누락된 설정 - {missing_configs}")
-            else:
-                health_status["components"]["config"] = "OK"
-                print("✅ 설정 관리자: 정상")
-        except Exception as e:
-            health_status["components"]["config"] = f"ERROR: {e}"
-            print(f"❌ 설정 관리자: 오류 - {e}")
-        
-        # 3. 성능 모니터링 확인
-        print("\n📊 성능 모니터링 확인...")
-        try:
-            from utils.performance_monitor import performance_monitor
-            summary = performance_monitor.get_performance_summary(1)
-            health_status["components"]["performance"] = "OK"
-            health_status["performance_summary"] = {
-                "total_operations": summary.get("total_operations", 0),
-                "uptime_hours": summary.get("system_stats", {}).get("uptime_hours", 0)
-            }
-            print("✅ 성능 모니터링: 정상")
-        except Exception as e:
-            health_status["components"]["performance"] = f"ERROR: {e}"
-            print(f"❌ 성능 모니터링: 오류 - {e}")
-        
-        # 4. Google 인증 시스템 확인
-        print("\n🔐 Google 인증 시스템 확인...")
-        try:
-            from auth.google_auth import GoogleAuthenticator
-            auth = GoogleAuthenticator()
-            # 자격 증명 파일만 확인 (실제 로그인은 하지 않음)
-            if auth._validate_credentials_file():
-                health_status["components"]["google_auth"] = "OK"
-                print("✅ Google 인증: 정상 (자격증명 파일 확인됨)")
-            else:
-                health_status["components"]["google_auth"] = "WARNING: No credentials file"
-                print("⚠️ Google 인증: 자격증명 파일 없음")
-        except Exception as e:
-            health_status["components"]["google_auth"] = f"ERROR: {e}"
-            print(f"❌ Google 인증: 오류 - {e}")
-        
-        # 5. 감정 분석 엔진 확인
-        print("\n🧠 감정 분석 엔진 확인...")
-        try:
-            from analysis.emotion_engine import EmotionAnalysisEngine
-            engine = EmotionAnalysisEngine()
-            # 간단한 테스트 실행 (실제 메서드명 사용)
-            test_data = {"subscriptions": [], "liked_videos": []}
-            result = engine.analyze_youtube_emotions(test_data)
-            if result and 'emotion_scores' in result:
-                health_status["components"]["emotion_engine"] = "OK"
-                print("✅ 감정 분석 엔진: 정상")
-            else:
-                health_status["components"]["emotion_engine"] = "WARNING: Invalid result"
-                print("⚠️ 감정 분석 엔진: 결과 형식 이상")
-        except Exception as e:
-            health_status["components"]["emotion_engine"] = f"ERROR: {e}"
-            print(f"❌ 감정 분석 엔진: 오류 - {e}")
-        
-        # 6. Firebase 관리자 확인
-        print("\n🔥 Firebase 관리자 확인...")
-        try:
-            from database.firebase_manager import FirebaseManager
-            fb_manager = FirebaseManager()
-            # Firebase 설정 파일 확인 (여러 경로 시도)
-            config_paths = [
-                "/Users/kjw/emotion-analysis-system/config/firebase_config.json",
-                "/Users/kjw/emotion-analysis-system/config/firebase_service_account.json"
-            ]
-            
-            config_found = False
-            for config_path in config_paths:
-                if os.path.exists(config_path):
-                    config_found = True
-                    break
-            
-            if config_found:
-                health_status["components"]["firebase"] = "OK"
-                print("✅ Firebase 관리자: 정상 (설정 파일 확인됨)")
-            else:
-                health_status["components"]["firebase"] = "WARNING: No config file"
-                print("⚠️ Firebase 관리자: 설정 파일 없음")
-        except Exception as e:
-            health_status["components"]["firebase"] = f"ERROR: {e}"
-            print(f"❌ Firebase 관리자: 오류 - {e}")
-        
-        # 7. 디렉토리 구조 확인
-        print("\n📁 디렉토리 구조 확인...")
-        required_dirs = [
-            "/Users/kjw/emotion-analysis-system/src",
-            "/Users/kjw/emotion-analysis-system/config",
-            "/Users/kjw/emotion-analysis-system/logs",
-            "/Users/kjw/emotion-analysis-system/tests"
-        ]
-        
-        missing_dirs = []
-        for dir_path in required_dirs:
-            if not os.path.exists(dir_path):
-                missing_dirs.append(dir_path)
-        
-        if missing_dirs:
-            health_status["components"]["directory_structure"] = f"WARNING: Missing {missing_dirs}"
-            print(f"⚠️ 디렉토리 구조: 누락된 디렉토리 - {missing_dirs}")
-        else:
-            health_status["components"]["directory_structure"] = "OK"
-            print("✅ 디렉토리 구조: 정상")
+            # 출력은 끝난 순서가 아니라 검사 목록 순서대로
+            for (title, _), future in zip(COMPONENT_CHECKS, futures):
+                component, status, detail, message, extras = future.result()
+                statuses.append(status)
+                health_status["components"][component] = {"status": status.name, "detail": detail}
+                health_status.update(extras)
+                lines.append(f"\n{title}")
+                lines.append(message)
         
         # 전체 상태 결정
-        error_count = len([v for v in health_status["components"].values() if v.startswith("ERROR")])
-        warning_count = len([v for v in health_status["components"].values() if v.startswith("WARNING")])
-        ok_count = len([v for v in health_status["components"].values() if v == "OK"])
+        # 상태별 개수와 가장 심각한 상태
+        tally = Counter(statuses)
+        error_count, warning_count, ok_count = tally[Status.ERROR], tally[Status.WARNING], tally[Status.OK]
+        worst_status = max(statuses, default=Status.OK)
         
-        if error_count == 0 and warning_count == 0:
+        if worst_status == Status.OK:
             health_status["overall_status"] = "HEALTHY"
             status_emoji = "🟢"
             status_text = "모든 컴포넌트 정상"
-        elif error_count == 0:
+        elif worst_status == Status.WARNING:
             health_status["overall_status"] = "WARNING"
             status_emoji = "🟡"
             status_text = f"경고 {warning_count}개 (정상 {ok_count}개)"
@@ -169,23 +234,25 @@ def check_system_health():
             status_emoji = "🔴"
             status_text = f"오류 {error_count}개, 경고 {warning_count}개 (정상 {ok_count}개)"
         
-        print(f"\n{status_emoji} === 전체 시스템 상태: {health_status['overall_status']} ===")
-        print(f"📋 상태 요약: {status_text}")
+        lines.append(f"\n{status_emoji} === 전체 시스템 상태: {health_status['overall_status']} ===")
+        lines.append(f"📋 상태 요약: {status_text}")
         
         # 상태 보고서 저장
-        report_path = "/Users/kjw/emotion-analysis-system/logs/system_health_report.json"
-        os.makedirs(os.path.dirname(report_path), exist_ok=True)
+        REPORT_PATH.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(report_path, 'w', encoding='utf-8') as f:
-            json.dump(health_status, f, indent=2, ensure_ascii=False)
+        with open(REPORT_PATH, 'wb') as f:
+            f.write(orjson.dumps(health_status, option=orjson.OPT_INDENT_2))
         
-        print(f"💾 상태 보고서 저장: {report_path}")
+        lines.append(f"💾 상태 보고서 저장: {REPORT_PATH}")
         
         return health_status
         
     except Exception as e:
-        print(f"❌ 시스템 상태 검사 중 치명적 오류: {e}")
+        lines.append(f"❌ 시스템 상태 검사 중 치명적 오류: {e}")
         return {"overall_status": "CRITICAL_ERROR", "error": str(e)}
+    
+    finally:
+        print("\n".join(lines))
 
 if __name__ == "__main__":
     health_status = check_system_health()
@@ -12,21 +12,32 @@ from unittest.mock import Mock, patch, MagicMock
 from datetime import datetime, timedelta
 import tempfile
 import json
+import functools
+import asyncio
+import importlib.util
 
 # 프로젝트 모듈 import
 sys.path.append('/Users/kjw/emotion-analysis-system/src')
 from auth.google_auth import GoogleAuthenticator
 from analysis.emotion_engine import EmotionAnalysisEngine
-from utils.logging_system import EmotionSystemLogger, validate_data
+from utils.logging_system import EmotionSystemLogger, validate_data, log_execution, retry_operation
 from utils.config_manager import ConfigManager
+from utils.cache import TTLCache
+from database.firebase_manager import FirebaseManager, MockFirebaseManager, MAX_BATCH_WRITES, WRITES_PER_ANALYSIS
+
+@functools.lru_cache(maxsize=1)
+def _shared_engine():
+    """테스트 클래스들이 함께 쓰는 감정 분석 엔진 (처음 호출할 때 한 번만 생성)"""
+    return EmotionAnalysisEngine()
 
 class TestGoogleAuthenticator(unittest.TestCase):
     """Google 인증 테스트"""
     
-    def setUp(self):
-        """테스트 설정"""
-        self.temp_dir = tempfile.mkdtemp()
-        self.test_credentials = {
+    @classmethod
+    def setUpClass(cls):
+        """테스트 설정 (임시 디렉토리와 자격 증명 파일은 클래스당 한 번 생성)"""
+        cls.temp_dir = tempfile.mkdtemp()
+        cls.test_credentials = {
             "installed": {
                 "client_id": "test_client_id",
                 "client_secret": "test_client_secret",
@@ -37,18 +48,23 @@ class TestGoogleAuthenticator(unittest.TestCase):
         }
         
         # 테스트용 자격 증명 파일 생성
-        creds_file = os.path.join(self.temp_dir, "google_credentials.json")
+        creds_file = os.path.join(cls.temp_dir, "google_credentials.json")
         with open(creds_file, 'w') as f:
-            json.dump(self.test_credentials, f)
+            json.dump(cls.test_credentials, f)
+        
+        # 자격 증명 파일이 없는 경우용 빈 디렉토리
+        cls.empty_dir = os.path.join(cls.temp_dir, "empty")
+        os.mkdir(cls.empty_dir)
         
         # 환경 변수 설정
         os.environ['GOOGLE_CLIENT_ID'] = 'test_client_id'
         os.environ['GOOGLE_CLIENT_SECRET'] = 'test_client_secret'
         
-    def tearDown(self):
+    @classmethod
+    def tearDownClass(cls):
         """테스트 정리"""
         import shutil
-        shutil.rmtree(self.temp_dir)
+        shutil.rmtree(cls.temp_dir)
     
     def test_credentials_validation_success(self):
         """자격 증명 파일 검증 성공 테스트"""
@@ -57,12 +73,8 @@ class TestGoogleAuthenticator(unittest.TestCase):
     
     def test_credentials_validation_missing_file(self):
         """자격 증명 파일 없음 테스트"""
-        empty_dir = tempfile.mkdtemp()
-        auth = GoogleAuthenticator(config_path=empty_dir)
+        auth = GoogleAuthenticator(config_path=self.empty_dir)
         self.assertFalse(auth._validate_credentials_file())
-        
-        import shutil
-        shutil.rmtree(empty_dir)
     
     def test_token_expiry_check(self):
         """토큰 만료 체크 테스트"""
@@ -83,10 +95,11 @@ class TestGoogleAuthenticator(unittest.TestCase):
 class TestEmotionAnalysisEngine(unittest.TestCase):
     """감정 분석 엔진 테스트"""
     
-    def setUp(self):
-        """테스트 설정"""
-        self.engine = EmotionAnalysisEngine()
-        self.sample_youtube_data = {
+    @classmethod
+    def setUpClass(cls):
+        """테스트 설정 (엔진과 샘플 데이터는 읽기만 하므로 클래스당 한 번 생성)"""
+        cls.engine = _shared_engine()
+        cls.sample_youtube_data = {
             "videos": [
                 {
                     "title": "행복한 음악 플레이리스트",
@@ -103,7 +116,7 @@ class TestEmotionAnalysisEngine(unittest.TestCase):
             ]
         }
         
-        self.sample_calendar_data = {
+        cls.sample_calendar_data = {
             "events": [
                 {
                     "summary": "중요한 회의",
@@ -132,6 +145,18 @@ class TestEmotionAnalysisEngine(unittest.TestCase):
         self.assertGreater(positive_score, 0)
         self.assertLess(negative_score, 0)
     
+    def test_whole_word_keyword_matching(self):
+        """단독 단어 키워드('급')는 다른 단어의 일부일 때 일치하지 않는지 테스트"""
+        negative = self.engine._emotion_names.index('negative')
+        
+        def negative_hits(text):
+            return self.engine._hit_matrix([text])[0, negative]
+        
+        self.assertEqual(negative_hits("오늘 급식 메뉴"), 0)
+        self.assertEqual(negative_hits("급 우울"), 2)
+        self.assertEqual(negative_hits("급식 먹고 우울"), 1)
+        self.assertEqual(negative_hits("(급) 공지"), 1)
+    
     def test_time_decay_calculation(self):
         """시간 감쇠 계산 테스트"""
         recent_datetime = datetime.now() - timedelta(hours=1)
@@ -241,8 +266,6 @@ class TestLoggingSystem(unittest.TestCase):
     
     def test_log_execution_decorator(self):
         """실행 로깅 데코레이터 테스트"""
-        from utils.logging_system import log_execution
-        
         @log_execution
         def test_function():
             return "success"
@@ -252,8 +275,6 @@ class TestLoggingSystem(unittest.TestCase):
     
     def test_retry_decorator(self):
         """재시도 데코레이터 테스트"""
-        from utils.logging_system import retry_operation
-        
         call_count = 0
         
         @retry_operation(max_attempts=3)
@@ -268,6 +289,232 @@ class TestLoggingSystem(unittest.TestCase):
         self.assertEqual(result, "success")
         self.assertEqual(call_count, 3)
 
+class TestTTLCache(unittest.TestCase):
+    """TTL 캐시 테스트"""
+    
+    def setUp(self):
+        """테스트 설정 (만료 시각을 직접 움직이도록 time.monotonic 고정)"""
+        self.now = 1000.0
+        patcher = patch('utils.cache.time.monotonic', side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = TTLCache(maxsize=3, ttl=10.0)
+    
+    def test_expiry(self):
+        """만료 시간 테스트"""
+        self.cache.set("a", 1)
+        self.cache.set("b", 2, ttl=30.0)
+        
+        self.now += 9.9
+        self.assertEqual(self.cache.get("a"), 1)
+        
+        # 기본 TTL이 지나면 기본값 반환 후 항목 제거, 개별 TTL 항목은 유지
+        self.now += 0.1
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(self.cache.get("a", "missing"), "missing")
+        self.assertEqual(self.cache.get("b"), 2)
+        self.assertEqual(len(self.cache), 1)
+    
+    def test_lru_eviction(self):
+        """최대 크기 초과 시 가장 오래 쓰지 않은 항목 제거 테스트"""
+        for key in ("a", "b", "c"):
+            self.cache.set(key, key.upper())
+        
+        # 조회한 항목은 최근 사용으로 이동하므로 b가 제거 대상
+        self.assertEqual(self.cache.get("a"), "A")
+        self.cache.set("d", "D")
+        
+        self.assertEqual(len(self.cache), 3)
+        self.assertIsNone(self.cache.get("b"))
+        for key in ("a", "c", "d"):
+            self.assertEqual(self.cache.get(key), key.upper())
+    
+    def test_pop_where(self):
+        """조건부 일괄 제거 테스트"""
+        self.cache.set(("history", "user1", 10), 1)
+        self.cache.set(("trends", "user1", 7), 2)
+        self.cache.set(("history", "user2", 10), 3)
+        
+        removed = self.cache.pop_where(lambda key: key[1] == "user1")
+        
+        self.assertEqual(removed, 2)
+        self.assertEqual(len(self.cache), 1)
+        self.assertEqual(self.cache.get(("history", "user2", 10)), 3)
+        self.assertEqual(self.cache.pop_where(lambda key: False), 0)
+    
+    @unittest.skipUnless(importlib.util.find_spec("fastapi"), "fastapi 미설치")
+    def test_fresh_bypasses_response_cache(self):
+        """fresh=true 요청의 응답 캐시 우회 테스트"""
+        import api_server
+        
+        calls = []
+        
+        async def build_payload():
+            calls.append(len(calls))
+            return {"call": len(calls)}
+        
+        async def fetch(refresh):
+            return await api_server.cached_json_response(
+                Mock(headers={}), ("history", "user1", 10, None), build_payload, refresh=refresh
+            )
+        
+        with patch.object(api_server, 'response_cache', TTLCache(maxsize=8, ttl=10.0)):
+            first = asyncio.run(fetch(False))
+            cached = asyncio.run(fetch(False))
+            fresh = asyncio.run(fetch(True))
+            after_fresh = asyncio.run(fetch(False))
+        
+        # 캐시 적중 시 다시 만들지 않고, fresh 요청은 새로 만든 결과로 캐시를 갱신
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(first.body, cached.body)
+        self.assertEqual(json.loads(fresh.body), {"call": 2})
+        self.assertEqual(after_fresh.body, fresh.body)
+
+class TestFirebaseBatchSave(unittest.TestCase):
+    """Firebase 일괄 저장 테스트"""
+    
+    def setUp(self):
+        """테스트 설정 (db.batch()는 호출마다 새 Mock 배치를 만들어 기록)"""
+        self.manager = FirebaseManager()
+        self.manager.initialized = True
+        self.manager.db = MagicMock()
+        self.batches = []
+        
+        def new_batch():
+            batch = MagicMock()
+            self.batches.append(batch)
+            return batch
+        
+        self.manager.db.batch.side_effect = new_batch
+        
+        # 분석 ID 타임스탬프 고정, Firebase 미설치 환경에서도 SERVER_TIMESTAMP 참조 가능하도록 대체
+        mock_datetime = Mock()
+        mock_datetime.now.return_value.strftime.return_value = "20240101_120000"
+        for patcher in (
+            patch('database.firebase_manager.datetime', mock_datetime),
+            patch('database.firebase_manager.firestore', create=True),
+            patch('builtins.print')
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+    
+    def _save(self, count):
+        """사용자 3명에게 번갈아 배정한 분석 결과 count건 저장"""
+        items = [(f"user{index % 3}", {"analysis_date": "2024-01-01"}) for index in range(count)]
+        return self.manager.save_emotion_analysis_batch(items)
+    
+    def test_commit_boundaries(self):
+        """배치당 최대 쓰기 수 경계 테스트 (분석 1건당 2개 쓰기)"""
+        per_batch = MAX_BATCH_WRITES // WRITES_PER_ANALYSIS
+        
+        for count, expected_batches in ((per_batch - 1, 1), (per_batch, 1), (per_batch + 1, 2)):
+            with self.subTest(count=count):
+                self.batches.clear()
+                saved_ids = self._save(count)
+                
+                self.assertEqual(len(saved_ids), count)
+                self.assertEqual(len(self.batches), expected_batches)
+                for batch in self.batches:
+                    batch.commit.assert_called_once()
+                    self.assertLessEqual(batch.set.call_count, MAX_BATCH_WRITES)
+                self.assertEqual(
+                    sum(batch.set.call_count for batch in self.batches), count * WRITES_PER_ANALYSIS
+                )
+    
+    def test_generated_ids(self):
+        """분석 ID 생성 테스트 (여러 건이면 순번 추가)"""
+        self.assertEqual(self._save(1), ["analysis_20240101_120000"])
+        
+        saved_ids = self._save(251)
+        self.assertEqual(saved_ids[0], "analysis_20240101_120000_000")
+        self.assertEqual(saved_ids[250], "analysis_20240101_120000_250")
+        self.assertEqual(len(set(saved_ids)), 251)
+    
+    def test_partial_commit_failure(self):
+        """뒤쪽 배치 커밋이 실패하면 앞 배치에서 커밋된 ID만 반환하는지 테스트"""
+        def new_batch():
+            batch = MagicMock()
+            if self.batches:
+                batch.commit.side_effect = RuntimeError("commit failed")
+            self.batches.append(batch)
+            return batch
+        
+        self.manager.db.batch.side_effect = new_batch
+        saved_ids = self._save(251)
+        
+        per_batch = MAX_BATCH_WRITES // WRITES_PER_ANALYSIS
+        self.assertEqual(len(saved_ids), per_batch)
+        self.assertEqual(saved_ids[-1], f"analysis_20240101_120000_{per_batch - 1:03d}")
+    
+    def test_pending_saves_retry(self):
+        """저장 실패한 분석 결과를 다음 저장 때 함께 커밋하는지 테스트"""
+        import main
+        
+        firebase_manager = Mock()
+        system = main.CompleteEmotionSystem(user_id="user1", firebase_manager=firebase_manager)
+        
+        firebase_manager.save_emotion_analysis_batch.return_value = []
+        system.analysis_result = {"run": 1}
+        result = system._save_to_firebase_safe()
+        
+        self.assertFalse(result["success"])
+        self.assertEqual(result["pending_saves"], 1)
+        
+        firebase_manager.save_emotion_analysis_batch.return_value = ["id1", "id2"]
+        system.analysis_result = {"run": 2}
+        result = system._save_to_firebase_safe()
+        
+        self.assertTrue(result["success"])
+        self.assertEqual(result["saved_count"], 2)
+        firebase_manager.save_emotion_analysis_batch.assert_called_with(
+            [("user1", {"run": 1}), ("user1", {"run": 2})]
+        )
+        self.assertEqual(len(system._pending_saves), 0)
+        
+        # 일부만 커밋되면 커밋된 앞쪽 항목만 대기열에서 제거
+        firebase_manager.save_emotion_analysis_batch.return_value = []
+        system.analysis_result = {"run": 3}
+        system._save_to_firebase_safe()
+        firebase_manager.save_emotion_analysis_batch.return_value = ["id3"]
+        system.analysis_result = {"run": 4}
+        result = system._save_to_firebase_safe()
+        
+        self.assertFalse(result["success"])
+        self.assertEqual(result["saved_count"], 1)
+        self.assertEqual(list(system._pending_saves), [("user1", {"run": 4})])
+
+class TestMockFirebaseStorage(unittest.TestCase):
+    """Mock Firebase 로컬 저장소 테스트"""
+    
+    def setUp(self):
+        """테스트 설정 (저장 파일은 임시 디렉토리 사용)"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.manager = MockFirebaseManager()
+        self.manager.local_storage = os.path.join(self.temp_dir, "mock_firebase_data.ndjson")
+        self.manager.legacy_storage = os.path.join(self.temp_dir, "mock_firebase_data.json")
+        patcher = patch('builtins.print')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def tearDown(self):
+        """테스트 정리"""
+        import shutil
+        shutil.rmtree(self.temp_dir)
+    
+    def test_legacy_json_imported(self):
+        """이전 JSON 파일의 히스토리를 NDJSON 로그로 옮기는지 테스트"""
+        with open(self.manager.legacy_storage, 'w', encoding='utf-8') as f:
+            json.dump({"user1": [{"analysis_id": "a1"}, {"analysis_id": "a2"}]}, f)
+        
+        self.manager.save_emotion_analysis("user1", {"analysis_date": "2024-01-02"})
+        history = self.manager.get_user_history("user1")
+        
+        self.assertEqual([entry["analysis_id"] for entry in history[:2]], ["a1", "a2"])
+        self.assertEqual(len(history), 3)
+
+# 통합 테스트용 자격 증명 Mock (속성을 읽기만 하므로 모듈 로드 시 한 번 생성)
+_SHARED_CREDS_MOCK = Mock(valid=True, expired=False, refresh_token="test_refresh_token")
+
 # 통합 테스트
 class TestSystemIntegration(unittest.TestCase):
     """시스템 통합 테스트"""
@@ -277,14 +524,10 @@ class TestSystemIntegration(unittest.TestCase):
     def test_full_analysis_workflow(self, mock_credentials, mock_flow):
         """전체 분석 워크플로우 테스트"""
         # Mock 설정
-        mock_creds = Mock()
-        mock_creds.valid = True
-        mock_creds.expired = False
-        mock_creds.refresh_token = "test_refresh_token"
-        mock_credentials.from_authorized_user_file.return_value = mock_creds
+        mock_credentials.from_authorized_user_file.return_value = _SHARED_CREDS_MOCK
         
         # 테스트 실행 (실제 API 호출 없이)
-        engine = EmotionAnalysisEngine()
+        engine = _shared_engine()
         
         # 샘플 데이터로 분석 테스트
         sample_youtube = {"videos": []}
@@ -301,23 +544,8 @@ def run_tests():
     """테스트 실행 함수"""
     print("🧪 감정 분석 시스템 테스트 시작\n")
     
-    # 테스트 로더 설정
-    loader = unittest.TestLoader()
-    suite = unittest.TestSuite()
-    
-    # 테스트 클래스들 추가
-    test_classes = [
-        TestGoogleAuthenticator,
-        TestEmotionAnalysisEngine,
-        TestDataValidation,
-        TestConfigManager,
-        TestLoggingSystem,
-        TestSystemIntegration
-    ]
-    
-    for test_class in test_classes:
-        tests = loader.loadTestsFromTestClass(test_class)
-        suite.addTests(tests)
+    # 이 모듈의 모든 TestCase 클래스 수집 (새 클래스를 따로 등록할 필요 없음)
+    suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
     
     # 테스트 실행
     runner = unittest.TextTestRunner(verbosity=2)
@@ -332,12 +560,12 @@ def run_tests():
     if result.failures:
         print("\n❌ 실패한 테스트:")
         for test, traceback in result.failures:
-            print(f"  - {test}: {traceback.split('\\n')[-2]}")
+            print(f"  - {test}: {traceback.splitlines()[-1]}")
     
     if result.errors:
         print("\n🚨 에러가 발생한 테스트:")
         for test, traceback in result.errors:
-            print(f"  - {test}: {traceback.split('\\n')[-2]}")
+            print(f"  - {test}: {traceback.splitlines()[-1]}")
     
     return result.wasSuccessful()
 